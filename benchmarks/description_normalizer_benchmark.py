@@ -0,0 +1,57 @@
+"""
+Сравнение скорости преобразования HTML-описаний вакансий в текст:
+normalize_description против BeautifulSoup(..., 'html.parser').get_text().
+
+Запуск из корня проекта:
+    python -m benchmarks.description_normalizer_benchmark [--repeat 200]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from src.crawl_links.description_normalizer import normalize_description
+
+FIXTURES_PATH = Path(__file__).parent / 'fixtures' / 'descriptions.json'
+
+
+def beautifulsoup_text(html: str) -> str:
+    """Прежний способ: полное дерево BeautifulSoup и get_text()"""
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, 'html.parser').get_text() if html else ''
+
+
+def measure(func, corpus: list[str], repeat: int) -> float:
+    """Возвращает среднее время обработки одного описания, мкс"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in corpus:
+            func(html)
+    return (time.perf_counter() - started) / (repeat * len(corpus)) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='Сколько раз обработать весь корпус')
+    args = parser.parse_args()
+
+    corpus = json.loads(FIXTURES_PATH.read_text(encoding='utf-8'))
+    total_kb = sum(len(html.encode('utf-8')) for html in corpus) / 1024
+    print(f"Корпус: {len(corpus)} описаний, {total_kb:.1f} КБ, повторов: {args.repeat}")
+
+    results = {'normalize_description': measure(normalize_description, corpus, args.repeat)}
+    try:
+        results['BeautifulSoup.get_text'] = measure(beautifulsoup_text, corpus, args.repeat)
+    except ImportError:
+        print("beautifulsoup4 не установлен, сравнение пропущено")
+
+    for name, micros in results.items():
+        print(f"{name:<24} {micros:>10.1f} мкс/описание  {1_000_000 / micros:>10.0f} описаний/с")
+    if len(results) == 2:
+        print(f"Ускорение: {results['BeautifulSoup.get_text'] / results['normalize_description']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Сравнение скорости декодирования ответов API: json_decoder против json.loads.
+
+Ответы собираются из фикстур описаний и повторяют структуру API hh.ru,
+включая поля, которые проект не использует (брендинг, контакты, фото и т. п.).
+Для сравнения установите msgspec и/или orjson.
+
+Запуск из корня проекта:
+    python -m benchmarks.json_decoder_benchmark [--repeat 200]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from src.utils.json_decoder import JSON_BACKEND, decode_search_page, decode_vacancy
+
+FIXTURES_PATH = Path(__file__).parent / 'fixtures' / 'descriptions.json'
+
+
+def vacancy_payload(vacancy_id: int, description: str) -> dict:
+    """Ответ /vacancies/{id} с типичным набором полей"""
+    named = {'id': '1', 'name': 'Значение'}
+    return {
+        'id': str(vacancy_id),
+        'name': 'Python-разработчик',
+        'description': description,
+        'branded_description': description,
+        'key_skills': [{'name': f'Навык {i}'} for i in range(8)],
+        'area': {'id': '1', 'name': 'Москва', 'url': 'https://api.hh.ru/areas/1'},
+        'address': {'raw': 'Москва, Тверская улица, 1', 'lat': 55.75, 'lng': 37.61,
+                    'metro_stations': [{'station_name': 'Тверская', 'line_name': 'Замоскворецкая'}] * 2},
+        'salary_range': {'from': 200000, 'to': 300000, 'currency': 'RUR', 'gross': False,
+                         'mode': named, 'frequency': named},
+        'experience': named,
+        'schedule': named,
+        'employment': named,
+        'professional_roles': [named],
+        'employer': {'id': '42', 'name': 'Компания', 'url': 'https://api.hh.ru/employers/42',
+                     'alternate_url': 'https://hh.ru/employer/42', 'vacancies_url': 'https://api.hh.ru/vacancies?employer_id=42',
+                     'accredited_it_employer': True, 'trusted': True,
+                     'logo_urls': {'90': 'https://img.hhcdn.ru/90.png', '240': 'https://img.hhcdn.ru/240.png'}},
+        'contacts': {'name': 'HR', 'email': 'hr@example.com', 'phones': [{'city': '495', 'number': '1234567'}]},
+        'working_days': [named], 'working_time_intervals': [named], 'languages': [named] * 2,
+        'driver_license_types': [], 'specializations': [named] * 3,
+        'published_at': '2026-10-01T10:00:00+0300',
+        'created_at': '2026-10-01T10:00:00+0300',
+        'archived': False,
+    }
+
+
+def search_page_payload(vacancies: list[dict]) -> dict:
+    """Страница выдачи /vacancies на 100 вакансий"""
+    items = []
+    for vacancy in vacancies:
+        item = {key: value for key, value in vacancy.items() if key not in ('description', 'branded_description')}
+        item['url'] = f"https://api.hh.ru/vacancies/{vacancy['id']}?host=hh.ru"
+        item['alternate_url'] = f"https://hh.ru/vacancy/{vacancy['id']}"
+        item['snippet'] = {'requirement': 'Опыт с Python', 'responsibility': 'Разработка сервисов'}
+        items.append(item)
+    return {'items': items, 'found': 12000, 'pages': 20, 'page': 0, 'per_page': len(items)}
+
+
+def measure(func, payloads: list[bytes], repeat: int) -> float:
+    """Возвращает среднее время декодирования одного ответа, мкс"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for payload in payloads:
+            func(payload)
+    return (time.perf_counter() - started) / (repeat * len(payloads)) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='Сколько раз декодировать весь набор')
+    args = parser.parse_args()
+
+    descriptions = json.loads(FIXTURES_PATH.read_text(encoding='utf-8'))
+    vacancies = [vacancy_payload(i, descriptions[i % len(descriptions)]) for i in range(100)]
+    details = [json.dumps(vacancy, ensure_ascii=False).encode('utf-8') for vacancy in vacancies[:len(descriptions)]]
+    pages = [json.dumps(search_page_payload(vacancies), ensure_ascii=False).encode('utf-8')]
+    print(f"Библиотека декодирования: {JSON_BACKEND}, повторов: {args.repeat}")
+
+    for name, payloads, decode in (('вакансия', details, decode_vacancy), ('страница поиска', pages, decode_search_page)):
+        stdlib = measure(json.loads, payloads, args.repeat)
+        decoder = measure(decode, payloads, args.repeat)
+        size_kb = sum(len(payload) for payload in payloads) / len(payloads) / 1024
+        print(f"{name:<16} {size_kb:>6.1f} КБ  json.loads {stdlib:>9.1f} мкс  json_decoder {decoder:>9.1f} мкс  "
+              f"ускорение {stdlib / decoder:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
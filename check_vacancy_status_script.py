@@ -6,12 +6,13 @@ import aiohttp
 import asyncio
 import random
 import logging
-from typing import List, Optional, Dict, Any, Union
+from typing import Callable, Iterable, List, Optional, Dict, Any, Union
 import backoff
 from dataclasses import dataclass
 import time
 from collections import deque
-from src.database.db_manager import get_open_vacancies_links
+from src.check_vacancy_status.recheck_scheduler import RecheckScheduler
+from src.database.db_manager import close_vacancies, initialize_database
 from src.utils.telegram_bot import send_simple_message
 
 # Детальная настройка логирования
@@ -21,6 +22,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Проверка TLS-сертификатов при работе через прокси (настраивается в одном месте)
+VERIFY_SSL = False
+# Сколько держать простаивающее соединение (туннель через прокси) открытым, сек
+KEEPALIVE_TIMEOUT = 60
+
+# Параметры модели здоровья прокси
+HEALTH_EWMA_ALPHA = 0.2  # Вес нового наблюдения в скользящих средних
+DEFAULT_COOLDOWN = 30.0  # Пауза прокси после 403/429 без Retry-After, сек
+QUARANTINE_ERROR_RATE = 0.5  # Доля ошибок, после которой прокси уходит в карантин
+QUARANTINE_MIN_SAMPLES = 5  # Минимум наблюдений до решения о карантине
+QUARANTINE_SECONDS = 120.0  # Начальная длительность карантина (удваивается при неудачной пробе)
+QUARANTINE_MAX_SECONDS = 1800.0
+MAX_PROXY_SWITCHES = 3  # Сколько раз вакансию можно перекинуть на другой прокси после 403/429
+CLOSE_BATCH_SIZE = 200  # Сколько закрытых вакансий записывать в базу одной транзакцией
+
+
+class ProxyThrottledError(aiohttp.ClientError):
+    """Прокси получил 403/429: вакансию нужно проверить через другой прокси"""
+
+    def __init__(self, message: str, retry_after: float = DEFAULT_COOLDOWN):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 @dataclass
 class ProxyConfig:
@@ -53,34 +77,190 @@ class ProxyConfig:
         return f"http://{self.host}:{self.port}"
 
 
+@dataclass
+class ProxyHealth:
+    """Состояние здоровья прокси: скользящие средние задержки и доли ошибок, паузы"""
+
+    latency_ewma: float = 1.0
+    error_ewma: float = 0.0
+    samples: int = 0
+    cooldown_until: float = 0.0
+    quarantined_until: float = 0.0
+    quarantine_seconds: float = QUARANTINE_SECONDS
+
+    def observe(self, latency: Optional[float], ok: bool):
+        """Учитывает результат одного запроса"""
+        self.samples += 1
+        self.error_ewma += HEALTH_EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_ewma)
+        if latency is not None:
+            self.latency_ewma += HEALTH_EWMA_ALPHA * (latency - self.latency_ewma)
+
+    def is_ready(self, now: float) -> bool:
+        """Прокси не на паузе и не в карантине"""
+        return now >= self.cooldown_until and now >= self.quarantined_until
+
+    def weight(self) -> float:
+        """Вес для выбора: быстрые и безошибочные прокси получают больше работы"""
+        return (1.0 - self.error_ewma) ** 2 / max(self.latency_ewma, 0.05) + 1e-3
+
+
 class ProxyManager:
-    """Менеджер прокси с ограничением 1 соединение на прокси"""
+    """
+    Менеджер прокси с ограничением 1 соединение на прокси.
+
+    Для каждого прокси ведется ProxyHealth. Свободный прокси выбирается
+    случайно с весом по здоровью; после 403/429 прокси уходит на паузу,
+    при высокой доле ошибок — в карантин, по окончании которого
+    проверяется тестовым запросом и либо возвращается, либо остается
+    в карантине на удвоенный срок.
+    """
 
     def __init__(self, proxies: List[ProxyConfig]):
         self.proxies = proxies
         self.available_proxies = deque(proxies)  # Очередь свободных прокси
         self.locked_proxies = set()  # Занятые прокси
-        self.lock = asyncio.Lock()
+        self.condition = asyncio.Condition()  # Будит ожидающих при освобождении прокси
+        self.sessions: Dict[ProxyConfig, aiohttp.ClientSession] = {}  # Сессия на каждый прокси
+        self.health: Dict[ProxyConfig, ProxyHealth] = {proxy: ProxyHealth() for proxy in proxies}
+        self._probes: set = set()  # Фоновые проверки прокси после карантина
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def get_session(self, proxy: ProxyConfig) -> aiohttp.ClientSession:
+        """
+        Возвращает долгоживущую сессию прокси (создает при первом обращении).
+
+        Коннектор сессии ограничен одним соединением — как и политика
+        "1 соединение на прокси", — и держит его открытым (keep-alive),
+        поэтому CONNECT-туннель через прокси переиспользуется между проверками.
+        """
+        session = self.sessions.get(proxy)
+        if session is None or session.closed:
+            session = await create_http_session()
+            self.sessions[proxy] = session
+        return session
+
+    async def close(self):
+        """Закрывает сессии всех прокси и останавливает фоновые проверки"""
+        for probe in list(self._probes):
+            probe.cancel()
+        sessions, self.sessions = list(self.sessions.values()), {}
+        for session in sessions:
+            await session.close()
+
+    def record_success(self, proxy: ProxyConfig, latency: float):
+        """Учитывает успешный ответ прокси"""
+        self.health[proxy].observe(latency, ok=True)
+
+    def record_failure(self, proxy: ProxyConfig):
+        """Учитывает ошибку прокси и при высокой доле ошибок отправляет его в карантин"""
+        health = self.health[proxy]
+        health.observe(None, ok=False)
+        if health.samples >= QUARANTINE_MIN_SAMPLES and health.error_ewma >= QUARANTINE_ERROR_RATE:
+            self._quarantine(proxy)
+
+    def record_throttled(self, proxy: ProxyConfig, retry_after: float):
+        """Учитывает 403/429: прокси не получает работу retry_after секунд"""
+        health = self.health[proxy]
+        health.observe(None, ok=False)
+        health.cooldown_until = max(health.cooldown_until, time.monotonic() + retry_after)
+        logger.warning(f"⏸️ Прокси {proxy.host}:{proxy.port} на паузе {retry_after:.0f}с")
+
+    def _quarantine(self, proxy: ProxyConfig):
+        health = self.health[proxy]
+        if health.quarantined_until > time.monotonic():
+            return
+        health.quarantined_until = time.monotonic() + health.quarantine_seconds
+        logger.warning(
+            f"🚧 Прокси {proxy.host}:{proxy.port} в карантине на {health.quarantine_seconds:.0f}с "
+            f"(ошибок {health.error_ewma * 100:.0f}%)"
+        )
 
-    async def get_proxy(self) -> Optional[ProxyConfig]:
-        """Получает свободный прокси. Если нет свободных - ждет"""
-        async with self.lock:
-            if self.available_proxies:
-                proxy = self.available_proxies.popleft()
-                self.locked_proxies.add(proxy)
-                logger.debug(f"🔄 Взяли прокси {proxy.host}:{proxy.port} в работу")
-                return proxy
+    async def _probe(self, proxy: ProxyConfig):
+        """Проверяет прокси после карантина и возвращает его в работу или продлевает карантин"""
+        health = self.health[proxy]
+        try:
+            if await test_proxy_connection(proxy.get_proxy_url()):
+                health.error_ewma = QUARANTINE_ERROR_RATE / 2
+                health.quarantined_until = 0.0
+                health.quarantine_seconds = QUARANTINE_SECONDS
+                logger.info(f"✅ Прокси {proxy.host}:{proxy.port} вернулся из карантина")
             else:
+                health.quarantine_seconds = min(health.quarantine_seconds * 2, QUARANTINE_MAX_SECONDS)
+                health.quarantined_until = time.monotonic() + health.quarantine_seconds
+        finally:
+            await self.release_proxy(proxy)
+
+    async def get_proxy(self) -> Optional[ProxyConfig]:
+        """Получает свободный прокси без ожидания. Если нет свободных - возвращает None"""
+        async with self.condition:
+            return self._take_proxy()
+
+    async def acquire(self) -> ProxyConfig:
+        """
+        Получает свободный здоровый прокси, ожидая без опроса.
+
+        Ждет либо освобождения прокси (release_proxy будит ожидающих), либо
+        окончания ближайшей паузы/карантина.
+        """
+        async with self.condition:
+            proxy = self._take_proxy()
+            while proxy is None:
                 logger.debug("⏳ Нет свободных прокси, ждем...")
-                return None
+                try:
+                    await asyncio.wait_for(self.condition.wait(), timeout=self._next_ready_in())
+                except asyncio.TimeoutError:
+                    pass
+                proxy = self._take_proxy()
+            return proxy
+
+    def _next_ready_in(self) -> Optional[float]:
+        """Через сколько секунд закончится ближайшая пауза или карантин свободного прокси"""
+        now = time.monotonic()
+        waits = [
+            max(self.health[proxy].cooldown_until, self.health[proxy].quarantined_until) - now
+            for proxy in self.available_proxies
+        ]
+        waits = [wait for wait in waits if wait > 0]
+        return min(waits) if waits else None
+
+    def _take_proxy(self) -> Optional[ProxyConfig]:
+        """Забирает из свободных прокси один, случайно с весом по здоровью (вызывается под condition)"""
+        now = time.monotonic()
+        candidates = []
+        for proxy in list(self.available_proxies):
+            health = self.health[proxy]
+            if 0 < health.quarantined_until <= now:
+                # Карантин закончился: сначала тестовый запрос, без боевой нагрузки
+                self.available_proxies.remove(proxy)
+                self.locked_proxies.add(proxy)
+                health.quarantined_until = float('inf')
+                probe = asyncio.create_task(self._probe(proxy))
+                self._probes.add(probe)
+                probe.add_done_callback(self._probes.discard)
+            elif health.is_ready(now):
+                candidates.append(proxy)
+
+        if not candidates:
+            return None
+        proxy = random.choices(candidates, weights=[self.health[p].weight() for p in candidates])[0]
+        self.available_proxies.remove(proxy)
+        self.locked_proxies.add(proxy)
+        logger.debug(f"🔄 Взяли прокси {proxy.host}:{proxy.port} в работу")
+        return proxy
 
     async def release_proxy(self, proxy: ProxyConfig):
         """Освобождает прокси для повторного использования"""
-        async with self.lock:
+        async with self.condition:
             if proxy in self.locked_proxies:
                 self.locked_proxies.remove(proxy)
                 self.available_proxies.append(proxy)
                 logger.debug(f"✅ Освободили прокси {proxy.host}:{proxy.port}")
+                self.condition.notify()
 
     def get_available_count(self) -> int:
         """Возвращает количество доступных прокси"""
@@ -112,7 +292,7 @@ async def test_proxy_connection(
     try:
         timeout = aiohttp.ClientTimeout(total=10)
         async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(test_url, proxy=proxy_url, ssl=False) as response:
+            async with session.get(test_url, proxy=proxy_url, ssl=VERIFY_SSL) as response:
                 if response.status == 200:
                     data = await response.json()
                     logger.info(f"✅ Прокси работает. IP: {data.get('origin')}")
@@ -180,23 +360,16 @@ async def send_data_collection_started(vacancy_count: int):
         logger.error(f"Ошибка при отправке сообщения о начале сбора: {e}")
 
 
-async def send_final_report(total: int, closed: int, active: int, errors: int, closed_ids: List[str]):
+async def send_final_report(total: int, closed: int, active: int, errors: int):
     """Отправляет финальный отчет в Telegram"""
     try:
         message = f"📊 (TW parser hh) Результаты проверки вакансий:\n"
         message += f"Всего проверено: {total}\n"
-        message += f"✅ Закрытых: {closed} ({closed/total*100:.1f}%)\n"
-        message += f"🟢 Активных: {active} ({active/total*100:.1f}%)\n"
-        message += f"❌ Ошибок: {errors} ({errors/total*100:.1f}%)\n"
-        
-        if closed_ids:
-            message += f"\n📋 Закрытые ID ({len(closed_ids)}):\n"
-            # Ограничиваем количество ID в сообщении чтобы не превысить лимит Telegram
-            if len(closed_ids) <= 5:
-                message += ", ".join(closed_ids)
-            else:
-                message += f"Первые 5 из {len(closed_ids)}: {', '.join(closed_ids[:20])}"
-        
+        if total:
+            message += f"✅ Закрытых: {closed} ({closed/total*100:.1f}%)\n"
+            message += f"🟢 Активных: {active} ({active/total*100:.1f}%)\n"
+            message += f"❌ Ошибок: {errors} ({errors/total*100:.1f}%)\n"
+
         await send_simple_message(message)
         print(f"📊 Финальный отчет отправлен в Telegram")
         
@@ -223,8 +396,15 @@ async def create_http_session() -> aiohttp.ClientSession:
     Создает асинхронную HTTP сессию для одного соединения
     """
     timeout = aiohttp.ClientTimeout(total=45, connect=15, sock_read=25)
+    connector = aiohttp.TCPConnector(
+        limit=1,
+        limit_per_host=1,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=VERIFY_SSL,
+    )
 
     session = aiohttp.ClientSession(
+        connector=connector,
         timeout=timeout,
         headers={
             "User-Agent": get_random_user_agent(),
@@ -244,50 +424,68 @@ async def create_http_session() -> aiohttp.ClientSession:
     (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError, OSError),
     max_tries=3,
     max_time=60,
+    # 403/429 не повторяем на том же прокси: вакансия уходит на другой
+    giveup=lambda e: isinstance(e, ProxyThrottledError),
 )
-async def check_single_vacancy(vacancy_id: str, proxy: ProxyConfig) -> Union[str, bool]:
+async def check_single_vacancy(
+    vacancy_id: str,
+    proxy: ProxyConfig,
+    session: aiohttp.ClientSession,
+    proxy_manager: Optional[ProxyManager] = None,
+) -> Union[str, bool]:
     """
     Проверяет одну вакансию через hh.ru API с использованием конкретного прокси
+    и его долгоживущей сессии. Результат каждой попытки учитывается
+    в здоровье прокси, если передан proxy_manager.
     """
     start_time = time.time()
     api_url = build_api_url(vacancy_id)
     proxy_url = proxy.get_proxy_url()
 
-    # Создаем отдельную сессию для этого запроса
-    session = await create_http_session()
-
     try:
-        async with session.get(api_url, proxy=proxy_url, ssl=False) as response:
+        async with session.get(api_url, proxy=proxy_url) as response:
+            # Дочитываем тело, иначе соединение не вернется в пул и keep-alive через прокси потеряется
+            body = await response.read()
             response_time = time.time() - start_time
 
             if response.status == 404:
                 logger.info(
                     f"✅ Вакансия {vacancy_id} закрыта (404). Время: {response_time:.2f}с. Прокси: {proxy.host}:{proxy.port}"
                 )
+                if proxy_manager:
+                    proxy_manager.record_success(proxy, response_time)
                 return vacancy_id
 
             elif response.status == 200:
                 logger.info(
                     f"❌ Вакансия {vacancy_id} активна. Время: {response_time:.2f}с. Прокси: {proxy.host}:{proxy.port}"
                 )
+                if proxy_manager:
+                    proxy_manager.record_success(proxy, response_time)
                 return False
 
             elif response.status == 403:
-                error_text = await response.text()
-                raise aiohttp.ClientError(
+                error_text = body.decode(errors='replace')
+                if proxy_manager:
+                    proxy_manager.record_throttled(proxy, DEFAULT_COOLDOWN)
+                raise ProxyThrottledError(
                     f"Доступ запрещен (403). Прокси: {proxy.host}:{proxy.port}. Ответ: {error_text}"
                 )
 
             elif response.status == 429:
-                retry_after = response.headers.get("Retry-After", 10)
+                retry_after = response.headers.get("Retry-After", "")
+                retry_after = float(retry_after) if retry_after.isdigit() else DEFAULT_COOLDOWN
                 logger.warning(
-                    f"⚠️ Превышен лимит запросов для {vacancy_id}. Ждем {retry_after}сек. Прокси: {proxy.host}:{proxy.port}"
+                    f"⚠️ Превышен лимит запросов для {vacancy_id}. Прокси {proxy.host}:{proxy.port} на паузе {retry_after:.0f}сек"
+                )
+                if proxy_manager:
+                    proxy_manager.record_throttled(proxy, retry_after)
+                raise ProxyThrottledError(
+                    f"Превышен лимит запросов (429). Прокси: {proxy.host}:{proxy.port}", retry_after
                 )
-                await asyncio.sleep(int(retry_after))
-                response.raise_for_status()
 
             else:
-                error_text = await response.text()
+                error_text = body.decode(errors='replace')
                 raise aiohttp.ClientError(
                     f"HTTP {response.status}. Прокси: {proxy.host}:{proxy.port}. Ответ: {error_text}"
                 )
@@ -301,60 +499,114 @@ async def check_single_vacancy(vacancy_id: str, proxy: ProxyConfig) -> Union[str
             return vacancy_id
         raise
 
+    except ProxyThrottledError:
+        raise
+
     except Exception as e:
         response_time = time.time() - start_time
         logger.warning(
             f"⚠️ Ошибка при проверке {vacancy_id}. Время: {response_time:.2f}с. Прокси: {proxy.host}:{proxy.port}. Ошибка: {str(e)}"
         )
+        if proxy_manager:
+            proxy_manager.record_failure(proxy)
         raise
 
-    finally:
-        # Всегда закрываем сессию
-        await session.close()
-
 
 async def process_single_vacancy(
     vacancy_id: str, proxy_manager: ProxyManager
 ) -> Union[str, bool, None]:
     """
-    Обрабатывает одну вакансию с гарантией 1 соединение на прокси
+    Обрабатывает одну вакансию с гарантией 1 соединение на прокси.
+    После 403/429 вакансия проверяется через другой прокси
+    (не больше MAX_PROXY_SWITCHES раз).
     """
-    proxy = None
-    try:
-        # Ждем свободный прокси
-        while proxy is None:
-            proxy = await proxy_manager.get_proxy()
-            if proxy is None:
-                await asyncio.sleep(0.1)
-                continue
+    for attempt in range(MAX_PROXY_SWITCHES + 1):
+        proxy = None
+        try:
+            # Ждем свободный прокси (без опроса: release_proxy будит ожидающего)
+            proxy = await proxy_manager.acquire()
 
-        # Добавляем небольшую случайную задержку
-        delay = random.uniform(0.1, 0.3)
-        await asyncio.sleep(delay)
+            # Добавляем небольшую случайную задержку
+            delay = random.uniform(0.1, 0.3)
+            await asyncio.sleep(delay)
 
-        # Проверяем вакансию
-        return await check_single_vacancy(vacancy_id, proxy)
+            # Проверяем вакансию
+            session = await proxy_manager.get_session(proxy)
+            return await check_single_vacancy(vacancy_id, proxy, session, proxy_manager)
 
-    except Exception as e:
-        logger.error(
-            f"🚨 Все попытки проверки вакансии {vacancy_id} не удались. Ошибка: {str(e)}"
-        )
-        return None
+        except ProxyThrottledError as e:
+            logger.warning(
+                f"🔀 Вакансия {vacancy_id} уходит на другой прокси ({attempt + 1}/{MAX_PROXY_SWITCHES}): {str(e)}"
+            )
+            continue
 
-    finally:
-        # Всегда освобождаем прокси
-        if proxy:
-            await proxy_manager.release_proxy(proxy)
+        except Exception as e:
+            logger.error(
+                f"🚨 Все попытки проверки вакансии {vacancy_id} не удались. Ошибка: {str(e)}"
+            )
+            return None
+
+        finally:
+            # Всегда освобождаем прокси
+            if proxy:
+                await proxy_manager.release_proxy(proxy)
+
+    logger.error(f"🚨 Вакансию {vacancy_id} не удалось проверить: все прокси ограничены")
+    return None
+
+
+@dataclass
+class CheckSummary:
+    """Итоги проверки вакансий, накапливаемые по мере поступления результатов.
+
+    ID закрытых вакансий не хранятся: они записываются в базу пачками,
+    в итогах остаются только счетчики.
+    """
+
+    total: int = 0
+    closed: int = 0
+    active: int = 0
+    errors: int = 0
+    flushed: int = 0  # Сколько результатов уже записано в базу
+
+    def add(self, vacancy_id: str, result: Union[str, bool, None]):
+        """Учитывает результат проверки одной вакансии"""
+        self.total += 1
+        if isinstance(result, str):
+            self.closed += 1
+        elif result is False:
+            self.active += 1
+        else:
+            self.errors += 1
 
 
 async def check_vacancies_batch(
-    vacancy_ids: List[str], proxies: List[ProxyConfig], test_proxies: bool = True
-) -> List[Union[str, bool, None]]:
+    vacancy_ids: Iterable[str],
+    proxies: List[ProxyConfig],
+    test_proxies: bool = True,
+    on_result: Optional[Callable[[str, Union[str, bool, None]], Any]] = None,
+    vacancy_count: Optional[int] = None,
+    persist_closed: bool = True,
+    close_batch_size: int = CLOSE_BATCH_SIZE,
+    scheduler: Optional[RecheckScheduler] = None,
+) -> CheckSummary:
     """
     Основная функция для проверки пачки вакансий
-    с ограничением 1 соединение на прокси
+    с ограничением 1 соединение на прокси.
+
+    Вакансии подаются через ограниченную asyncio.Queue пулу воркеров —
+    по одному на прокси, поэтому число корутин и объем памяти не зависят
+    от количества вакансий. Результаты не копятся списком, а сразу
+    учитываются в CheckSummary и передаются в on_result.
+
+    Закрытые вакансии (при persist_closed) записываются в базу по ходу
+    проверки пачками по close_batch_size — одна транзакция на пачку,
+    в отдельном потоке, чтобы не блокировать event loop. Тем же пакетом
+    в scheduler записываются подтвержденные открытые вакансии.
     """
-    logger.info(f"🚀 Начинаем проверку {len(vacancy_ids)} вакансий")
+    if vacancy_count is None and isinstance(vacancy_ids, (list, tuple, set)):
+        vacancy_count = len(vacancy_ids)
+    logger.info(f"🚀 Начинаем проверку {vacancy_count if vacancy_count is not None else '?'} вакансий")
 
     # Тестируем прокси перед использованием
     working_proxies = proxies
@@ -378,32 +630,75 @@ async def check_vacancies_batch(
         logger.info(f"🔄 Используем {len(working_proxies)} прокси (без тестирования)")
 
     # Отправляем сообщение о начале сбора данных
-    await send_data_collection_started(len(vacancy_ids))
+    await send_data_collection_started(vacancy_count if vacancy_count is not None else 0)
 
     # Создаем менеджер прокси
     proxy_manager = ProxyManager(working_proxies)
 
-    # Создаем задачи для всех вакансий
-    tasks = [
-        process_single_vacancy(vacancy_id, proxy_manager) for vacancy_id in vacancy_ids
-    ]
-
-    # Выполняем все задачи
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    # Обрабатываем результаты
-    processed_results = []
-    for i, result in enumerate(results):
-        vacancy_id = vacancy_ids[i]
-        if isinstance(result, Exception):
-            logger.error(
-                f"🚨 Необработанное исключение для {vacancy_id}: {str(result)}"
-            )
-            processed_results.append(None)
-        else:
-            processed_results.append(result)
+    # Один воркер на прокси: больше параллельных проверок все равно не выполнить
+    workers_count = max(1, len(working_proxies))
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers_count * 2)
+    summary = CheckSummary()
+    pending_closed: List[str] = []
+    pending_active: List[str] = []
+
+    def write_results(closed: List[str], active: List[str]):
+        close_vacancies(closed)
+        if scheduler is not None:
+            scheduler.record_closed(closed)
+            scheduler.record_active(active)
+
+    async def flush_results():
+        """Записывает накопленные результаты проверки в базу"""
+        if not pending_closed and not pending_active:
+            return
+        closed, active = pending_closed[:], pending_active[:]
+        pending_closed.clear()
+        pending_active.clear()
+        try:
+            await asyncio.to_thread(write_results, closed, active)
+        except Exception as e:
+            logger.error(f"🚨 Не удалось записать результаты проверки ({len(closed)} закрытых): {str(e)}")
+            return
+        summary.flushed += len(closed) + len(active)
+        logger.info(f"💾 Записано результатов проверки: {summary.flushed}"
+                    f"/{vacancy_count if vacancy_count is not None else '?'}")
+
+    async def worker():
+        while True:
+            vacancy_id = await queue.get()
+            try:
+                if vacancy_id is None:
+                    return
+                try:
+                    result = await process_single_vacancy(vacancy_id, proxy_manager)
+                except Exception as e:
+                    logger.error(f"🚨 Необработанное исключение для {vacancy_id}: {str(e)}")
+                    result = None
+                summary.add(vacancy_id, result)
+                if on_result is not None:
+                    on_result(vacancy_id, result)
+                if persist_closed and isinstance(result, str):
+                    pending_closed.append(result)
+                elif scheduler is not None and result is False:
+                    pending_active.append(vacancy_id)
+                if len(pending_closed) + len(pending_active) >= close_batch_size:
+                    await flush_results()
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(workers_count)]
+    try:
+        for vacancy_id in vacancy_ids:
+            await queue.put(vacancy_id)  # Ждет, если воркеры не успевают
+    finally:
+        for _ in workers:
+            await queue.put(None)  # По одному маркеру завершения на воркер
+        await asyncio.gather(*workers)
+        await flush_results()
+        await proxy_manager.close()
 
-    return processed_results
+    return summary
 
 
 async def main():
@@ -447,9 +742,16 @@ async def main():
     # Загружаем прокси
     proxies = load_proxies_from_config(your_proxy_config)
 
-    # ID вакансий для проверки
-    vacancy_ids = get_open_vacancies_links()
-    
+    # ID вакансий, срок проверки которых наступил
+    initialize_database()
+    scheduler = RecheckScheduler()
+    vacancy_ids = scheduler.due_ids()
+    if not vacancy_ids:
+        # Проверять нечего: не тестируем прокси и не сообщаем о запуске
+        logger.info("Нет вакансий, срок проверки которых наступил")
+        scheduler.close()
+        return CheckSummary()
+
     try:
         message = f'(TW parser hh) Проверка закрытых вакансий началась: {len(vacancy_ids)}!'
         await send_simple_message(message)
@@ -458,32 +760,28 @@ async def main():
 
     try:
         # Проверяем вакансии
-        results = await check_vacancies_batch(
-            vacancy_ids=vacancy_ids, proxies=proxies, test_proxies=True
+        summary = await check_vacancies_batch(
+            vacancy_ids=vacancy_ids, proxies=proxies, test_proxies=True, scheduler=scheduler
         )
 
         # Статистика
-        total = len(results)
-        closed = sum(1 for r in results if isinstance(r, str))
-        active = sum(1 for r in results if r is False)
-        errors = sum(1 for r in results if r is None)
+        total = summary.total
+        closed = summary.closed
+        active = summary.active
+        errors = summary.errors
 
         # Вывод в консоль
         print(f"\n📊 Результаты:")
         print(f"Всего проверено: {total}")
-        print(f"Закрытых: {closed} ({closed / total * 100:.1f}%)")
-        print(f"Активных: {active} ({active / total * 100:.1f}%)")
-        print(f"Ошибок: {errors} ({errors / total * 100:.1f}%)")
-
-        # Показываем закрытые вакансии
-        closed_ids = [r for r in results if isinstance(r, str)]
-        if closed_ids:
-            print(f"Закрытые ID: {', '.join(closed_ids)}")
+        if total:
+            print(f"Закрытых: {closed} ({closed / total * 100:.1f}%)")
+            print(f"Активных: {active} ({active / total * 100:.1f}%)")
+            print(f"Ошибок: {errors} ({errors / total * 100:.1f}%)")
 
         # Отправляем финальный отчет в Telegram
-        await send_final_report(total, closed, active, errors, closed_ids)
+        await send_final_report(total, closed, active, errors)
 
-        return results
+        return summary
 
     except Exception as e:
         logger.error(f"Ошибка в main: {e}")
@@ -492,7 +790,10 @@ async def main():
             await send_simple_message(message)
         except Exception as err:
             logger.error(f"Ошибка при отправке сообщения об ошибке: {err}")
-        return []
+        return CheckSummary()
+
+    finally:
+        scheduler.close()
 
 
 if __name__ == "__main__":
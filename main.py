@@ -1,7 +1,6 @@
-from src.check_vacancy_status.vacancy_checker import check_vacancy_status
-from src.crawl_links.link_crawler import crawl_links
-from src.database.db_manager import get_total_vacancies, get_today_vacancies_count
-from src.parser.vacancy_parser import parser
+from src.crawl_links.link_pipeline import run_pipeline
+from src.database.db_manager import get_vacancies_summary
+from src.utils.http_client import format_transport_stats
 from src.utils.telegram_bot import send_simple_message
 import psutil
 import time
@@ -16,9 +15,8 @@ except Exception as err:
 
 
 def main():
-    parser()
-    crawl_links(False, "16_vacancies_links.txt")
-    crawl_links(False, "113_vacancies_links.txt")
+    # Сбор ссылок и детальный обход идут одновременно, без промежуточных файлов
+    run_pipeline(incremental=True)
     # get_total_vacancies()
     # get_today_vacancies_count()
     # get_last_vacancy()
@@ -44,12 +42,15 @@ if __name__ == "__main__":
     usage_CPU = f"CPU: {end_cpu}%"
     usage_Memory = f"Memory: {end_memory / (1024 * 1024)} MB"
     usage_time = f"Время выполнения: {hours:02d}:{minutes:02d}:{seconds:02d}"
-    vacancies_info = f"Все вакансии в базе: {get_total_vacancies()}\nСегодня добавлено: {get_today_vacancies_count()}"
-
-    print(f"{usage_CPU}\n{usage_Memory}\n{usage_time}")
-    print(
-        f"Все вакансии в базе: {get_total_vacancies()}\nСегодня добавлено: {get_today_vacancies_count()}"
+    summary = get_vacancies_summary()
+    vacancies_info = (
+        f"Все вакансии в базе: {summary['total']}\nСегодня добавлено: {summary['today']}\n"
+        f"Открытых: {summary['open']}"
     )
+    transport_info = format_transport_stats()
+
+    print(f"{usage_CPU}\n{usage_Memory}\n{usage_time}\n{transport_info}")
+    print(vacancies_info)
 
-    message = f"(Mac)\n{usage_CPU}\n{usage_Memory}\n{usage_time}\n{vacancies_info}"
+    message = f"(Mac)\n{usage_CPU}\n{usage_Memory}\n{usage_time}\n{vacancies_info}\n{transport_info}"
     asyncio.run(send_simple_message(message))
@@ -0,0 +1,169 @@
+"""Поиск закрытых вакансий по разнице между открытыми вакансиями в базе и активной выдачей поиска."""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any
+
+from src.check_vacancy_status.recheck_scheduler import RecheckScheduler
+from src.crawl_links.known_vacancies import published_timestamp
+from src.crawl_links.main_requests import fetch_vacancy_data_async
+from src.database.db_manager import (
+    close_vacancies,
+    get_oldest_open_published_at,
+    get_open_vacancies_links,
+    initialize_database,
+)
+from src.parser.category_manager import collect_countries
+from src.utils.http_client import create_async_client
+from src.utils.main_logger import setup_logger
+from src.utils.rate_limiter import AsyncRateLimiter
+
+logger = setup_logger(__name__)
+
+VACANCY_API_URL = 'https://api.hh.ru/vacancies/{}?host=hh.ru'
+# Сколько результатов записывать в базу за одну транзакцию
+WRITE_BATCH_SIZE = 500
+# Максимальная длина окна выдачи, дней: вакансии, опубликованные раньше
+# (или без даты публикации), не ищутся в выдаче и проверяются отдельно
+MAX_LISTING_DAYS = 30
+
+
+async def collect_active_ids(countries: tuple[int, ...], date_from: str) -> set[str]:
+    """
+    Собирает ID всех активных вакансий из выдачи поиска.
+
+    Выдача обходится тем же способом, что и при сборе ссылок (все категории,
+    разбиение запроса на подзапросы меньше 2000 результатов), но за окно
+    публикации начиная с date_from. Одна страница выдачи подтверждает до 100
+    вакансий сразу.
+
+    Args:
+        countries (tuple[int, ...]): ID стран.
+        date_from (str): Начало окна публикации (ISO 8601).
+
+    Returns:
+        set[str]: ID вакансий, присутствующих в выдаче.
+    """
+    active: set[str] = set()
+
+    async def on_items(country: int, items: list[dict[str, Any]]) -> None:
+        active.update(item['id'] for item in items)
+
+    await collect_countries({country: None for country in countries}, on_items=on_items, date_from=date_from)
+    return active
+
+
+async def probe_closed(ids: list[str], workers: int, calls_per_minute: int) -> tuple[list[str], list[str]]:
+    """
+    Проверяет вакансии отдельными запросами: закрытой считается вакансия с ответом 404/410.
+
+    Args:
+        ids (list[str]): ID вакансий для проверки.
+        workers (int): Количество одновременных запросов.
+        calls_per_minute (int): Лимит запросов в минуту.
+
+    Returns:
+        tuple[list[str], list[str]]: ID закрытых и ID подтвержденных открытых вакансий
+            (вакансии, которые не удалось проверить, не попадают ни в один список).
+    """
+    queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=workers * 2)
+    limiter = AsyncRateLimiter(calls_per_minute=calls_per_minute)
+    closed: list[str] = []
+    active: list[str] = []
+
+    async def worker(client) -> None:
+        while True:
+            vacancy_id = await queue.get()
+            try:
+                if vacancy_id is None:
+                    return
+                data = await fetch_vacancy_data_async(client, VACANCY_API_URL.format(vacancy_id), limiter)
+                if data is None:
+                    continue
+                (closed if data.get('closed') else active).append(vacancy_id)
+            except Exception as err:
+                logger.error(f"Ошибка проверки вакансии {vacancy_id}: {err}")
+            finally:
+                queue.task_done()
+
+    async with create_async_client(max_connections=workers, max_keepalive=workers) as client:
+        tasks = [asyncio.create_task(worker(client)) for _ in range(workers)]
+        try:
+            for vacancy_id in ids:
+                await queue.put(vacancy_id)
+        finally:
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+    return closed, active
+
+
+def _write_results(closed: list[str], active: list[str], scheduler: RecheckScheduler | None) -> None:
+    """Закрывает вакансии и обновляет расписание проверок пачками"""
+    for start in range(0, len(closed), WRITE_BATCH_SIZE):
+        close_vacancies(closed[start:start + WRITE_BATCH_SIZE])
+    if scheduler is not None:
+        scheduler.record_closed(closed)
+        for start in range(0, len(active), WRITE_BATCH_SIZE):
+            scheduler.record_active(active[start:start + WRITE_BATCH_SIZE])
+
+
+async def detect_closed_async(
+        countries: tuple[int, ...] = (113, 16),
+        probe_workers: int = 8,
+        calls_per_minute: int = 80,
+        scheduler: RecheckScheduler | None = None,
+) -> dict[str, int]:
+    """
+    Находит закрытые вакансии без запроса каждой открытой вакансии по отдельности.
+
+    Открытые вакансии из базы сравниваются с ID активной выдачи поиска:
+    отдельный запрос /vacancies/{id} отправляется только для вакансий,
+    которых нет в выдаче (закрытых, перенесенных в другую категорию и т.п.).
+    Закрытыми считаются только вакансии, получившие 404/410.
+
+    Args:
+        countries (tuple[int, ...]): ID стран.
+        probe_workers (int): Количество одновременных проверочных запросов.
+        calls_per_minute (int): Лимит проверочных запросов в минуту.
+        scheduler (RecheckScheduler | None): Расписание проверок; вакансии из выдачи
+            и подтвержденные проверкой отмечаются в нем открытыми.
+
+    Returns:
+        dict[str, int]: Статистика: open (открытых в базе), listed (найдено в выдаче),
+            probed (проверено отдельно), closed (закрыто).
+    """
+    open_ids = set(get_open_vacancies_links())
+    stats = {'open': len(open_ids), 'listed': 0, 'probed': 0, 'closed': 0}
+    if not open_ids:
+        return stats
+
+    # Окно выдачи начинается с публикации самой старой открытой вакансии, но не раньше
+    # MAX_LISTING_DAYS назад (published_timestamp возвращает 0, если даты нет)
+    oldest = max(published_timestamp(get_oldest_open_published_at()), time.time() - MAX_LISTING_DAYS * 86400)
+    date_from = datetime.fromtimestamp(oldest).astimezone().isoformat(timespec='seconds')
+    listed = await collect_active_ids(countries, date_from) & open_ids
+    missing = sorted(open_ids - listed)
+    logger.info(f"Открытых вакансий: {len(open_ids)}, в выдаче: {len(listed)}, проверяем отдельно: {len(missing)}")
+
+    closed, confirmed = await probe_closed(missing, probe_workers, calls_per_minute)
+    await asyncio.to_thread(_write_results, closed, [*listed, *confirmed], scheduler)
+
+    stats.update(listed=len(listed), probed=len(missing), closed=len(closed))
+    logger.info(f"Поиск закрытых вакансий завершен: {stats}")
+    return stats
+
+
+def detect_closed(countries: tuple[int, ...] = (113, 16)) -> dict[str, int]:
+    """Синхронная точка входа поиска закрытых вакансий"""
+    initialize_database()
+    scheduler = RecheckScheduler()
+    try:
+        return asyncio.run(detect_closed_async(countries, scheduler=scheduler))
+    finally:
+        scheduler.close()
+
+
+if __name__ == "__main__":
+    print(detect_closed())
@@ -0,0 +1,174 @@
+"""Планировщик повторных проверок открытых вакансий: проверяются только вакансии, срок проверки которых наступил."""
+
+import sqlite3
+import statistics
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from src.database.db_manager import DB_PATH
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Границы интервала между проверками одной вакансии, дней
+MIN_INTERVAL_DAYS = 0.5
+MAX_INTERVAL_DAYS = 14.0
+# Типичная продолжительность жизни вакансии, если по категории еще нет закрытых вакансий, дней
+DEFAULT_LIFETIME_DAYS = 30.0
+# Минимум закрытых вакансий категории для расчета медианы
+MIN_LIFETIME_SAMPLES = 20
+
+
+def next_interval(age_days: float, lifetime_days: float, confirmations: int) -> float:
+    """
+    Рассчитывает интервал до следующей проверки вакансии.
+
+    До типичной продолжительности жизни в категории интервал равен половине
+    оставшегося срока, поэтому проверки учащаются к концу срока, когда вакансии
+    закрываются чаще всего. Вакансии, пережившие типичный срок, проверяются
+    с минимальным интервалом, который понемногу растет с числом подтверждений.
+
+    Args:
+        age_days (float): Возраст вакансии (с момента публикации), дней.
+        lifetime_days (float): Медианная продолжительность жизни вакансий категории, дней.
+        confirmations (int): Сколько проверок подряд вакансия оказалась открытой.
+
+    Returns:
+        float: Интервал до следующей проверки, дней.
+    """
+    interval = max(lifetime_days - age_days, 0) / 2
+    if age_days >= lifetime_days:
+        interval = MIN_INTERVAL_DAYS * (1 + 0.25 * min(confirmations, 8))
+    return min(max(interval, MIN_INTERVAL_DAYS), MAX_INTERVAL_DAYS)
+
+
+class RecheckScheduler:
+    """
+    Хранит время последней и следующей проверки каждой открытой вакансии.
+
+    Данные лежат в таблице vacancy_checks базы vacancies.db. Медианная
+    продолжительность жизни по категориям (professional_roles_name)
+    рассчитывается один раз при создании по уже закрытым вакансиям.
+
+    Attributes:
+        lifetimes (dict[str, float]): Медианная продолжительность жизни вакансий по категориям, дней.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS vacancy_checks (
+                id TEXT PRIMARY KEY,
+                last_checked_at TEXT,
+                next_check_at TEXT,
+                confirmations INTEGER DEFAULT 0
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_vacancy_checks_next ON vacancy_checks(next_check_at);')
+        self._conn.commit()
+        self.lifetimes = self._load_lifetimes()
+
+    def _load_lifetimes(self) -> dict[str, float]:
+        """Считает медианную продолжительность жизни закрытых вакансий по категориям"""
+        samples: dict[str, list[float]] = defaultdict(list)
+        cursor = self._conn.execute('''
+            SELECT professional_roles_name,
+                   julianday(substr(vacancy_close_date, 1, 19)) - julianday(substr(published_at, 1, 19))
+            FROM vacancies
+            WHERE vacancy_close_date IS NOT NULL AND published_at IS NOT NULL
+        ''')
+        for role, lifetime in cursor:
+            if lifetime is not None and lifetime >= 0:
+                samples[role].append(lifetime)
+        lifetimes = {role: statistics.median(values) for role, values in samples.items()
+                     if len(values) >= MIN_LIFETIME_SAMPLES}
+        logger.info(f"Медианная продолжительность жизни рассчитана для {len(lifetimes)} категорий")
+        return lifetimes
+
+    def due_ids(self, limit: Optional[int] = None, now: Optional[datetime] = None) -> List[str]:
+        """
+        Возвращает ID открытых вакансий, которые пора проверить.
+
+        Сначала идут ни разу не проверенные вакансии, затем — по возрастанию
+        времени следующей проверки.
+
+        Args:
+            limit (int | None): Максимальное количество ID.
+            now (datetime | None): Текущее время (по умолчанию datetime.now()).
+
+        Returns:
+            List[str]: ID вакансий к проверке.
+        """
+        now = (now or datetime.now()).isoformat(timespec='seconds')
+        sql = '''
+            SELECT v.id FROM vacancies v
+            LEFT JOIN vacancy_checks c ON c.id = v.id
+            WHERE v.vacancy_close_date IS NULL AND (c.next_check_at IS NULL OR c.next_check_at <= ?)
+            ORDER BY c.next_check_at IS NOT NULL, c.next_check_at
+        '''
+        params: tuple = (now,)
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params += (limit,)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def record_active(self, vacancy_ids: Iterable[str], now: Optional[datetime] = None) -> None:
+        """
+        Отмечает вакансии подтвержденными открытыми и назначает им следующую проверку.
+
+        Args:
+            vacancy_ids (Iterable[str]): ID вакансий, оказавшихся открытыми.
+            now (datetime | None): Время проверки (по умолчанию datetime.now()).
+        """
+        vacancy_ids = list(vacancy_ids)
+        if not vacancy_ids:
+            return
+        now = now or datetime.now()
+        checked_at = now.isoformat(timespec='seconds')
+        with self._lock:
+            placeholders = ','.join('?' * len(vacancy_ids))
+            rows = self._conn.execute(f'''
+                SELECT v.id, v.professional_roles_name,
+                       julianday(?) - julianday(substr(v.published_at, 1, 19)),
+                       COALESCE(c.confirmations, 0)
+                FROM vacancies v
+                LEFT JOIN vacancy_checks c ON c.id = v.id
+                WHERE v.id IN ({placeholders})
+            ''', (checked_at, *vacancy_ids)).fetchall()
+
+            updates = []
+            for vacancy_id, role, age_days, confirmations in rows:
+                lifetime = self.lifetimes.get(role, DEFAULT_LIFETIME_DAYS)
+                interval = next_interval(age_days or 0.0, lifetime, confirmations + 1)
+                next_check_at = (now + timedelta(days=interval)).isoformat(timespec='seconds')
+                updates.append((vacancy_id, checked_at, next_check_at, confirmations + 1))
+
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO vacancy_checks (id, last_checked_at, next_check_at, confirmations) '
+                    'VALUES (?, ?, ?, ?)',
+                    updates,
+                )
+
+    def record_closed(self, vacancy_ids: Iterable[str]) -> None:
+        """Удаляет закрытые вакансии из расписания"""
+        with self._lock, self._conn:
+            self._conn.executemany('DELETE FROM vacancy_checks WHERE id = ?', [(i,) for i in vacancy_ids])
+
+    def close(self) -> None:
+        """Закрывает соединение"""
+        with self._lock:
+            self._conn.close()
+
+
+def get_due_vacancy_ids(limit: Optional[int] = None) -> List[str]:
+    """Возвращает ID открытых вакансий, срок проверки которых наступил"""
+    scheduler = RecheckScheduler()
+    try:
+        return scheduler.due_ids(limit)
+    finally:
+        scheduler.close()
@@ -1,10 +1,48 @@
 from src.crawl_links.main_requests import fetch_vacancy_data
 from datetime import datetime
-from src.database.db_manager import get_open_vacancies_links, close_vacancy
+from src.check_vacancy_status.closure_detector import detect_closed
+from src.check_vacancy_status.recheck_scheduler import RecheckScheduler
+from src.database.db_manager import close_vacancies, initialize_database
+
+# Сколько закрытых вакансий записывать в базу одной транзакцией
+CLOSE_BATCH_SIZE = 200
+
+
+def flush_results(scheduler, closed_ids, active_ids):
+    """Записывает накопленные результаты проверки пачкой и очищает списки"""
+    try:
+        close_vacancies(closed_ids)
+        scheduler.record_closed(closed_ids)
+        scheduler.record_active(active_ids)
+    except Exception as err:
+        print(f'Проблемы обновления данных о {len(closed_ids)} закрытых вакансиях \nError:{err}')
+    closed_ids.clear()
+    active_ids.clear()
 
 
 def check_vacancy_status():
-    list_vacancies_ids = get_open_vacancies_links()
+    """
+    Закрывает вакансии, которые пропали с hh.ru.
+
+    Открытые вакансии сверяются с активной выдачей поиска (см. detect_closed),
+    отдельными запросами проверяются только вакансии, которых нет в выдаче.
+
+    Returns:
+        dict[str, int]: Статистика detect_closed.
+    """
+    stats = detect_closed()
+    print(f"Открытых: {stats['open']}, в выдаче: {stats['listed']}, "
+          f"проверено отдельно: {stats['probed']}, закрыто: {stats['closed']}")
+    return stats
+
+
+def recheck_due_vacancies():
+    """Проверяет отдельными запросами вакансии, срок проверки которых наступил (без сверки с выдачей)"""
+    initialize_database()
+    scheduler = RecheckScheduler()
+    list_vacancies_ids = scheduler.due_ids()
+    pending_closed = []
+    pending_active = []
     closed_positions = 0
     all_vacancies_processed = 0
     country = 0
@@ -27,15 +65,17 @@ def check_vacancy_status():
         if data.get('closed'):
             vacancy_closed = datetime.now().isoformat(),
             closed_positions +=1
-            try:
-                close_vacancy(vacancy_id)
-                print(f"link_crawler_vacancy_close: \n'vacancy_id':{vacancy_id}, \n'vacancy_closed': {vacancy_closed}\n----------\n")
-            except Exception as err:
-                print(f'Проблемы обновления данных о закрытой вакансии {vacancy_id} \nError:{err}')
-        # else:
-        #     print(f"вакансия еще не закрыта {vacancy_id}!")
+            pending_closed.append(vacancy_id)
+            print(f"link_crawler_vacancy_close: \n'vacancy_id':{vacancy_id}, \n'vacancy_closed': {vacancy_closed}\n----------\n")
+        else:
+            pending_active.append(vacancy_id)
+        if len(pending_closed) + len(pending_active) >= CLOSE_BATCH_SIZE:
+            flush_results(scheduler, pending_closed, pending_active)
         all_vacancies_processed += 1
 
+    flush_results(scheduler, pending_closed, pending_active)
+    scheduler.close()
+
     # print(f"Проверка закрытых вакансий отработала успешно!")
     # print(f"Закрылось вакансий: {closed_positions}")
     # print(f"Всех вакансйи обработано: {all_vacancies_processed}")
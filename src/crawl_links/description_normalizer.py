@@ -0,0 +1,101 @@
+"""Преобразование HTML-описания вакансии в текст с сохранением абзацев и списков."""
+
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+# Теги, которые начинают новый абзац
+BLOCK_TAGS = frozenset({
+    'p', 'div', 'section', 'article', 'blockquote', 'pre', 'table', 'tr',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol',
+})
+# Теги, содержимое которых не является текстом описания
+SKIP_TAGS = frozenset({'script', 'style', 'head', 'title'})
+
+_WHITESPACE = re.compile(r'\s+')
+_EXTRA_NEWLINES = re.compile(r'\n{3,}')
+
+
+class _DescriptionParser(HTMLParser):
+    """
+    Потоковый разбор HTML без построения дерева.
+
+    Текст собирается в список фрагментов: блочные теги разделяются пустой
+    строкой, <br> — переводом строки, элементы списков — строками
+    с префиксом '- ' (или '1. ' для нумерованных списков).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+        self._lists: list[int | None] = []  # Счетчик элементов для <ol>, None для <ul>
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'br':
+            self.parts.append('\n')
+        elif tag == 'li':
+            prefix = '- '
+            if self._lists and self._lists[-1] is not None:
+                self._lists[-1] += 1
+                prefix = f'{self._lists[-1]}. '
+            self.parts.append('\n' + prefix)
+        elif tag in BLOCK_TAGS:
+            if tag == 'ul':
+                self._lists.append(None)
+            elif tag == 'ol':
+                self._lists.append(0)
+            self.parts.append('\n\n')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'br':
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in BLOCK_TAGS:
+            if tag in ('ul', 'ol') and self._lists:
+                self._lists.pop()
+            self.parts.append('\n\n')
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(_WHITESPACE.sub(' ', data))
+
+
+def _tidy(text: str) -> str:
+    """Убирает пробелы по краям строк и лишние пустые строки"""
+    lines = [line.strip() for line in text.split('\n')]
+    return _EXTRA_NEWLINES.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def normalize_description(html: str | None) -> str:
+    """
+    Преобразует HTML-описание вакансии из API hh.ru в текст.
+
+    Абзацы разделяются пустой строкой, элементы списков начинаются с '- '
+    (или с номера), HTML-сущности раскрываются, остальная разметка отбрасывается.
+
+    Args:
+        html (str | None): HTML-описание.
+
+    Returns:
+        str: Текст описания (пустая строка для пустого описания).
+
+    Examples:
+        >>> normalize_description('<p>Задачи:</p><ul><li>Python</li><li>SQL</li></ul>')
+        'Задачи:\\n\\n- Python\\n- SQL'
+    """
+    if not html:
+        return ''
+    if '<' not in html:
+        # Описание без разметки: только сущности и пробелы
+        return _tidy(_WHITESPACE.sub(' ', unescape(html)))
+
+    parser = _DescriptionParser()
+    parser.feed(html)
+    parser.close()
+    return _tidy(''.join(parser.parts))
@@ -0,0 +1,76 @@
+"""Компактный индекс уже сохраненных вакансий для отсева повторных детальных запросов."""
+
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+from src.database.db_manager import iter_known_vacancies
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def published_timestamp(published_at: str | None) -> int:
+    """Преобразует published_at из API ('2025-08-19T10:00:00+0300') в UNIX-время (0, если не разобрать)."""
+    if not published_at:
+        return 0
+    try:
+        return int(datetime.strptime(published_at, '%Y-%m-%dT%H:%M:%S%z').timestamp())
+    except ValueError:
+        return 0
+
+
+class KnownVacancies:
+    """
+    Отсортированные массивы ID и времени публикации сохраненных вакансий.
+
+    Хранит по 16 байт на вакансию (два массива int64) вместо множества строк,
+    поиск — бинарный. Вакансия считается актуальной, если она есть в базе и
+    её published_at в выдаче совпадает с сохраненным: при изменении или
+    переопубликации hh.ru обновляет published_at.
+
+    Attributes:
+        ids (array): Отсортированные ID вакансий.
+        published (array): Время публикации (UNIX-время) для соответствующих ID.
+    """
+
+    def __init__(self, ids: array | None = None, published: array | None = None):
+        self.ids = ids if ids is not None else array('q')
+        self.published = published if published is not None else array('q')
+
+    @classmethod
+    def load(cls) -> 'KnownVacancies':
+        """Загружает индекс из базы вакансий"""
+        ids, published = array('q'), array('q')
+        for vacancy_id, published_at in iter_known_vacancies():
+            try:
+                ids.append(int(vacancy_id))
+            except (TypeError, ValueError):
+                continue
+            published.append(published_timestamp(published_at))
+        logger.info(f"Загружено известных вакансий: {len(ids)}")
+        return cls(ids, published)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def is_current(self, vacancy_id: str | int, published_at: str | None) -> bool:
+        """
+        Проверяет, что вакансия уже сохранена и не менялась.
+
+        Args:
+            vacancy_id (str | int): ID вакансии.
+            published_at (str | None): published_at из выдачи поиска.
+
+        Returns:
+            bool: True, если детальный запрос для вакансии не нужен.
+        """
+        try:
+            key = int(vacancy_id)
+        except (TypeError, ValueError):
+            return False
+        index = bisect_left(self.ids, key)
+        if index == len(self.ids) or self.ids[index] != key:
+            return False
+        stored = self.published[index]
+        return stored != 0 and stored == published_timestamp(published_at)
@@ -1,14 +1,31 @@
-from bs4 import BeautifulSoup
-from src.crawl_links.main_requests import fetch_vacancy_data
+import asyncio
+import httpx
+from src.crawl_links.main_requests import fetch_vacancy_data, fetch_vacancy_data_async
+from src.crawl_links.parse_stage import CSV_FIELDS, ParseStage, csv_record
+from src.crawl_links.response_cache import ResponseCache, get_response_cache
+from src.utils.http_client import create_async_client
+from src.utils.rate_limiter import AsyncRateLimiter
 import csv
+import os
 from datetime import datetime
 from urllib.parse import urlparse
-from src.database.db_manager import save_data_to_sqlite
+from src.database.checkpoint import CrawlCheckpoint
+from src.database.db_manager import (
+    PreparedVacancy,
+    flush_vacancy_writer,
+    get_vacancy_writer,
+    initialize_database,
+    prepare_vacancy,
+)
+from src.models.vacancy_data import VacancyData
 from src.utils.main_logger import setup_logger
 
 # Инициализация логгера для текущего модуля
 logger = setup_logger(__name__)
 
+# CSV-копия собранных вакансий (для аналитики лучше src.export.parquet_exporter)
+CSV_PATH = 'vacancies.csv'
+
 
 def get_link_id(url):
     """Извлекает ID вакансии из URL.
@@ -27,35 +44,36 @@ def get_link_id(url):
 
 
 def add_to_csv(data):
-    """Добавляет данные вакансии в CSV файл.
-
-    Если файл не существует, создает его и записывает заголовки.
-    Если файл существует, добавляет данные в конец файла.
+    """Добавляет данные одной вакансии в CSV файл (см. add_rows_to_csv).
 
     Args:
         data (dict): Словарь с данными вакансии для записи
     """
-    # Имя файла
-    csv_file = 'vacancies.csv'
-
-    # Проверяем, существует ли файл, чтобы записать заголовки при первом запуске
-    file_exists = False
-    try:
-        with open(csv_file, 'r') as f:
-            file_exists = True
-    except FileNotFoundError:
-        pass
-
-    # Открываем файл в режиме добавления
-    with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=data.keys())
-
-        # Записываем заголовки, если файл новый
+    add_rows_to_csv([data])
+
+
+def add_rows_to_csv(records: list[dict]) -> None:
+    """Дописывает пачку вакансий в CSV файл за одно открытие файла.
+
+    Колонки фиксированы (CSV_FIELDS), лишние ключи игнорируются; навыки
+    записываются строкой через ', '.
+    Если файл не существует, он создается с заголовком.
+
+    Args:
+        records (list[dict]): Записи вакансий (например, csv_record)
+    """
+    if not records:
+        return
+    file_exists = os.path.exists(CSV_PATH)
+    with open(CSV_PATH, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction='ignore')
         if not file_exists:
             writer.writeheader()
-
-        # Добавляем новую строку
-        writer.writerow(data)
+        for record in records:
+            skills = record.get('skills')
+            if isinstance(skills, (list, tuple)):
+                record = {**record, 'skills': ', '.join(skills)}
+            writer.writerow(record)
 
 
 def vacancy_close(res_data):
@@ -98,7 +116,19 @@ def get_country_from_filename(filename: str) -> str:
     Returns:
         str: Название страны ('Беларусь' или 'Россия') или 'Неизвестно'.
     """
-    country_code = filename.split('_')[0]
+    return get_country_name(filename.split('_')[0])
+
+
+def get_country_name(country_code: str | int) -> str:
+    """Возвращает название страны по ID региона hh.ru.
+
+    Args:
+        country_code (str | int): ID региона, например, 16 или '113'.
+
+    Returns:
+        str: Название страны ('Беларусь' или 'Россия') или 'Неизвестно'.
+    """
+    country_code = str(country_code)
 
     if country_code == "16":
         return "Беларусь"
@@ -108,7 +138,14 @@ def get_country_from_filename(filename: str) -> str:
         return "Неизвестно"
 
 
-def crawl_links(url: str | bool, file_path: str) -> None:
+def crawl_links(
+        url: str | bool,
+        file_path: str,
+        concurrent: bool = False,
+        workers: int = 8,
+        calls_per_minute: int = 80,
+        use_cache: bool = True,
+) -> None:
     """Основная функция для обработки ссылок на вакансии.
 
     Если url не указан, читает ссылки из файла 'vacancies_links.txt'.
@@ -116,140 +153,197 @@ def crawl_links(url: str | bool, file_path: str) -> None:
 
     Args:
         url (str or bool): URL для обработки или False для чтения из файла
+        file_path (str): Файл со ссылками, по имени определяется страна
+        concurrent (bool): Обрабатывать ссылки из файла конкурентно через asyncio
+        workers (int): Количество одновременных воркеров в конкурентном режиме
+        calls_per_minute (int): Общий лимит запросов в минуту в конкурентном режиме
+        use_cache (bool): Использовать кэш условных запросов и пропускать неизменившиеся вакансии
     """
 
+    initialize_database()
     country = get_country_from_filename(file_path)
+    cache = get_response_cache() if use_cache else None
+    confirm_cache_on_commit(cache)
 
     if not url:
-        urls = read_links_from_file(file_path)
-
-        for link in urls:
-            main(link, country)
+        # Журнал обработанных ID: после падения обход продолжится с места остановки
+        checkpoint = CrawlCheckpoint(f'crawl:{file_path}')
+        urls = [link for link in read_links_from_file(file_path)
+                if not checkpoint.is_done('id', get_link_id(link))]
+
+        try:
+            if concurrent:
+                asyncio.run(crawl_links_async(urls, country, workers, calls_per_minute, cache, checkpoint))
+            else:
+                for link in urls:
+                    if main(link, country, cache):
+                        checkpoint.mark_done('id', get_link_id(link))
+            checkpoint.complete()
+        finally:
+            checkpoint.close()
     else:
-        main(url, country)
+        main(url, country, cache)
 
+    # Дописываем накопленный пакет, чтобы данные были видны сразу после обхода
+    flush_vacancy_writer()
 
-# Тестовый URL для отладки
-test_url = "https://api.hh.ru/vacancies/124953065?host=hh.ru"
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Кэш ответов: без изменений {stats['hits']}, новых/изменённых {stats['misses']}")
 
 
-def safe_get(d, *keys, default=None):
-    """Безопасно получает значение по цепочке ключей из словаря.
+async def crawl_links_async(
+        urls: list[str],
+        country: str,
+        workers: int = 8,
+        calls_per_minute: int = 80,
+        cache: ResponseCache | None = None,
+        checkpoint: CrawlCheckpoint | None = None,
+) -> None:
+    """Конкурентно обрабатывает ссылки на вакансии ограниченным пулом воркеров.
+
+    Все воркеры используют один httpx.AsyncClient и один AsyncRateLimiter,
+    поэтому общий темп запросов ограничен calls_per_minute, но ожидание ответа
+    одного запроса не задерживает остальные.
 
     Args:
-        d (dict): Словарь для поиска
-        *keys: Цепочка ключей для последовательного доступа
-        default: Значение по умолчанию, если ключ не найден
+        urls (list[str]): Список URL вакансий
+        country (str): Название страны для записи в базу
+        workers (int): Количество одновременных воркеров
+        calls_per_minute (int): Общий лимит запросов в минуту
+        cache (ResponseCache | None): Кэш условных запросов
+        checkpoint (CrawlCheckpoint | None): Журнал обработанных ID
+    """
+    limiter = AsyncRateLimiter(calls_per_minute=calls_per_minute)
+    workers = max(1, workers)
+    queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue()
+    for link in urls:
+        queue.put_nowait((link, country))
+    for _ in range(workers):
+        queue.put_nowait(None)  # По одному маркеру завершения на воркер
+
+    async with create_async_client(max_connections=workers, max_keepalive=workers) as client, \
+            ParseStage(lambda items: store_parsed(items, checkpoint)) as parse_stage:
+        await asyncio.gather(*(detail_worker(client, queue, limiter, cache, checkpoint, parse_stage)
+                               for _ in range(workers)))
+
+    logger.info(f"Конкурентный обход завершён: {len(urls)} ссылок, {limiter.request_counter} запросов")
+
+
+async def detail_worker(
+        client: httpx.AsyncClient,
+        queue: asyncio.Queue,
+        limiter: AsyncRateLimiter,
+        cache: ResponseCache | None = None,
+        checkpoint: CrawlCheckpoint | None = None,
+        parse_stage: ParseStage | None = None,
+) -> None:
+    """Воркер детального обхода: берет (ссылка, страна) из очереди, пока не получит None.
+
+    Если передана стадия разбора, ответы с данными вакансии отправляются в нее,
+    а запись и отметка в журнале выполняются после разбора (см. store_parsed).
 
-    Returns:
-        Значение по указанным ключам или default если ключ не найден
+    Args:
+        client (httpx.AsyncClient): Общий асинхронный HTTP-клиент
+        queue (asyncio.Queue): Очередь пар (URL вакансии, название страны) и маркеров None
+        limiter (AsyncRateLimiter): Общий ограничитель частоты запросов
+        cache (ResponseCache | None): Кэш условных запросов
+        checkpoint (CrawlCheckpoint | None): Журнал обработанных ID
+        parse_stage (ParseStage | None): Стадия разбора ответов в пуле процессов
+    """
+    while True:
+        item = await queue.get()
+        try:
+            if item is None:
+                return
+            link, country = item
+            data = await fetch_vacancy_data_async(client, link, limiter, cache=cache)
+            if parse_stage is not None and data and not data.get('closed') and not data.get('not_modified'):
+                await parse_stage.submit(data, country)
+            elif process_vacancy(data, country) and checkpoint is not None:
+                checkpoint.mark_done('id', get_link_id(link))
+        except Exception as err:
+            logger.error(f"Ошибка обработки вакансии {item}: {err}")
+        finally:
+            queue.task_done()
+
+
+def confirm_cache_on_commit(cache: ResponseCache | None) -> None:
+    """Сохраняет ответы в кэше условных запросов только после записи вакансий в базу.
+
+    Args:
+        cache (ResponseCache | None): Кэш условных запросов
     """
-    for key in keys:
-        if isinstance(d, dict) and key in d:
-            d = d[key]
-        else:
-            return default
-    return d
+    if cache is not None:
+        get_vacancy_writer().add_commit_listener(cache.confirm)
+
+
+def store_parsed(items: list[PreparedVacancy], checkpoint: CrawlCheckpoint | None = None) -> None:
+    """Сохраняет разобранные стадией разбора вакансии в CSV и SQLite и отмечает их в журнале.
+
+    Args:
+        items (list[PreparedVacancy]): Подготовленные к записи вакансии
+        checkpoint (CrawlCheckpoint | None): Журнал обработанных ID
+    """
+    add_rows_to_csv([csv_record(item) for item in items])
+    get_vacancy_writer().add_prepared(items)
+    if checkpoint is not None:
+        for item in items:
+            checkpoint.mark_done('id', item.row[0])
+
 
+# Тестовый URL для отладки
+test_url = "https://api.hh.ru/vacancies/124953065?host=hh.ru"
 
-def main(link: str, country: str) -> None:
+
+def main(link: str, country: str, cache: ResponseCache | None = None) -> bool:
     """Основная функция обработки вакансии.
 
     Получает данные вакансии по API, парсит и сохраняет в CSV.
 
     Args:
         link (str): URL вакансии для обработки
+        country (str): Название страны
+        cache (ResponseCache | None): Кэш условных запросов
+
+    Returns:
+        bool: True, если ответ API получен и обработан
     """
     # Получаем данные вакансии через API
-    data = fetch_vacancy_data(link)
+    data = fetch_vacancy_data(link, cache=cache)
+    return process_vacancy(data, country)
+
+
+def process_vacancy(data: dict | None, country: str) -> bool:
+    """Обрабатывает ответ API по вакансии: парсит и сохраняет в CSV и SQLite.
 
+    Args:
+        data (dict | None): Ответ API по вакансии
+        country (str): Название страны
+
+    Returns:
+        bool: True, если ответ получен и обработан (в том числе закрытая или неизменившаяся вакансия)
+    """
     if not data:
         print("Ошибка: не удалось получить данные.")
-        return
+        return False
 
     # Проверяем, закрыта ли вакансия
     if data.get('closed'):
         logger.info(f"vacancy is closed! url: {data.get('url')}")
-        return
-    
-    # Обработка зарплатных ожиданий
-    sr = data.get("salary_range") or {}
-    mode = sr.get("mode") or {}                 # то же самое для mode
-    freq = sr.get("frequency") or {}
-
-    # Обрабатываем адрес вакансии
-    address_data = data.get('address')
-    address = address_data.get('raw') if isinstance(address_data,
-                                                    dict) else address_data if address_data is not None else None
-
-    # professional_roles_name
-    roles = data.get("professional_roles") or []
-    if not roles:
-        professional_roles_name = None
-    else:
-        professional_roles_name = roles[0].get("name")
+        return True
 
-    # work_format
-    work_format = data.get('schedule') or {}
-    if not work_format:
-        work_format_data = None
-    else:
-        work_format_data = work_format.get('name')
-
-    # work_schedule_by_days
-    employment = data.get('employment') or {}
-    if not employment:
-        employment_data = None
-    else:
-        employment_data = employment.get('name')
-
-    # company_accredited_it_employerl
-    company_employer = data.get('employer') or None
-    if not company_employer:
-        company_accredited = False
-    else:
-        company_accredited = company_employer.get('accredited_it_employer')
-
-
-    # Формируем структурированные данные вакансии
-    vacancy_data = {
-        'id': data.get('id'),
-        'country': country or None,
-        'site': 'hh_ru',
-        'title': data.get('name'),
-        'salary_from': sr.get("from"),
-        'salary_to': sr.get("to"),
-        'currency': sr.get("currency"),
-        'mode_name': mode.get("name"),
-        'frequency_name': freq.get("name"),
-        'city': safe_get(data, 'area', 'name'),
-        'address': address,
-        'experience': safe_get(data, 'experience', 'name'),
-        'schedule': safe_get(data, 'schedule', 'name'),
-        'employment': safe_get(data, 'employment', 'name'),
-        'description': BeautifulSoup(data.get('description', ''), 'html.parser').get_text() if data.get('description') else '',
-        'skills': [skill['name'] for skill in data.get('key_skills', [])],
-        'professional_roles_name': professional_roles_name,
-        'company_id': safe_get(data, 'employer', 'id'),
-        'company_name': safe_get(data, 'employer', 'name'),
-        'company_url': safe_get(data, 'employer', 'url'),
-        'company_vacancies_url': safe_get(data, 'employer', 'vacancies_url'),
-        'company_accredited_it_employerl': company_accredited,
-        'published_at': data.get('published_at'),
-        'created_at': data.get('created_at'),
-        'employment_form': safe_get(data, 'employment', 'name'),
-        'work_format': work_format_data,
-        'work_schedule_by_days': employment_data,
-        'vacancy_close_date': None,
-    }
+    # Вакансия не изменилась с прошлого обхода — не разбираем и не перезаписываем
+    if data.get('not_modified'):
+        return True
 
-    # Добавляем данные в CSV файл
-    add_to_csv(vacancy_data)
-    save_data_to_sqlite(vacancy_data)
+    # Сохраняем в CSV файл и в базу тем же путем, что и после стадии разбора
+    store_parsed([prepare_vacancy(VacancyData.from_api(data, country))])
 
     # Выводим данные для отладки
     # print(vacancy_data)
     print('Vacancie add!')
+    return True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+"""Потоковый конвейер: сбор ссылок из поиска и детальный обход вакансий без промежуточных файлов."""
+
+import asyncio
+from typing import Any
+
+from src.crawl_links.known_vacancies import KnownVacancies
+from src.crawl_links.link_crawler import confirm_cache_on_commit, detail_worker, get_country_name, store_parsed
+from src.crawl_links.parse_stage import ParseStage
+from src.crawl_links.response_cache import get_response_cache
+from src.database.db_manager import flush_vacancy_writer, initialize_database, set_collection_mark
+from src.parser.category_manager import collect_countries
+from src.utils.http_client import create_async_client
+from src.utils.main_logger import setup_logger
+from src.utils.rate_limiter import AsyncRateLimiter
+
+logger = setup_logger(__name__)
+
+
+async def run_pipeline_async(
+        countries: tuple[int, ...] = (113, 16),
+        incremental: bool = True,
+        workers: int = 8,
+        calls_per_minute: int = 80,
+        queue_size: int = 500,
+        use_cache: bool = True,
+        skip_known: bool = True,
+) -> dict[str, int]:
+    """Собирает ссылки и параллельно обходит найденные вакансии.
+
+    Страницы выдачи (производитель) отдают ID вакансий в ограниченную очередь,
+    из которой их сразу забирают воркеры детального обхода (потребители).
+    Если воркеры не успевают, очередь заполняется и сбор страниц ждёт
+    (backpressure). Повторяющиеся ID отбрасываются до постановки в очередь,
+    как и вакансии, которые уже есть в базе с тем же published_at.
+    Ответы разбираются в пуле процессов (см. ParseStage), чтобы нормализация
+    описаний не задерживала event loop; PARSE_IN_PROCESS=1 оставляет разбор
+    в текущем процессе.
+
+    Args:
+        countries (tuple[int, ...]): ID стран для сбора.
+        incremental (bool): Собирать только вакансии, опубликованные с прошлого сбора.
+        workers (int): Количество воркеров детального обхода.
+        calls_per_minute (int): Лимит запросов детального обхода в минуту.
+        queue_size (int): Размер очереди между сбором и обходом.
+        use_cache (bool): Использовать кэш условных запросов.
+        skip_known (bool): Не запрашивать детали вакансий, уже сохраненных без изменений.
+
+    Returns:
+        dict[str, int]: Статистика: queued (поставлено в очередь), duplicates (отброшено повторов),
+            known (пропущено известных вакансий).
+    """
+    initialize_database()
+    workers = max(1, workers)
+    queue: asyncio.Queue[tuple[str, str] | None] = asyncio.Queue(maxsize=queue_size)
+    limiter = AsyncRateLimiter(calls_per_minute=calls_per_minute)
+    cache = get_response_cache() if use_cache else None
+    confirm_cache_on_commit(cache)
+    known = KnownVacancies.load() if skip_known else KnownVacancies()
+    seen: set[str] = set()
+    stats = {'queued': 0, 'duplicates': 0, 'known': 0}
+
+    async def on_items(country: int, items: list[dict[str, Any]]) -> None:
+        country_name = get_country_name(country)
+        for item in items:
+            if item['id'] in seen:
+                stats['duplicates'] += 1
+                continue
+            seen.add(item['id'])
+            if known.is_current(item['id'], item.get('published_at')):
+                stats['known'] += 1
+                continue
+            await queue.put((item['url'], country_name))  # Ждёт, если очередь заполнена
+            stats['queued'] += 1
+
+    # Разбор ответов вынесен в пул процессов: воркеры только скачивают, а при выходе
+    # из блока стадия разбора дожидается всех пачек до сброса VacancyWriter
+    async with create_async_client(max_connections=workers, max_keepalive=workers) as client, \
+            ParseStage(store_parsed) as parse_stage:
+        consumers = [asyncio.create_task(detail_worker(client, queue, limiter, cache, parse_stage=parse_stage))
+                     for _ in range(workers)]
+        # Отметки инкрементального сбора сохраняются только после обхода всех вакансий из очереди:
+        # если процесс упадет раньше, следующий запуск повторит окно, а уже сохраненные
+        # вакансии отсеет KnownVacancies
+        deferred_marks: list[tuple[int, int, str]] = []
+        try:
+            await collect_countries({country: None for country in countries}, incremental, on_items,
+                                    deferred_marks=deferred_marks)
+        finally:
+            for _ in range(workers):
+                await queue.put(None)  # По одному маркеру завершения на воркер
+            await asyncio.gather(*consumers)
+
+    flush_vacancy_writer()
+    for country, category, collected_at in deferred_marks:
+        set_collection_mark(country, category, collected_at)
+
+    logger.info(
+        f"Конвейер завершён: в обход {stats['queued']}, повторов {stats['duplicates']}, "
+        f"без изменений в базе {stats['known']}"
+    )
+    return stats
+
+
+def run_pipeline(incremental: bool = True, workers: int = 8) -> dict[str, int]:
+    """Синхронная точка входа конвейера для России и Беларуси.
+
+    Args:
+        incremental (bool): Собирать только вакансии, опубликованные с прошлого сбора.
+        workers (int): Количество воркеров детального обхода.
+
+    Returns:
+        dict[str, int]: Статистика конвейера.
+    """
+    stats = asyncio.run(run_pipeline_async(incremental=incremental, workers=workers))
+
+    # Дописываем накопленный пакет, чтобы данные были видны сразу после обхода
+    flush_vacancy_writer()
+    return stats
+
+
+if __name__ == "__main__":
+    print(run_pipeline())
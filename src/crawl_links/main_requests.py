@@ -1,8 +1,14 @@
+import asyncio
 import httpx
 import random
 import time
 from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+from src.crawl_links.response_cache import ResponseCache
+from src.utils.http_client import get_client
+from src.utils.json_decoder import decode_vacancy
 from src.utils.main_logger import setup_logger
+from src.utils.rate_limiter import AsyncRateLimiter
 
 # Инициализация логгера для записи сообщений об ошибках, предупреждений и отладочной информации.
 logger = setup_logger(__name__)
@@ -64,12 +70,39 @@ class RateLimiter:
 # Глобальный экземпляр RateLimiter с безопасным лимитом запросов и 3 запросами без задержки
 rate_limiter = RateLimiter(calls_per_minute=80, initial_requests=3)
 
+
+def _vacancy_id_from_url(url: str) -> str:
+    """Возвращает ID вакансии из URL API (последняя часть пути)."""
+    return urlparse(url).path.rstrip('/').split('/')[-1]
+
+
+def _not_modified(
+        cache: Optional[ResponseCache],
+        vacancy_id: str,
+        response: httpx.Response,
+        url: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Сверяет ответ с кэшем условных запросов.
+
+    Returns:
+        Optional[Dict[str, Any]]: Маркер {"not_modified": True, ...}, если вакансия
+        не изменилась (304 или тот же хэш тела), иначе None.
+    """
+    if cache is None:
+        return None
+    if cache.is_unchanged(vacancy_id, response.status_code, response.content, response.headers):
+        logger.debug(f"Вакансия не изменилась ({response.status_code}): {url}")
+        return {"not_modified": True, "id": vacancy_id, "url": url}
+    return None
+
 def fetch_vacancy_data(
         url: str,
         max_retries: int = 3,
         base_delay: float = 1.0,
         max_delay: float = 30.0,
         timeout: float = 15.0,
+        cache: Optional[ResponseCache] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Выполняет синхронный запрос к API hh.ru с улучшенной обработкой ошибок и повторными попытками.
@@ -80,12 +113,15 @@ def fetch_vacancy_data(
         base_delay (float): Базовая задержка перед повторной попыткой. По умолчанию 1.0.
         max_delay (float): Максимальная задержка перед повторной попыткой. По умолчанию 30.0.
         timeout (float): Таймаут запроса. По умолчанию 15.0.
+        cache (Optional[ResponseCache]): Кэш условных запросов (ETag / Last-Modified).
 
     Returns:
-        Optional[Dict[str, Any]]: Данные вакансии или None в случае неудачи.
+        Optional[Dict[str, Any]]: Данные вакансии, маркер {"not_modified": True}
+            для неизменившейся вакансии или None в случае неудачи.
     """
     # Применяем ограничение частоты запросов перед каждым запросом
     rate_limiter.wait_if_needed()
+    vacancy_id = _vacancy_id_from_url(url)
 
     for attempt in range(max_retries):
         try:
@@ -94,31 +130,37 @@ def fetch_vacancy_data(
                 "Accept": "application/json",
                 "Accept-Encoding": "gzip, deflate"
             }
+            if cache is not None:
+                headers.update(cache.conditional_headers(vacancy_id))
+
+            # Общий клиент процесса: соединение и TLS-сессия переиспользуются между вызовами
+            response = get_client().get(url, headers=headers, timeout=timeout)
+
+            # Обработка специфичных статусов
+            if response.status_code in (404, 410) and cache is not None:
+                cache.forget(vacancy_id)
 
-            with httpx.Client(
-                    timeout=timeout,
-                    follow_redirects=True,
-                    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10)
-            ) as client:
-                response = client.get(url, headers=headers)
-
-                # Обработка специфичных статусов
-                if response.status_code == 404:
-                    logger.info(f"Вакансия не найдена (404): {url}")
-                    return {"closed": True, "url": url, "not_found": True}
-                elif response.status_code == 410:
-                    logger.info(f"Вакансия удалена (410): {url}")
-                    return {"closed": True, "url": url, "gone": True}
-                elif response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 60))
-                    logger.warning(f"Rate limit превышен, ждем {retry_after} сек: {url}")
-                    time.sleep(min(retry_after, max_delay))
-                    continue
-
-                response.raise_for_status()
-                data = response.json()
-                logger.debug(f"Успешно получены данные: {url}")
-                return data
+            if response.status_code == 304:
+                return _not_modified(cache, vacancy_id, response, url)
+            elif response.status_code == 404:
+                logger.info(f"Вакансия не найдена (404): {url}")
+                return {"closed": True, "url": url, "not_found": True}
+            elif response.status_code == 410:
+                logger.info(f"Вакансия удалена (410): {url}")
+                return {"closed": True, "url": url, "gone": True}
+            elif response.status_code == 429:
+                retry_after = int(response.headers.get("Retry-After", 60))
+                logger.warning(f"Rate limit превышен, ждем {retry_after} сек: {url}")
+                time.sleep(min(retry_after, max_delay))
+                continue
+
+            response.raise_for_status()
+            not_modified = _not_modified(cache, vacancy_id, response, url)
+            if not_modified:
+                return not_modified
+            data = decode_vacancy(response.content)
+            logger.debug(f"Успешно получены данные: {url}")
+            return data
 
         except httpx.HTTPStatusError as e:
             status_code = e.response.status_code if e.response else "unknown"
@@ -155,3 +197,108 @@ def fetch_vacancy_data(
 
     logger.error(f"Не удалось получить данные после {max_retries} попыток: {url}")
     return None
+
+
+async def fetch_vacancy_data_async(
+        client: httpx.AsyncClient,
+        url: str,
+        limiter: AsyncRateLimiter,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        cache: Optional[ResponseCache] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Асинхронный аналог fetch_vacancy_data для конкурентного обхода ссылок.
+
+    Использует общий httpx.AsyncClient (пул соединений) и общий AsyncRateLimiter.
+    Обработка статусов 404/410/429 совпадает с синхронной версией, но при 429
+    приостанавливается весь лимитер, а не только текущий запрос.
+
+    Args:
+        client (httpx.AsyncClient): Общий асинхронный HTTP-клиент.
+        url (str): URL для запроса.
+        limiter (AsyncRateLimiter): Общий ограничитель частоты запросов.
+        max_retries (int): Максимальное количество попыток. По умолчанию 3.
+        base_delay (float): Базовая задержка перед повторной попыткой. По умолчанию 1.0.
+        max_delay (float): Максимальная задержка перед повторной попыткой. По умолчанию 30.0.
+        cache (Optional[ResponseCache]): Кэш условных запросов (ETag / Last-Modified).
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные вакансии, маркер {"not_modified": True}
+            для неизменившейся вакансии или None в случае неудачи.
+    """
+    vacancy_id = _vacancy_id_from_url(url)
+    for attempt in range(max_retries):
+        await limiter.acquire()
+        try:
+            headers = {
+                "User-Agent": random.choice(USER_AGENTS),
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate"
+            }
+            if cache is not None:
+                headers.update(cache.conditional_headers(vacancy_id))
+            response = await client.get(url, headers=headers)
+
+            # Обработка специфичных статусов
+            if response.status_code in (404, 410) and cache is not None:
+                cache.forget(vacancy_id)
+
+            if response.status_code == 304:
+                return _not_modified(cache, vacancy_id, response, url)
+            elif response.status_code == 404:
+                logger.info(f"Вакансия не найдена (404): {url}")
+                return {"closed": True, "url": url, "not_found": True}
+            elif response.status_code == 410:
+                logger.info(f"Вакансия удалена (410): {url}")
+                return {"closed": True, "url": url, "gone": True}
+            elif response.status_code == 429:
+                retry_after = int(response.headers.get("Retry-After", 60))
+                logger.warning(f"Rate limit превышен, ждем {retry_after} сек: {url}")
+                limiter.pause(min(retry_after, max_delay))
+                continue
+
+            response.raise_for_status()
+            not_modified = _not_modified(cache, vacancy_id, response, url)
+            if not_modified:
+                return not_modified
+            data = decode_vacancy(response.content)
+            logger.debug(f"Успешно получены данные: {url}")
+            return data
+
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code if e.response else "unknown"
+            logger.warning(f"HTTP {status_code} для {url}. Попытка {attempt + 1}/{max_retries}")
+            if status_code in [429, 503]:  # Too Many Requests, Service Unavailable
+                delay = min(base_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
+            else:
+                delay = base_delay * (attempt + 1)
+            if attempt < max_retries - 1:
+                logger.info(f"Повтор через {delay:.1f} сек...")
+                await asyncio.sleep(delay)
+            continue
+
+        except (httpx.ConnectError, httpx.ReadError, httpx.ConnectTimeout) as e:
+            logger.warning(f"Сетевая ошибка ({type(e).__name__}): {url}. Попытка {attempt + 1}/{max_retries}")
+            delay = min(base_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
+            if attempt < max_retries - 1:
+                await asyncio.sleep(delay)
+            continue
+
+        except httpx.TimeoutException:
+            logger.warning(f"Таймаут для {url}. Попытка {attempt + 1}/{max_retries}")
+            delay = min(base_delay * (2 ** attempt), max_delay)
+            if attempt < max_retries - 1:
+                await asyncio.sleep(delay)
+            continue
+
+        except Exception as e:
+            logger.error(f"Неожиданная ошибка для {url}: {str(e)}")
+            if attempt == max_retries - 1:
+                return None
+            await asyncio.sleep(base_delay)
+            continue
+
+    logger.error(f"Не удалось получить данные после {max_retries} попыток: {url}")
+    return None
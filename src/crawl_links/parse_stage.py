@@ -0,0 +1,162 @@
+"""Стадия разбора ответов API: преобразование JSON вакансий в строки для записи, в том числе в пуле процессов."""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.database.db_manager import REFERENCE_FIELDS, VACANCY_COLUMNS, PreparedVacancy, prepare_vacancy
+from src.models.vacancy_data import VacancyData
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# PARSE_IN_PROCESS=1 — разбирать ответы в текущем процессе (для отладки и профилирования)
+PARSE_IN_PROCESS = os.getenv('PARSE_IN_PROCESS', '0').lower() in ('1', 'true', 'yes')
+# Количество процессов разбора (по умолчанию — по числу ядер)
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', '0')) or None
+# Сколько ответов отправлять в процесс разбора одним заданием
+PARSE_BATCH_SIZE = 32
+
+# Колонки vacancies.csv (порядок сохранен с прежних версий файла)
+CSV_FIELDS = (
+    'id', 'country', 'site', 'title', 'salary_from', 'salary_to', 'currency', 'mode_name',
+    'frequency_name', 'city', 'address', 'experience', 'schedule', 'employment', 'description',
+    'skills', 'professional_roles_name', 'company_id', 'company_name', 'company_url',
+    'company_vacancies_url', 'company_accredited_it_employer', 'published_at', 'created_at',
+    'employment_form', 'work_format', 'work_schedule_by_days', 'vacancy_close_date',
+)
+_CSV_INDEXES = {field: VACANCY_COLUMNS.index(field) for field in CSV_FIELDS if field in VACANCY_COLUMNS}
+
+
+def parse_batch(payloads: list[tuple[dict[str, Any], str]]) -> list[PreparedVacancy]:
+    """
+    Разбирает пачку ответов API в строки для записи.
+
+    Выполняется в процессе пула: нормализация описания, навыки, зарплата,
+    адрес, роли и сжатие описания не занимают поток с event loop.
+    Ответ, который не удалось разобрать, пропускается с записью в лог.
+
+    Args:
+        payloads (list[tuple[dict, str]]): Пары (ответ API по вакансии, название страны).
+
+    Returns:
+        list[PreparedVacancy]: Подготовленные к записи вакансии.
+    """
+    prepared = []
+    for data, country in payloads:
+        try:
+            prepared.append(prepare_vacancy(VacancyData.from_api(data, country)))
+        except Exception as err:
+            logger.error(f"Ошибка разбора вакансии {data.get('id')}: {err}")
+    return prepared
+
+
+def csv_record(prepared: PreparedVacancy) -> dict[str, Any]:
+    """Восстанавливает запись для vacancies.csv из подготовленной вакансии"""
+    record = {field: prepared.row[index] for field, index in _CSV_INDEXES.items()}
+    record['description'] = prepared.description
+    record['skills'] = list(prepared.skills)
+    # Данные работодателя в строке вакансии не хранятся: берем их из строки company_to_row
+    company = prepared.company or (record['company_id'], None, None, None, False)
+    record.update(zip(REFERENCE_FIELDS[1:], company[1:]))
+    return record
+
+
+class ParseStage:
+    """
+    Пакетный разбор ответов API в пуле процессов.
+
+    Воркеры обхода передают сырые ответы в submit(); ответы копятся пачками
+    по batch_size и разбираются в ProcessPoolExecutor, а готовые пачки
+    передаются в on_parsed в отдельном потоке записи: запись в CSV и SQLite
+    не блокирует event loop, а пачки сохраняются по одной в порядке готовности.
+    Одновременно в работе не больше max_pending пачек: если разбор или запись
+    не успевают за сетью, submit() ждет. При in_process=True разбор выполняется
+    в текущем процессе.
+
+    Attributes:
+        parsed (int): Количество разобранных вакансий.
+    """
+
+    def __init__(
+            self,
+            on_parsed: Callable[[list[PreparedVacancy]], None],
+            batch_size: int = PARSE_BATCH_SIZE,
+            workers: int | None = PARSE_WORKERS,
+            in_process: bool = PARSE_IN_PROCESS,
+    ):
+        self.on_parsed = on_parsed
+        self.batch_size = max(1, batch_size)
+        self.workers = workers or os.cpu_count() or 1
+        self.in_process = in_process
+        self.max_pending = self.workers * 2
+        self.parsed = 0
+        self._batch: list[tuple[dict[str, Any], str]] = []
+        self._in_flight: set[asyncio.Task] = set()
+        self._executor: ProcessPoolExecutor | None = None
+        self._store_executor: ThreadPoolExecutor | None = None
+
+    async def __aenter__(self):
+        self._store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='parse-store')
+        if not self.in_process:
+            # spawn вместо fork: дочерний процесс не наследует потоки, блокировки
+            # и открытые соединения SQLite родителя
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            await self.drain()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            if self._store_executor is not None:
+                self._store_executor.shutdown(wait=True)
+                self._store_executor = None
+
+    async def submit(self, data: dict[str, Any], country: str) -> None:
+        """Добавляет ответ API в текущую пачку и отправляет заполненную пачку в разбор"""
+        self._batch.append((data, country))
+        if len(self._batch) >= self.batch_size:
+            await self._dispatch()
+
+    async def drain(self) -> None:
+        """Разбирает неполную пачку и дожидается всех пачек в пуле"""
+        await self._dispatch()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight)
+
+    async def _dispatch(self) -> None:
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        if self._executor is None:
+            await self._store_in_thread(parse_batch(batch))
+            return
+        while len(self._in_flight) >= self.max_pending:
+            await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+        task = asyncio.create_task(self._parse_in_pool(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _parse_in_pool(self, batch: list[tuple[dict[str, Any], str]]) -> None:
+        try:
+            prepared = await asyncio.get_running_loop().run_in_executor(self._executor, parse_batch, batch)
+        except Exception as err:
+            logger.error(f"Ошибка разбора пачки из {len(batch)} вакансий в пуле процессов: {err}")
+            return
+        await self._store_in_thread(prepared)
+
+    async def _store_in_thread(self, prepared: list[PreparedVacancy]) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._store_executor, self._store, prepared)
+
+    def _store(self, prepared: list[PreparedVacancy]) -> None:
+        self.parsed += len(prepared)
+        try:
+            self.on_parsed(prepared)
+        except Exception as err:
+            logger.error(f"Ошибка записи {len(prepared)} разобранных вакансий: {err}")
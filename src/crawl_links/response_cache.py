@@ -0,0 +1,190 @@
+"""Кэш условных запросов для JSON вакансий: ETag, Last-Modified и хэш тела ответа."""
+
+import atexit
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CACHE_PATH = 'response_cache.db'
+
+
+class ResponseCache:
+    """
+    Дисковый кэш метаданных ответов API по ID вакансии.
+
+    Тело ответа не хранится: данные вакансии уже лежат в vacancies.db.
+    Кэш нужен, чтобы отправить If-None-Match / If-Modified-Since и понять,
+    изменилась ли вакансия (ответ 304 или тот же хэш тела), не разбирая JSON.
+
+    Метаданные нового или изменившегося ответа сохраняются только после того,
+    как вакансия записана в базу (см. confirm): если разбор или запись не
+    удались, следующий обход снова получит и обработает вакансию целиком.
+
+    Attributes:
+        max_entries (int): Максимальное количество записей, лишние вытесняются по давности обращения.
+        hits (int): Количество ответов, признанных неизменными (304 или тот же хэш).
+        misses (int): Количество новых или изменившихся ответов.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = 200_000, commit_every: int = 100):
+        self.max_entries = max_entries
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self._pending = 0
+        # Ответы, полученные, но еще не записанные в vacancies.db: ID -> (etag, last_modified, body_hash)
+        self._unconfirmed: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL;')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                vacancy_id TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                accessed_at REAL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);')
+        self._conn.commit()
+
+    def conditional_headers(self, vacancy_id: str) -> Dict[str, str]:
+        """Возвращает заголовки условного запроса для вакансии (пустой словарь, если её нет в кэше)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified FROM responses WHERE vacancy_id = ?', (vacancy_id,)
+            ).fetchone()
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def is_unchanged(self, vacancy_id: str, status_code: int, body: bytes, headers: Any) -> bool:
+        """
+        Сверяет ответ с кэшем.
+
+        Метаданные нового или изменившегося ответа запоминаются до подтверждения
+        записи вакансии в базу (confirm) и до этого в кэш не попадают.
+
+        Args:
+            vacancy_id (str): ID вакансии.
+            status_code (int): HTTP-статус ответа (200 или 304).
+            body (bytes): Тело ответа.
+            headers: Заголовки ответа (поддерживают .get()).
+
+        Returns:
+            bool: True, если вакансия не изменилась с прошлого запроса.
+        """
+        now = time.time()
+        with self._lock:
+            if status_code == 304:
+                self.hits += 1
+                self._execute('UPDATE responses SET accessed_at = ? WHERE vacancy_id = ?', (now, vacancy_id))
+                return True
+
+            body_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+            row = self._conn.execute(
+                'SELECT body_hash FROM responses WHERE vacancy_id = ?', (vacancy_id,)
+            ).fetchone()
+            if row is not None and row[0] == body_hash:
+                self.hits += 1
+                self._execute('UPDATE responses SET accessed_at = ? WHERE vacancy_id = ?', (now, vacancy_id))
+                return True
+
+            self.misses += 1
+            self._unconfirmed[vacancy_id] = (headers.get('ETag'), headers.get('Last-Modified'), body_hash)
+            return False
+
+    def confirm(self, vacancy_ids) -> None:
+        """
+        Сохраняет метаданные ответов вакансий, которые записаны в базу.
+
+        Args:
+            vacancy_ids (Iterable[str]): ID вакансий из зафиксированного пакета VacancyWriter.
+        """
+        now = time.time()
+        with self._lock:
+            for vacancy_id in vacancy_ids:
+                entry = self._unconfirmed.pop(vacancy_id, None)
+                if entry is None:
+                    continue
+                self._execute(
+                    'INSERT OR REPLACE INTO responses (vacancy_id, etag, last_modified, body_hash, accessed_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (vacancy_id, *entry, now),
+                )
+
+    def forget(self, vacancy_id: str) -> None:
+        """Удаляет вакансию из кэша (например, если она закрыта)"""
+        with self._lock:
+            self._unconfirmed.pop(vacancy_id, None)
+            self._execute('DELETE FROM responses WHERE vacancy_id = ?', (vacancy_id,))
+
+    def _execute(self, sql: str, params: tuple) -> None:
+        """Выполняет запись и периодически фиксирует транзакцию с вытеснением старых записей"""
+        self._conn.execute(sql, params)
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        self._evict_locked()
+        self._conn.commit()
+        self._pending = 0
+
+    def _evict_locked(self) -> None:
+        """Удаляет самые давно использованные записи сверх max_entries"""
+        count = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                'DELETE FROM responses WHERE vacancy_id IN '
+                '(SELECT vacancy_id FROM responses ORDER BY accessed_at LIMIT ?)',
+                (excess,),
+            )
+            logger.info(f"Из кэша ответов вытеснено записей: {excess}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Возвращает счетчики попаданий и промахов"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        """Фиксирует несохраненные изменения и закрывает соединение"""
+        with self._lock:
+            self._commit_locked()
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Возвращает общий для процесса ResponseCache (создается при первом обращении)"""
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
+
+
+@atexit.register
+def close_response_cache() -> None:
+    """Закрывает общий кэш при завершении процесса"""
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
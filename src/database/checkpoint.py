@@ -0,0 +1,137 @@
+"""Журнал контрольных точек для возобновления длинных обходов после падения или перезапуска."""
+
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+from src.database.db_manager import DB_PATH, flush_vacancy_writer
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class CrawlCheckpoint:
+    """
+    Журнал выполненных шагов одного запуска (ID вакансий, страниц, категорий).
+
+    Записи хранятся в таблице crawl_checkpoints базы vacancies.db и фиксируются
+    пакетами. Перед каждой фиксацией сбрасывается буфер VacancyWriter, поэтому
+    вакансия, отмеченная в журнале, гарантированно уже записана в базу.
+    После успешного завершения запуска журнал очищается методом complete().
+
+    Attributes:
+        run_key (str): Ключ запуска, например 'crawl:113_vacancies_links.txt'.
+        commit_every (int): Количество отметок, после которого журнал фиксируется.
+        commit_interval (float): Максимальное время между фиксациями, сек.
+    """
+
+    def __init__(self, run_key: str, db_path: str = DB_PATH, commit_every: int = 200, commit_interval: float = 10.0):
+        self.run_key = run_key
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._done: dict[str, set[str]] = defaultdict(set)
+        self._pending: list[tuple[str, str, str]] = []
+        self._last_commit = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+                run_key TEXT,
+                kind TEXT,
+                item TEXT,
+                PRIMARY KEY (run_key, kind, item)
+            )
+        ''')
+        self._conn.commit()
+        for kind, item in self._conn.execute(
+                'SELECT kind, item FROM crawl_checkpoints WHERE run_key = ?', (run_key,)):
+            self._done[kind].add(item)
+        if self.resumed:
+            logger.warning(
+                f"Возобновление запуска {run_key}: "
+                + ", ".join(f"{kind}={len(items)}" for kind, items in self._done.items())
+            )
+
+    @property
+    def resumed(self) -> bool:
+        """True, если журнал содержит шаги незавершенного предыдущего запуска"""
+        return any(self._done.values())
+
+    def is_done(self, kind: str, item: str) -> bool:
+        """Проверяет, выполнен ли шаг в этом или прерванном предыдущем запуске"""
+        return str(item) in self._done[kind]
+
+    def mark_done(self, kind: str, item: str) -> None:
+        """Отмечает шаг выполненным (фиксируется пакетом)"""
+        item = str(item)
+        with self._lock:
+            if item in self._done[kind]:
+                return
+            self._done[kind].add(item)
+            self._pending.append((self.run_key, kind, item))
+            if (len(self._pending) >= self.commit_every
+                    or time.monotonic() - self._last_commit >= self.commit_interval):
+                self._commit_locked()
+
+    def remember(self, name: str, value: str) -> str:
+        """
+        Сохраняет значение запуска (например, границу окна дат) для возобновления.
+
+        Если значение с этим именем уже сохранено прерванным запуском, возвращается
+        оно, а не новое: шаги, отмеченные в журнале, остаются сопоставимыми.
+        Запись фиксируется сразу, до отметок шагов, которые от нее зависят.
+
+        Args:
+            name (str): Имя значения.
+            value (str): Значение для нового запуска.
+
+        Returns:
+            str: Сохраненное значение.
+        """
+        prefix = f'{name}='
+        with self._lock:
+            for item in self._done['value']:
+                if item.startswith(prefix):
+                    return item[len(prefix):]
+            item = prefix + str(value)
+            self._done['value'].add(item)
+            with self._conn:
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO crawl_checkpoints (run_key, kind, item) VALUES (?, ?, ?)',
+                    (self.run_key, 'value', item),
+                )
+        return str(value)
+
+    def commit(self) -> None:
+        """Фиксирует накопленные отметки"""
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self) -> None:
+        self._last_commit = time.monotonic()
+        if not self._pending:
+            return
+        # Сначала данные, потом отметка о них в журнале
+        flush_vacancy_writer()
+        rows, self._pending = self._pending, []
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO crawl_checkpoints (run_key, kind, item) VALUES (?, ?, ?)', rows
+            )
+
+    def complete(self) -> None:
+        """Завершает запуск: журнал очищается, следующий запуск начнется с начала"""
+        with self._lock:
+            self._pending = []
+            self._done.clear()
+            with self._conn:
+                self._conn.execute('DELETE FROM crawl_checkpoints WHERE run_key = ?', (self.run_key,))
+        logger.info(f"Запуск {self.run_key} завершен, журнал очищен")
+
+    def close(self) -> None:
+        """Фиксирует отметки и закрывает соединение (журнал сохраняется для возобновления)"""
+        try:
+            self.commit()
+        finally:
+            self._conn.close()
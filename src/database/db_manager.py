@@ -1,18 +1,37 @@
+import atexit
+import hashlib
+import json
 import sqlite3
+import threading
+import time
+import zlib
 from datetime import datetime
+from typing import Callable, NamedTuple
+from src.models.vacancy_data import FIELD_NAMES, VacancyData
 from src.utils.main_logger import setup_logger
 
 # Инициализация логера для текущего модуля
 logger = setup_logger(__name__)
 
+DB_PATH = 'vacancies.db'
+# Уровень сжатия описаний вакансий (zlib: 1 — быстрее, 9 — компактнее)
+DESCRIPTION_COMPRESSION_LEVEL = 6
+
 
 def get_db_connection():
     """Создает и возвращает подключение к базе данных"""
-    return sqlite3.connect('vacancies.db')
+    return sqlite3.connect(DB_PATH)
 
 
 # ---------- 1. Схема ----------
 def initialize_database():
+    """
+    Создает таблицы и применяет миграции схемы.
+
+    Вызывается явно в точках входа (сбор, обход, проверка вакансий), а не при
+    импорте модуля: модуль импортируют и процессы стадии разбора, которым база
+    не нужна. Повторный вызов безопасен.
+    """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
@@ -28,10 +47,10 @@ def initialize_database():
                 schedule TEXT,
                 employment TEXT,
                 description TEXT,
-                skills TEXT,
+                skills TEXT,  -- Не заполняется: навыки хранятся в vacancy_skills (миграция 5)
                 professional_roles_name TEXT,
                 company_id TEXT,
-                company_name TEXT,
+                company_name TEXT,  -- company_*: не заполняются, данные работодателя в companies
                 company_url TEXT,
                 company_vacancies_url TEXT,
                 company_accredited_it_employer TEXT,  -- Исправлено: убрана лишняя 'l'
@@ -48,7 +67,17 @@ def initialize_database():
                 frequency_name TEXT
             )
         ''')
+        # Отметки последнего успешного сбора ссылок по (страна, категория)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS collection_marks (
+                area INTEGER,
+                professional_role INTEGER,
+                collected_at TEXT,
+                PRIMARY KEY (area, professional_role)
+            )
+        ''')
         conn.commit()
+        migrate_database(conn)
         logger.info("База данных инициализирована успешно")
     except Exception as err:
         logger.error(f"Ошибка при инициализации базы данных: {err}")
@@ -57,82 +86,489 @@ def initialize_database():
         conn.close()
 
 
+def _migration_open_vacancies_indexes(conn):
+    """Строка "False" в дате закрытия заменяется на NULL, добавляются индексы для проверок и отчетов"""
+    conn.execute('UPDATE vacancies SET vacancy_close_date = NULL WHERE vacancy_close_date IN ("False", "");')
+    # Частичный покрывающий индекс: открытые вакансии и дата публикации без чтения таблицы
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_vacancies_open
+        ON vacancies(published_at, id) WHERE vacancy_close_date IS NULL
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_vacancies_created_at ON vacancies(created_at);')
+
+
+def _migration_normalized_tables(conn):
+    """Справочники навыков, компаний и ролей со связями вакансия–навык и заполнение их из существующих строк"""
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS companies (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            url TEXT,
+            vacancies_url TEXT,
+            accredited_it_employer INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS roles (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS vacancy_skills (
+            vacancy_id TEXT NOT NULL,
+            skill_id INTEGER NOT NULL REFERENCES skills(id),
+            PRIMARY KEY (vacancy_id, skill_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_vacancy_skills_skill ON vacancy_skills(skill_id, vacancy_id);
+    ''')
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(vacancies);')}
+    if 'role_id' not in columns:
+        conn.execute('ALTER TABLE vacancies ADD COLUMN role_id INTEGER REFERENCES roles(id);')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_vacancies_role_published ON vacancies(role_id, published_at);')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_vacancies_company ON vacancies(company_id);')
+
+    # Заполнение справочников из уже сохраненных вакансий
+    conn.execute('''
+        INSERT OR IGNORE INTO companies (id, name, url, vacancies_url, accredited_it_employer)
+        SELECT company_id, company_name, company_url, company_vacancies_url, company_accredited_it_employer
+        FROM vacancies WHERE company_id IS NOT NULL
+        ORDER BY created_at DESC
+    ''')
+    conn.execute('''
+        INSERT OR IGNORE INTO roles (name)
+        SELECT DISTINCT professional_roles_name FROM vacancies WHERE professional_roles_name IS NOT NULL
+    ''')
+    conn.execute('''
+        UPDATE vacancies SET role_id = (SELECT id FROM roles WHERE roles.name = vacancies.professional_roles_name)
+        WHERE professional_roles_name IS NOT NULL
+    ''')
+    skills = [
+        (vacancy_id, skill)
+        for vacancy_id, skills_str in conn.execute("SELECT id, skills FROM vacancies WHERE skills != '';")
+        for skill in split_skills(skills_str)
+    ]
+    conn.executemany('INSERT OR IGNORE INTO skills (name) VALUES (?);', {(skill,) for _, skill in skills})
+    conn.executemany(INSERT_VACANCY_SKILL_SQL, skills)
+
+
+def _migration_description_store(conn):
+    """Описания вакансий переносятся в сжатую таблицу descriptions с дедупликацией по хэшу"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS descriptions (
+            hash TEXT PRIMARY KEY,
+            body BLOB NOT NULL
+        )
+    ''')
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(vacancies);')}
+    if 'description_hash' not in columns:
+        conn.execute('ALTER TABLE vacancies ADD COLUMN description_hash TEXT;')
+
+    # Переносим описания пачками: обработанные строки получают description = NULL
+    # и в следующую выборку не попадают
+    while True:
+        rows = conn.execute(
+            "SELECT id, description FROM vacancies WHERE description IS NOT NULL AND description != '' LIMIT 1000;"
+        ).fetchall()
+        if not rows:
+            break
+        hashes = {vacancy_id: description_hash(text) for vacancy_id, text in rows}
+        conn.executemany(
+            'INSERT OR IGNORE INTO descriptions (hash, body) VALUES (?, ?);',
+            {hashes[vacancy_id]: compress_description(text) for vacancy_id, text in rows}.items(),
+        )
+        conn.executemany(
+            'UPDATE vacancies SET description = NULL, description_hash = ? WHERE id = ?;',
+            [(digest, vacancy_id) for vacancy_id, digest in hashes.items()],
+        )
+    conn.execute("UPDATE vacancies SET description = NULL WHERE description = '';")
+
+
+def _migration_vacancy_versions(conn):
+    """Хэш содержимого и время изменения вакансий, история изменений в vacancy_versions"""
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(vacancies);')}
+    if 'content_hash' not in columns:
+        conn.execute('ALTER TABLE vacancies ADD COLUMN content_hash TEXT;')
+    if 'updated_at' not in columns:
+        conn.execute('ALTER TABLE vacancies ADD COLUMN updated_at TEXT;')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS vacancy_versions (
+            vacancy_id TEXT NOT NULL,
+            changed_at TEXT NOT NULL,
+            diff TEXT NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_vacancy_versions_vacancy ON vacancy_versions(vacancy_id, changed_at);')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_vacancies_updated_at ON vacancies(updated_at);')
+
+    # Списки колонок и значения по умолчанию зафиксированы на момент миграции:
+    # TRACKED_COLUMNS и TRACKED_DEFAULTS меняются вместе со схемой, а миграция
+    # должна давать одинаковый результат на любой версии кода
+    tracked_columns = (
+        'country', 'site', 'title', 'city', 'address', 'experience', 'schedule', 'employment', 'skills',
+        'professional_roles_name', 'company_id', 'company_name', 'company_url', 'company_vacancies_url',
+        'company_accredited_it_employer', 'published_at', 'created_at', 'employment_form', 'work_format',
+        'work_schedule_by_days', 'salary_from', 'salary_to', 'currency', 'mode_name', 'frequency_name',
+        'description_hash',
+    )
+    tracked_defaults = {'site': 'hh_ru', 'skills': '', 'company_accredited_it_employer': False}
+
+    # NULL в строках прежних версий заменяем значениями по умолчанию VacancyData
+    for column, default in tracked_defaults.items():
+        conn.execute(f'UPDATE vacancies SET {column} = ? WHERE {column} IS NULL;', (default,))
+
+    # Хэши уже сохраненных строк, чтобы повторный обход не считал их изменившимися
+    migrated_at = datetime.now().isoformat(timespec='seconds')
+    rows = conn.execute(f"SELECT id, {', '.join(tracked_columns)} FROM vacancies;").fetchall()
+    conn.executemany(
+        'UPDATE vacancies SET content_hash = ?, updated_at = COALESCE(updated_at, ?) WHERE id = ?;',
+        [(content_hash(row[1:]), migrated_at, row[0]) for row in rows],
+    )
+
+
+def _migration_drop_denormalized_columns(conn):
+    """Навыки и данные работодателя больше не дублируются в строках вакансий, хэши пересчитываются"""
+    # Навыки и работодатели уже лежат в vacancy_skills и companies (миграция 2 и запись вакансий)
+    conn.execute('''
+        UPDATE vacancies SET skills = NULL, company_name = NULL, company_url = NULL,
+            company_vacancies_url = NULL, company_accredited_it_employer = NULL
+    ''')
+
+    # Хэш по колонкам, зафиксированным на момент миграции, и навыкам из vacancy_skills
+    tracked_columns = (
+        'country', 'site', 'title', 'city', 'address', 'experience', 'schedule', 'employment',
+        'professional_roles_name', 'company_id', 'published_at', 'created_at', 'employment_form', 'work_format',
+        'work_schedule_by_days', 'salary_from', 'salary_to', 'currency', 'mode_name', 'frequency_name',
+        'description_hash',
+    )
+    skills: dict[str, list[str]] = {}
+    for vacancy_id, name in conn.execute(
+            'SELECT vs.vacancy_id, s.name FROM vacancy_skills vs JOIN skills s ON s.id = vs.skill_id;'):
+        skills.setdefault(vacancy_id, []).append(name)
+    rows = conn.execute(f"SELECT id, {', '.join(tracked_columns)} FROM vacancies;").fetchall()
+    conn.executemany(
+        'UPDATE vacancies SET content_hash = ? WHERE id = ?;',
+        [(content_hash([*row[1:], skills_value(skills.get(row[0], []))]), row[0]) for row in rows],
+    )
+
+
+# Миграции схемы по порядку: (версия, функция). Номер последней примененной
+# хранится в PRAGMA user_version, новые миграции добавляются в конец списка
+MIGRATIONS = [
+    (1, _migration_open_vacancies_indexes),
+    (2, _migration_normalized_tables),
+    (3, _migration_description_store),
+    (4, _migration_vacancy_versions),
+    (5, _migration_drop_denormalized_columns),
+]
+
+
+def migrate_database(conn):
+    """
+    Применяет к базе миграции, которые еще не были применены.
+
+    Каждая миграция выполняется в своей транзакции вместе с обновлением
+    user_version, поэтому прерванная миграция при следующем запуске
+    повторяется целиком.
+
+    Args:
+        conn (sqlite3.Connection): Подключение к базе данных.
+    """
+    version = conn.execute('PRAGMA user_version;').fetchone()[0]
+    for target, migration in MIGRATIONS:
+        if target <= version:
+            continue
+        with conn:
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {target};')
+        logger.info(f"Применена миграция базы данных {target}: {migration.__doc__}")
+
+
 # ---------- 2. Вставка ----------
-def insert_vacancy(vacancy_data: dict):
-    """Вставляет или заменяет запись о вакансии в базе данных"""
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
+# Поля VacancyData, которые хранятся в справочниках: навыки — в vacancy_skills,
+# данные работодателя — в companies (в строке вакансии остается company_id)
+REFERENCE_FIELDS = ('skills', 'company_name', 'company_url', 'company_vacancies_url', 'company_accredited_it_employer')
+# Колонки vacancies в порядке значений vacancy_to_row: хранимые поля VacancyData и хэш описания
+VACANCY_COLUMNS = (*(name for name in FIELD_NAMES if name not in REFERENCE_FIELDS), 'description_hash')
+_FIELD_INDEXES = tuple(FIELD_NAMES.index(column) for column in VACANCY_COLUMNS[:-1])
+_DESCRIPTION_INDEX = VACANCY_COLUMNS.index('description')
+# Колонки, изменения которых попадают в хэш содержимого и историю. Дату закрытия
+# ведет проверка вакансий, текст описания хранится в descriptions (в истории — его хэш).
+# Навыки входят в хэш и историю отдельным значением (см. write_vacancies)
+TRACKED_COLUMNS = tuple(column for column in VACANCY_COLUMNS
+                        if column not in ('id', 'description', 'vacancy_close_date'))
+_TRACKED_INDEXES = tuple(VACANCY_COLUMNS.index(column) for column in TRACKED_COLUMNS)
+# Непустые значения по умолчанию отслеживаемых колонок: в строках прежних версий
+# на их месте бывает NULL, и замена NULL на такое значение изменением не считается
+_DEFAULT_ROW = VacancyData(id='').to_row()
+TRACKED_DEFAULTS = {
+    column: _DEFAULT_ROW[FIELD_NAMES.index(column)]
+    for column in TRACKED_COLUMNS
+    if column in FIELD_NAMES and _DEFAULT_ROW[FIELD_NAMES.index(column)] is not None
+}
+
+# Новая вакансия вставляется, изменившаяся обновляется на месте (без DELETE + INSERT,
+# как при REPLACE); дата закрытия при обновлении не затирается
+INSERT_VACANCY_SQL = f'''
+    INSERT INTO vacancies ({', '.join(VACANCY_COLUMNS)}, content_hash, updated_at, role_id)
+    VALUES ({', '.join('?' * len(VACANCY_COLUMNS))}, ?, ?, (SELECT id FROM roles WHERE name = ?))
+    ON CONFLICT(id) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in TRACKED_COLUMNS)},
+        description = NULL,
+        content_hash = excluded.content_hash,
+        updated_at = excluded.updated_at,
+        role_id = excluded.role_id
+'''
+
+
+UPSERT_COMPANY_SQL = '''
+    INSERT INTO companies (id, name, url, vacancies_url, accredited_it_employer)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        name = excluded.name,
+        url = excluded.url,
+        vacancies_url = excluded.vacancies_url,
+        accredited_it_employer = excluded.accredited_it_employer
+    WHERE (name, url, vacancies_url, accredited_it_employer)
+        IS NOT (excluded.name, excluded.url, excluded.vacancies_url, excluded.accredited_it_employer)
+'''
+
+INSERT_ROLE_SQL = 'INSERT OR IGNORE INTO roles (name) VALUES (?);'
+INSERT_SKILL_SQL = 'INSERT OR IGNORE INTO skills (name) VALUES (?);'
+INSERT_VACANCY_SKILL_SQL = '''
+    INSERT OR IGNORE INTO vacancy_skills (vacancy_id, skill_id)
+    SELECT ?, id FROM skills WHERE name = ?
+'''
+
+
+INSERT_DESCRIPTION_SQL = 'INSERT OR IGNORE INTO descriptions (hash, body) VALUES (?, ?);'
+
+
+def description_hash(text: str | None) -> str | None:
+    """Возвращает хэш текста описания (None для пустого описания)"""
+    if not text:
+        return None
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
 
-        skills_str = ', '.join(vacancy_data.get('skills', []))
-
-        # 29 значений для 29 полей таблицы
-        values = (
-            vacancy_data.get('id'),
-            vacancy_data.get('country'),
-            vacancy_data.get('site'),
-            vacancy_data.get('title'),
-            vacancy_data.get('city'),
-            vacancy_data.get('address'),
-            vacancy_data.get('experience'),
-            vacancy_data.get('schedule'),
-            vacancy_data.get('employment'),
-            vacancy_data.get('description'),
-            skills_str,
-            vacancy_data.get('professional_roles_name'),
-            vacancy_data.get('company_id'),
-            vacancy_data.get('company_name'),
-            vacancy_data.get('company_url'),
-            vacancy_data.get('company_vacancies_url'),
-            vacancy_data.get('company_accredited_it_employer'),  # Исправлено
-            vacancy_data.get('published_at'),
-            vacancy_data.get('created_at'),
-            vacancy_data.get('employment_form'),
-            vacancy_data.get('work_format'),
-            vacancy_data.get('work_schedule_by_days'), # Добавлено значение по умолчанию
-            vacancy_data.get('vacancy_close_date'),
-            vacancy_data.get('salary_from'),
-            vacancy_data.get('salary_to'),
-            vacancy_data.get('currency'),
-            vacancy_data.get('mode_name'),
-            vacancy_data.get('frequency_name')
+def compress_description(text: str) -> bytes:
+    """Сжимает текст описания для таблицы descriptions"""
+    return zlib.compress(text.encode('utf-8'), DESCRIPTION_COMPRESSION_LEVEL)
+
+
+def decompress_description(body: bytes) -> str:
+    """Распаковывает описание из таблицы descriptions"""
+    return zlib.decompress(body).decode('utf-8')
+
+
+def _comparable(value):
+    """Приводит значение к виду, в котором оно читается из базы (bool и числа — строкой)"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        value = int(value)
+    return str(value)
+
+
+def _is_change(column: str, old_value, new_value) -> bool:
+    """Проверяет, изменилось ли значение колонки (NULL прежних версий равен значению по умолчанию)"""
+    if old_value is None and column in TRACKED_DEFAULTS:
+        old_value = TRACKED_DEFAULTS[column]
+    return _comparable(old_value) != _comparable(new_value)
+
+
+def content_hash(values) -> str:
+    """Хэш отслеживаемых значений вакансии (в порядке TRACKED_COLUMNS, последним — skills_value)"""
+    payload = json.dumps([_comparable(value) for value in values], ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def skills_value(names) -> str:
+    """Навыки вакансии одной строкой для хэша и истории изменений: по алфавиту через ', '"""
+    return ', '.join(sorted(names))
+
+
+def split_skills(skills_str: str | None) -> list[str]:
+    """Разбивает строку навыков из колонки vacancies.skills на список"""
+    if not skills_str:
+        return []
+    return [skill.strip() for skill in skills_str.split(', ') if skill.strip()]
+
+
+def _as_vacancy(vacancy: VacancyData | dict) -> VacancyData:
+    """Приводит словарь вакансии (прежний формат) к VacancyData"""
+    return vacancy if isinstance(vacancy, VacancyData) else VacancyData.from_dict(vacancy)
+
+
+def company_to_row(vacancy: VacancyData | dict) -> tuple | None:
+    """Преобразует данные работодателя вакансии в кортеж для UPSERT_COMPANY_SQL (None, если работодателя нет)"""
+    vacancy = _as_vacancy(vacancy)
+    if not vacancy.company_id:
+        return None
+    return (
+        vacancy.company_id,
+        vacancy.company_name,
+        vacancy.company_url,
+        vacancy.company_vacancies_url,
+        vacancy.company_accredited_it_employer,
+    )
+
+
+def write_vacancies(
+        conn,
+        rows: list[tuple],
+        companies: list[tuple],
+        skills: dict[str, list[str]],
+        descriptions: dict[str, bytes] | None = None,
+) -> int:
+    """
+    Записывает пачку вакансий вместе со справочниками в текущей транзакции.
+
+    Для каждой вакансии считается хэш отслеживаемых полей и навыков. Вакансии
+    с тем же хэшем, что в базе, не перезаписываются вовсе (ни строка, ни
+    индексы, ни навыки). Для изменившихся вакансий в vacancy_versions
+    добавляется diff вида {"поле": [было, стало]}; навыки сравниваются
+    с vacancy_skills (см. skills_value). Данные работодателя в diff не входят:
+    они обновляются в companies.
+
+    Args:
+        conn (sqlite3.Connection): Подключение к базе данных.
+        rows (list[tuple]): Строки vacancy_to_row.
+        companies (list[tuple]): Строки company_to_row.
+        skills (dict[str, list[str]]): Навыки по ID вакансии (без ключа — вакансия без навыков).
+        descriptions (dict[str, bytes] | None): Сжатые описания по хэшу; уже
+            сохраненные описания не перезаписываются.
+
+    Returns:
+        int: Количество новых и изменившихся вакансий.
+    """
+    latest = {row[0]: row for row in rows}  # Повтор вакансии в пачке: берем последнюю версию
+    new_skills = {vacancy_id: skills_value(skills.get(vacancy_id, [])) for vacancy_id in latest}
+    hashes = {
+        vacancy_id: content_hash([*(row[i] for i in _TRACKED_INDEXES), new_skills[vacancy_id]])
+        for vacancy_id, row in latest.items()
+    }
+
+    ids = list(latest)
+    stored = {
+        stored_row[0]: stored_row[1:]
+        for stored_row in conn.execute(
+            f"SELECT id, content_hash, {', '.join(TRACKED_COLUMNS)} FROM vacancies "
+            f"WHERE id IN ({', '.join('?' * len(ids))});",
+            ids,
         )
+    }
 
-        cursor.execute('''
-            INSERT OR REPLACE INTO vacancies (
-                id, 
-                country, 
-                site, 
-                title, 
-                city, 
-                address, 
-                experience, 
-                schedule,
-                employment, 
-                description, 
-                skills,
-                professional_roles_name, 
-                company_id, 
-                company_name, 
-                company_url,
-                company_vacancies_url, 
-                company_accredited_it_employer,
-                published_at, 
-                created_at,
-                employment_form, 
-                work_format,
-                work_schedule_by_days, 
-                vacancy_close_date,
-                salary_from, 
-                salary_to, 
-                currency,
-                mode_name, 
-                frequency_name
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', values)
+    # Навыки в базе нужны только для diff изменившихся вакансий
+    updated_ids = [vacancy_id for vacancy_id, old in stored.items() if old[0] != hashes[vacancy_id]]
+    stored_skills: dict[str, list[str]] = {}
+    if updated_ids:
+        for vacancy_id, name in conn.execute(
+                f"SELECT vs.vacancy_id, s.name FROM vacancy_skills vs JOIN skills s ON s.id = vs.skill_id "
+                f"WHERE vs.vacancy_id IN ({', '.join('?' * len(updated_ids))});",
+                updated_ids,
+        ):
+            stored_skills.setdefault(vacancy_id, []).append(name)
 
-        conn.commit()
-        logger.info(f"Вакансия {vacancy_data.get('id')} успешно сохранена в базу данных")
+    now = datetime.now().isoformat(timespec='seconds')
+    changed, versions = [], []
+    for vacancy_id, row in latest.items():
+        old = stored.get(vacancy_id)
+        if old is not None and old[0] == hashes[vacancy_id]:
+            continue
+        changed.append(row)
+        if old is None:
+            continue
+        diff = {
+            column: [old_value, row[index]]
+            for column, index, old_value in zip(TRACKED_COLUMNS, _TRACKED_INDEXES, old[1:])
+            if _is_change(column, old_value, row[index])
+        }
+        old_skills = skills_value(stored_skills.get(vacancy_id, []))
+        if old_skills != new_skills[vacancy_id]:
+            diff['skills'] = [old_skills, new_skills[vacancy_id]]
+        if diff:
+            versions.append((vacancy_id, now, json.dumps(diff, ensure_ascii=False, default=str)))
+
+    conn.executemany(UPSERT_COMPANY_SQL, companies)
+    if not changed:
+        return 0
+
+    used_hashes = {row[-2] for row in changed}
+    changed_skills = {row[0]: skills.get(row[0], []) for row in changed}
+    if descriptions:
+        conn.executemany(INSERT_DESCRIPTION_SQL,
+                         [(digest, body) for digest, body in descriptions.items() if digest in used_hashes])
+    # Последнее значение строки vacancy_to_row — название роли для поиска role_id
+    conn.executemany(INSERT_ROLE_SQL, {(row[-1],) for row in changed if row[-1]})
+    conn.executemany(INSERT_SKILL_SQL, {(skill,) for names in changed_skills.values() for skill in names})
+    conn.executemany(INSERT_VACANCY_SQL, [(*row[:-1], hashes[row[0]], now, row[-1]) for row in changed])
+    conn.executemany('INSERT INTO vacancy_versions (vacancy_id, changed_at, diff) VALUES (?, ?, ?);', versions)
+    conn.executemany('DELETE FROM vacancy_skills WHERE vacancy_id = ?;',
+                     [(vacancy_id,) for vacancy_id in changed_skills])
+    conn.executemany(INSERT_VACANCY_SKILL_SQL,
+                     [(vacancy_id, skill) for vacancy_id, names in changed_skills.items() for skill in names])
+    return len(changed)
+
+
+def vacancy_to_row(vacancy: VacancyData | dict) -> tuple:
+    """Преобразует вакансию в кортеж значений для INSERT_VACANCY_SQL"""
+    vacancy = _as_vacancy(vacancy)
+    row = vacancy.to_row()
+    values = [row[index] for index in _FIELD_INDEXES]
+    # Текст описания хранится в таблице descriptions, в строке вакансии — только хэш
+    values[_DESCRIPTION_INDEX] = None
+
+    # Значения хранимых колонок (без REFERENCE_FIELDS), хэш описания и название роли для поиска role_id
+    return (
+        *values,
+        description_hash(vacancy.description),
+        vacancy.professional_roles_name,
+    )
+
+
+class PreparedVacancy(NamedTuple):
+    """
+    Вакансия, подготовленная к записи: все преобразования уже выполнены.
+
+    Готовится функцией prepare_vacancy, в том числе в процессах стадии разбора,
+    поэтому содержит только сериализуемые значения.
+    """
+
+    row: tuple  # Строка vacancy_to_row
+    company: tuple | None  # Строка company_to_row
+    skills: tuple[str, ...]
+    description: str  # Текст описания (для CSV)
+    description_body: bytes | None  # Сжатое описание для таблицы descriptions
+
+
+def prepare_vacancy(vacancy: VacancyData | dict) -> PreparedVacancy:
+    """Выполняет все преобразования вакансии перед записью, включая сжатие описания"""
+    vacancy = _as_vacancy(vacancy)
+    row = vacancy_to_row(vacancy)
+    description = vacancy.description or ''
+    return PreparedVacancy(
+        row=row,
+        company=company_to_row(vacancy),
+        skills=tuple(vacancy.skills),
+        description=description,
+        description_body=compress_description(description) if row[-2] else None,
+    )
+
+
+def insert_vacancy(vacancy_data: VacancyData | dict):
+    """Вставляет или обновляет запись о вакансии в базе данных (без изменений — не перезаписывает)"""
+    conn = get_db_connection()
+    values = ()
+    try:
+        prepared = prepare_vacancy(vacancy_data)
+        values = prepared.row
+        digest = values[-2]
+        descriptions = {digest: prepared.description_body} if digest else {}
+        with conn:
+            write_vacancies(conn, [values], [prepared.company] if prepared.company else [],
+                            {values[0]: list(prepared.skills)}, descriptions)
+        logger.info(f"Вакансия {values[0]} успешно сохранена в базу данных")
 
     except Exception as err:
         logger.error(f"Ошибка при вставке данных: {err}")
@@ -143,12 +579,151 @@ def insert_vacancy(vacancy_data: dict):
         conn.close()
 
 
-def save_data_to_sqlite(data):  # Исправлено название функции
-    """Сохраняет данные о вакансии в базу данных"""
+class VacancyWriter:
+    """
+    Пакетная запись вакансий через одно постоянное соединение.
+
+    Строки накапливаются в буфере и записываются одним executemany в одной
+    транзакции, когда буфер достигает batch_size или с момента последней
+    записи прошло flush_interval секунд. В той же транзакции обновляются
+    справочники компаний, ролей и навыков и сохраняются сжатые описания;
+    неизменившиеся вакансии пропускаются (см. write_vacancies). База переводится в режим WAL,
+    поэтому чтение из других соединений не блокируется записью.
+
+    Attributes:
+        batch_size (int): Количество строк, после которого буфер сбрасывается.
+        flush_interval (float): Максимальное время хранения строк в буфере, сек.
+        written (int): Количество записанных (новых и изменившихся) строк.
+        unchanged (int): Количество пропущенных неизменившихся строк.
+    """
+
+    def __init__(self, db_path: str = DB_PATH, batch_size: int = 200, flush_interval: float = 5.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.unchanged = 0
+        self._rows: list[tuple] = []
+        self._companies: dict[str, tuple] = {}
+        self._skills: dict[str, list[str]] = {}
+        self._descriptions: dict[str, bytes] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._commit_listeners: list[Callable[[list[str]], None]] = []
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL;')
+        self._conn.execute('PRAGMA synchronous=NORMAL;')
+
+    def add(self, vacancy_data: VacancyData | dict) -> None:
+        """Добавляет вакансию в буфер и при достижении порога сбрасывает его"""
+        self.add_prepared([prepare_vacancy(vacancy_data)])
+
+    def add_prepared(self, items: list[PreparedVacancy]) -> None:
+        """
+        Добавляет в буфер уже подготовленные вакансии (см. prepare_vacancy).
+
+        В потоке вызова выполняется только раскладка по буферам, поэтому метод
+        подходит для вызова из event loop после разбора в пуле процессов.
+        """
+        with self._lock:
+            for item in items:
+                row = item.row
+                self._rows.append(row)
+                digest = row[-2]
+                if digest and item.description_body is not None:
+                    self._descriptions.setdefault(digest, item.description_body)
+                if item.company:
+                    self._companies[item.company[0]] = item.company
+                self._skills[row[0]] = list(item.skills)
+            if (len(self._rows) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Записывает все накопленные строки одной транзакцией"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        companies, self._companies = list(self._companies.values()), {}
+        skills, self._skills = self._skills, {}
+        descriptions, self._descriptions = self._descriptions, {}
+        try:
+            with self._conn:
+                written = write_vacancies(self._conn, rows, companies, skills, descriptions)
+            self.written += written
+            self.unchanged += len(rows) - written
+            logger.info(f"Записано вакансий пакетом: {written}, без изменений: {len(rows) - written}")
+        except Exception as err:
+            logger.error(f"Ошибка пакетной записи {len(rows)} вакансий: {err}")
+            raise
+        vacancy_ids = [row[0] for row in rows]
+        for listener in self._commit_listeners:
+            try:
+                listener(vacancy_ids)
+            except Exception as err:
+                logger.error(f"Ошибка обработчика записи пакета вакансий: {err}")
+
+    def add_commit_listener(self, listener: Callable[[list[str]], None]) -> None:
+        """
+        Подписывает обработчик на успешную запись пакета.
+
+        Обработчик вызывается после фиксации транзакции со списком ID вакансий
+        пакета (в том числе неизменившихся); повторная подписка игнорируется.
+        """
+        with self._lock:
+            if listener not in self._commit_listeners:
+                self._commit_listeners.append(listener)
+
+    def close(self) -> None:
+        """Сбрасывает буфер и закрывает соединение"""
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_writer: VacancyWriter | None = None
+
+
+def get_vacancy_writer() -> VacancyWriter:
+    """Возвращает общий для процесса VacancyWriter (создается при первом обращении)"""
+    global _writer
+    if _writer is None:
+        _writer = VacancyWriter()
+    return _writer
+
+
+def flush_vacancy_writer() -> None:
+    """Сбрасывает буфер общего VacancyWriter, если он был создан"""
+    if _writer is not None:
+        _writer.flush()
+
+
+@atexit.register
+def close_vacancy_writer() -> None:
+    """Сбрасывает буфер и закрывает общий VacancyWriter при завершении процесса"""
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def save_data_to_sqlite(data: VacancyData | dict):  # Исправлено название функции
+    """Сохраняет данные о вакансии в базу данных (через пакетный VacancyWriter)"""
     try:
-        initialize_database()
-        insert_vacancy(data)
-        logger.info(f"Данные записаны успешно: {data['id']}")
+        vacancy = _as_vacancy(data)
+        get_vacancy_writer().add(vacancy)
+        logger.info(f"Данные поставлены в очередь на запись: {vacancy.id}")
     except Exception as err:
         logger.error(f"Ошибка при сохранении данных: {err}")
         raise
@@ -176,21 +751,78 @@ def get_today_vacancies_count():
         conn.close()
 
 
-def get_last_vacancy():
-    """Возвращает последнюю добавленную вакансию в виде словаря"""
+def get_vacancies_summary():
+    """
+    Возвращает сводку по базе для отчета одним подключением.
+
+    Все подсчеты выполняются по индексам (created_at и частичному индексу
+    открытых вакансий), без полного чтения таблицы.
+
+    Returns:
+        dict: total (всего вакансий), today (добавлено сегодня), open (открытых).
+    """
+    conn = get_db_connection()
+    try:
+        total, today, open_count = conn.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM vacancies),
+                (SELECT COUNT(*) FROM vacancies WHERE created_at >= datetime("now", "start of day")),
+                (SELECT COUNT(*) FROM vacancies WHERE vacancy_close_date IS NULL)
+        ''').fetchone()
+        return {'total': total, 'today': today, 'open': open_count}
+    finally:
+        conn.close()
+
+
+def get_last_vacancy(include_description: bool = False):
+    """
+    Возвращает последнюю добавленную вакансию в виде словаря.
+
+    Навыки (строкой через ', ') и данные работодателя берутся из справочников.
+
+    Args:
+        include_description (bool): Загрузить и распаковать текст описания.
+    """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM vacancies ORDER BY created_at DESC LIMIT 1;')
+        cursor.execute('''
+            SELECT v.*, c.name, c.url, c.vacancies_url, c.accredited_it_employer
+            FROM vacancies v
+            LEFT JOIN companies c ON c.id = v.company_id
+            ORDER BY v.created_at DESC LIMIT 1
+        ''')
         row = cursor.fetchone()
         if row:
-            columns = [desc[0] for desc in cursor.description]
-            return dict(zip(columns, row))
+            columns = [desc[0] for desc in cursor.description][:-4]
+            vacancy = dict(zip(columns, row))
+            vacancy.update(zip(REFERENCE_FIELDS[1:], row[-4:]))
+            vacancy['skills'] = ', '.join(name for name, in conn.execute('''
+                SELECT s.name FROM vacancy_skills vs JOIN skills s ON s.id = vs.skill_id
+                WHERE vs.vacancy_id = ? ORDER BY s.name
+            ''', (vacancy['id'],)))
+            if include_description:
+                vacancy['description'] = get_vacancy_description(vacancy['id'])
+            return vacancy
         return None
     finally:
         conn.close()
 
 
+def get_vacancy_description(vacancy_id):
+    """Возвращает текст описания вакансии (None, если вакансии или описания нет)"""
+    conn = get_db_connection()
+    try:
+        row = conn.execute('''
+            SELECT d.body FROM vacancies v
+            JOIN descriptions d ON d.hash = v.description_hash
+            WHERE v.id = ?
+        ''', (vacancy_id,)).fetchone()
+        return decompress_description(row[0]) if row else None
+    finally:
+        conn.close()
+
+
 def close_vacancy(vacancy_id):
     """Закрывает вакансию с текущей датой и временем"""
     conn = get_db_connection()
@@ -198,11 +830,12 @@ def close_vacancy(vacancy_id):
         cursor = conn.cursor()
         close_date = datetime.now().isoformat()
 
+        # updated_at меняется, чтобы закрытие попало в инкрементальную выгрузку
         cursor.execute('''
             UPDATE vacancies
-            SET vacancy_close_date = ?
+            SET vacancy_close_date = ?, updated_at = ?
             WHERE id = ?
-        ''', (close_date, vacancy_id))
+        ''', (close_date, datetime.now().isoformat(timespec='seconds'), vacancy_id))
 
         conn.commit()
         logger.info(f"Вакансия {vacancy_id} закрыта. Дата закрытия: {close_date}")
@@ -213,20 +846,138 @@ def close_vacancy(vacancy_id):
         conn.close()
 
 
+def close_vacancies(vacancy_ids, closed_at=None):
+    """
+    Закрывает пачку вакансий одной транзакцией.
+
+    Args:
+        vacancy_ids (Iterable[str]): ID закрытых вакансий.
+        closed_at (str | None): Дата закрытия в ISO-формате (по умолчанию текущее время).
+
+    Returns:
+        int: Количество обновленных строк.
+    """
+    vacancy_ids = list(vacancy_ids)
+    if not vacancy_ids:
+        return 0
+    closed_at = closed_at or datetime.now().isoformat()
+    updated_at = datetime.now().isoformat(timespec='seconds')
+    conn = get_db_connection()
+    try:
+        with conn:
+            # updated_at меняется, чтобы закрытие попало в инкрементальную выгрузку
+            cursor = conn.executemany('''
+                UPDATE vacancies
+                SET vacancy_close_date = ?, updated_at = ?
+                WHERE id = ?
+            ''', [(closed_at, updated_at, vacancy_id) for vacancy_id in vacancy_ids])
+        logger.info(f"Закрыто вакансий: {cursor.rowcount} из {len(vacancy_ids)}. Дата закрытия: {closed_at}")
+        return cursor.rowcount
+    except Exception as err:
+        logger.error(f"Ошибка при закрытии пачки из {len(vacancy_ids)} вакансий: {err}")
+        raise
+    finally:
+        conn.close()
+
+
 def get_open_vacancies_links():
     """Возвращает список ID открытых вакансий"""
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute('SELECT id FROM vacancies WHERE vacancy_close_date IS NULL OR vacancy_close_date = "False";')
+        cursor.execute('SELECT id FROM vacancies WHERE vacancy_close_date IS NULL;')
         return [row[0] for row in cursor.fetchall()]
     finally:
         conn.close()
 
 
-# Инициализация базы данных при первом импорте модуля
-initialize_database()
+def get_oldest_open_published_at():
+    """Возвращает самую раннюю дату публикации среди открытых вакансий (None, если их нет)"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT MIN(published_at) FROM vacancies WHERE vacancy_close_date IS NULL;')
+        return cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+
+def iter_known_vacancies():
+    """Возвращает итератор пар (id, published_at) всех вакансий в базе, отсортированных по id"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, published_at FROM vacancies ORDER BY CAST(id AS INTEGER);')
+        yield from cursor
+    finally:
+        conn.close()
+
+
+def get_top_skills(role: str | None = None, since: str | None = None, limit: int = 20):
+    """
+    Возвращает самые востребованные навыки по индексам справочников.
+
+    Args:
+        role (str | None): Название профессиональной роли (по умолчанию все роли).
+        since (str | None): Учитывать вакансии, опубликованные не раньше этой даты (ISO 8601).
+        limit (int): Количество навыков.
+
+    Returns:
+        list[tuple[str, int]]: Пары (навык, количество вакансий) по убыванию количества.
+    """
+    conditions, params = [], []
+    if role is not None:
+        conditions.append('v.role_id = (SELECT id FROM roles WHERE name = ?)')
+        params.append(role)
+    if since is not None:
+        conditions.append('v.published_at >= ?')
+        params.append(since)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    conn = get_db_connection()
+    try:
+        return conn.execute(f'''
+            SELECT s.name, COUNT(*) AS vacancies_count
+            FROM vacancy_skills vs
+            JOIN vacancies v ON v.id = vs.vacancy_id
+            JOIN skills s ON s.id = vs.skill_id
+            {where}
+            GROUP BY vs.skill_id
+            ORDER BY vacancies_count DESC
+            LIMIT ?
+        ''', (*params, limit)).fetchall()
+    finally:
+        conn.close()
+
+
+def get_collection_mark(area: int, professional_role: int) -> str | None:
+    """Возвращает время последнего успешного сбора ссылок для страны и категории"""
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT collected_at FROM collection_marks WHERE area = ? AND professional_role = ?;',
+            (area, professional_role),
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def set_collection_mark(area: int, professional_role: int, collected_at: str):
+    """Сохраняет время последнего успешного сбора ссылок для страны и категории"""
+    conn = get_db_connection()
+    try:
+        conn.execute(
+            'INSERT OR REPLACE INTO collection_marks (area, professional_role, collected_at) VALUES (?, ?, ?);',
+            (area, professional_role, collected_at),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
 
 if __name__ == "__main__":
+    initialize_database()
     # Получаем и выводим информацию
     print(f"Общее количество вакансий: {get_total_vacancies()}")
@@ -0,0 +1,330 @@
+"""
+Выгрузка вакансий из vacancies.db в колоночные файлы Parquet или Arrow IPC.
+
+Файлы раскладываются по каталогам в формате Hive: country=<страна>/month=<ГГГГ-ММ>
+(месяц публикации), поэтому pyarrow.dataset, DuckDB, Polars и Spark читают
+только нужные разделы. Навыки выгружаются списком строк (по алфавиту), зарплата — структурой,
+даты — временными метками UTC.
+
+В инкрементальном режиме выгружаются только строки, изменившиеся (updated_at)
+с прошлой выгрузки в тот же каталог; каждый запуск добавляет новые файлы
+part-<время>.*. Актуальная версия вакансии — строка с наибольшим updated_at.
+
+Требует pyarrow (pip install pyarrow). Запуск из корня проекта:
+    python -m src.export.parquet_exporter [--out exports/vacancies] [--format parquet|arrow] [--full]
+"""
+
+import argparse
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from src.database.db_manager import DB_PATH, decompress_description
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+EXPORT_DIR = 'exports/vacancies'
+# Сколько строк раздела копится в памяти перед записью пакета в файл
+EXPORT_BATCH_SIZE = 5000
+# Файл с отметкой последней выгрузки (в корне каталога выгрузки)
+STATE_FILE = '_export_state.json'
+FILE_EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+EXPORT_SQL = '''
+    SELECT v.id, v.country, v.site, v.title, v.city, v.address, v.experience, v.schedule,
+           v.employment, v.employment_form, v.work_format, v.work_schedule_by_days,
+           v.professional_roles_name,
+           (SELECT json_group_array(name) FROM (
+                SELECT s.name FROM vacancy_skills vs JOIN skills s ON s.id = vs.skill_id
+                WHERE vs.vacancy_id = v.id ORDER BY s.name)),
+           v.salary_from, v.salary_to, v.currency, v.mode_name, v.frequency_name,
+           v.company_id, c.name, c.url, c.vacancies_url, c.accredited_it_employer,
+           v.published_at, v.created_at, v.vacancy_close_date, v.updated_at, {description}
+    FROM vacancies v
+    LEFT JOIN companies c ON c.id = v.company_id
+    {join}
+    WHERE {condition}
+'''
+_TEXT_COLUMNS = (
+    'id', 'country', 'site', 'title', 'city', 'address', 'experience', 'schedule',
+    'employment', 'employment_form', 'work_format', 'work_schedule_by_days', 'professional_role',
+)
+_COMPANY_COLUMNS = ('company_id', 'company_name', 'company_url', 'company_vacancies_url')
+_TIMESTAMP_COLUMNS = ('published_at', 'created_at', 'closed_at', 'updated_at')
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("Для выгрузки в Parquet/Arrow нужен pyarrow: pip install pyarrow")
+
+
+def vacancy_schema(include_descriptions: bool = True) -> 'pa.Schema':
+    """Схема выгрузки: навыки — list<string>, зарплата — struct, даты — timestamp UTC"""
+    _require_pyarrow()
+    timestamp = pa.timestamp('s', tz='UTC')
+    fields = [pa.field(name, pa.string()) for name in _TEXT_COLUMNS]
+    fields += [
+        pa.field('skills', pa.list_(pa.string())),
+        pa.field('salary', pa.struct([
+            pa.field('from', pa.float64()),
+            pa.field('to', pa.float64()),
+            pa.field('currency', pa.string()),
+            pa.field('mode', pa.string()),
+            pa.field('frequency', pa.string()),
+        ])),
+    ]
+    fields += [pa.field(name, pa.string()) for name in _COMPANY_COLUMNS]
+    fields.append(pa.field('company_accredited_it_employer', pa.bool_()))
+    fields += [pa.field(name, timestamp) for name in _TIMESTAMP_COLUMNS]
+    if include_descriptions:
+        fields.append(pa.field('description', pa.large_string()))
+    return pa.schema(fields)
+
+
+def _timestamp(value: str | None) -> datetime | None:
+    """Дата из базы в UTC (даты без часового пояса считаются местным временем)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).astimezone(timezone.utc)
+    except ValueError:
+        return None
+
+
+def _number(value) -> float | None:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _flag(value) -> bool | None:
+    """Флаг из базы: 1/0, 'True'/'False' (строки старых версий) или None"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true')
+    return bool(value)
+
+
+def _partition(country: str | None, published_at: str | None) -> tuple[str, str]:
+    """Раздел выгрузки: (страна, месяц публикации)"""
+    country = (country or 'unknown').replace('/', '_')
+    month = published_at[:7] if published_at and len(published_at) >= 7 else 'unknown'
+    return country, month
+
+
+def _to_record(row: tuple, include_descriptions: bool) -> dict[str, Any]:
+    """Строка EXPORT_SQL в запись схемы vacancy_schema"""
+    (vacancy_id, country, site, title, city, address, experience, schedule,
+     employment, employment_form, work_format, work_schedule_by_days,
+     role, skills, salary_from, salary_to, currency, mode_name, frequency_name,
+     company_id, company_name, company_url, company_vacancies_url, accredited,
+     published_at, created_at, closed_at, updated_at, description) = row
+    has_salary = any(value is not None for value in (salary_from, salary_to, currency))
+    record = {
+        'id': vacancy_id,
+        'country': country,
+        'site': site,
+        'title': title,
+        'city': city,
+        'address': address,
+        'experience': experience,
+        'schedule': schedule,
+        'employment': employment,
+        'employment_form': employment_form,
+        'work_format': work_format,
+        'work_schedule_by_days': work_schedule_by_days,
+        'professional_role': role,
+        'skills': json.loads(skills) if skills else [],
+        'salary': {
+            'from': _number(salary_from),
+            'to': _number(salary_to),
+            'currency': currency,
+            'mode': mode_name,
+            'frequency': frequency_name,
+        } if has_salary else None,
+        'company_id': company_id,
+        'company_name': company_name,
+        'company_url': company_url,
+        'company_vacancies_url': company_vacancies_url,
+        'company_accredited_it_employer': _flag(accredited),
+        'published_at': _timestamp(published_at),
+        'created_at': _timestamp(created_at),
+        'closed_at': _timestamp(closed_at),
+        'updated_at': _timestamp(updated_at),
+    }
+    if include_descriptions:
+        record['description'] = decompress_description(description) if description else None
+    return record
+
+
+def load_export_state(out_dir: str | Path) -> dict[str, Any]:
+    """Отметка последней выгрузки в каталог ({} — выгрузок еще не было)"""
+    path = Path(out_dir) / STATE_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def _save_export_state(out_dir: Path, state: dict[str, Any]) -> None:
+    path = out_dir / STATE_FILE
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding='utf-8')
+    tmp_path.replace(path)
+
+
+class _PartitionWriters:
+    """Открытые файлы разделов выгрузки и буферы строк для них"""
+
+    def __init__(self, out_dir: Path, fmt: str, schema: 'pa.Schema', run_id: str, batch_size: int):
+        self.out_dir = out_dir
+        self.fmt = fmt
+        self.schema = schema
+        self.file_name = f'part-{run_id}.{FILE_EXTENSIONS[fmt]}'
+        self.batch_size = batch_size
+        self.rows = 0
+        self._writers: dict[tuple[str, str], Any] = {}
+        self._buffers: dict[tuple[str, str], list[dict[str, Any]]] = {}
+
+    @property
+    def files(self) -> int:
+        return len(self._writers)
+
+    def add(self, partition: tuple[str, str], record: dict[str, Any]) -> None:
+        buffer = self._buffers.setdefault(partition, [])
+        buffer.append(record)
+        if len(buffer) >= self.batch_size:
+            self._write(partition)
+
+    def _write(self, partition: tuple[str, str]) -> None:
+        records = self._buffers.pop(partition, None)
+        if not records:
+            return
+        writer = self._writers.get(partition)
+        if writer is None:
+            country, month = partition
+            directory = self.out_dir / f'country={country}' / f'month={month}'
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / self.file_name
+            if self.fmt == 'parquet':
+                writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+            else:
+                writer = pa.ipc.new_file(path, self.schema)
+            self._writers[partition] = writer
+        writer.write_table(pa.Table.from_pylist(records, schema=self.schema))
+        self.rows += len(records)
+
+    def close(self) -> None:
+        try:
+            for partition in list(self._buffers):
+                self._write(partition)
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+
+
+def export_vacancies(
+        out_dir: str | Path = EXPORT_DIR,
+        fmt: str = 'parquet',
+        incremental: bool = True,
+        include_descriptions: bool = True,
+        db_path: str = DB_PATH,
+        batch_size: int = EXPORT_BATCH_SIZE,
+) -> dict[str, int]:
+    """
+    Выгружает вакансии в файлы Parquet / Arrow IPC, разбитые по стране и месяцу.
+
+    Строки читаются из базы курсором пакетами по batch_size, поэтому память
+    не зависит от размера таблицы. Выгружаются строки с updated_at раньше
+    секунды начала выгрузки: строки, записанные в эту секунду и позже, попадут
+    в следующую. Отметкой выгрузки сохраняется наибольший выгруженный
+    updated_at, следующая инкрементальная выгрузка берет строки с updated_at
+    больше него. При полной выгрузке прежние файлы part-* в каталоге удаляются.
+
+    Args:
+        out_dir (str | Path): Каталог выгрузки.
+        fmt (str): Формат файлов: 'parquet' или 'arrow' (Arrow IPC).
+        incremental (bool): Выгрузить только строки, изменившиеся с прошлой выгрузки
+            в этот каталог (без отметки прошлой выгрузки выгружается все).
+        include_descriptions (bool): Распаковывать и выгружать тексты описаний.
+        db_path (str): Путь к базе данных.
+        batch_size (int): Размер пакета чтения и записи.
+
+    Returns:
+        dict[str, int]: Статистика: rows (выгружено строк), files (создано файлов).
+
+    Raises:
+        ImportError: Если не установлен pyarrow.
+        ValueError: Если указан неизвестный формат.
+    """
+    _require_pyarrow()
+    if fmt not in FILE_EXTENSIONS:
+        raise ValueError(f"Неизвестный формат выгрузки: {fmt} (допустимы: {', '.join(FILE_EXTENSIONS)})")
+
+    out_dir = Path(out_dir)
+    state = load_export_state(out_dir)
+    since = state.get('exported_until') if incremental and state.get('format') == fmt else None
+    # updated_at пишется с точностью до секунды: строки текущей секунды еще могут дописываться
+    started = datetime.now().isoformat(timespec='seconds')
+
+    if since is None:
+        for old_file in out_dir.glob(f'country=*/month=*/part-*.{FILE_EXTENSIONS[fmt]}'):
+            old_file.unlink()
+        condition, params = 'v.updated_at IS NULL OR v.updated_at < ?', (started,)
+    else:
+        condition, params = 'v.updated_at > ? AND v.updated_at < ?', (since, started)
+    sql = EXPORT_SQL.format(
+        description='d.body' if include_descriptions else 'NULL',
+        join='LEFT JOIN descriptions d ON d.hash = v.description_hash' if include_descriptions else '',
+        condition=condition,
+    )
+
+    run_id = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+    writers = _PartitionWriters(out_dir, fmt, vacancy_schema(include_descriptions), run_id, batch_size)
+    exported_until = since  # Наибольший выгруженный updated_at
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        cursor = conn.execute(sql, params)
+        while rows := cursor.fetchmany(batch_size):
+            for row in rows:
+                writers.add(_partition(row[1], row[24]), _to_record(row, include_descriptions))
+                if row[27] is not None and (exported_until is None or row[27] > exported_until):
+                    exported_until = row[27]
+    finally:
+        conn.close()
+        writers.close()
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _save_export_state(out_dir, {'format': fmt, 'exported_until': exported_until})
+    mode = f"изменения с {since}" if since else "полная выгрузка"
+    logger.info(f"Выгрузка вакансий ({mode}): {writers.rows} строк, {writers.files} файлов в {out_dir}")
+    return {'rows': writers.rows, 'files': writers.files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', default=EXPORT_DIR, help='Каталог выгрузки')
+    parser.add_argument('--format', choices=tuple(FILE_EXTENSIONS), default='parquet', help='Формат файлов')
+    parser.add_argument('--full', action='store_true', help='Полная выгрузка вместо инкрементальной')
+    parser.add_argument('--no-descriptions', action='store_true', help='Не выгружать тексты описаний')
+    parser.add_argument('--db', default=DB_PATH, help='Путь к базе данных')
+    args = parser.parse_args()
+
+    stats = export_vacancies(args.out, args.format, incremental=not args.full,
+                             include_descriptions=not args.no_descriptions, db_path=args.db)
+    print(f"Выгружено строк: {stats['rows']}, файлов: {stats['files']}")
+
+
+if __name__ == '__main__':
+    main()
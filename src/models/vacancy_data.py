@@ -1,24 +1,141 @@
-from dataclasses import dataclass, field
-from typing import List
-from datetime import datetime
+"""Модуль с записью вакансии в порядке колонок таблицы vacancies."""
 
-@dataclass
+from dataclasses import dataclass, field, fields
+from typing import Any
+
+from src.crawl_links.description_normalizer import normalize_description
+
+
+@dataclass(slots=True)
 class VacancyData:
-    id: int
-    title: str
-    url: str
-    api_url: str
-    published_at: datetime
-    salary_from: int | None
-    salary_to: int | None
-    currency: str | None
-    city: str
-    country_code: str
-    address: str | None
-    employer_name: str
-    employer_url: str
-    employer_site: str | None
-    key_skills: List[str]
-    description: str
+    """Вакансия hh.ru: единый тип записи между разбором ответа API и базой данных.
+
+    Поля идут в порядке колонок таблицы vacancies, поэтому to_row() собирает
+    строку для вставки без промежуточного словаря. Благодаря __slots__
+    большие пачки вакансий в памяти занимают заметно меньше места.
+
+    Attributes:
+        skills (list[str]): Ключевые навыки (в базе хранятся строкой через ', ').
+        description (str): Текст описания (после normalize_description).
+        company_accredited_it_employer (bool): Флаг аккредитованного IT-работодателя.
+        vacancy_close_date (str | None): Дата закрытия (ведет проверка вакансий).
+    """
+    id: str
+    country: str | None = None
+    site: str = 'hh_ru'
+    title: str | None = None
+    city: str | None = None
+    address: str | None = None
     experience: str | None = None
-    is_archived: bool = False
+    schedule: str | None = None
+    employment: str | None = None
+    description: str = ''
+    skills: list[str] = field(default_factory=list)
+    professional_roles_name: str | None = None
+    company_id: str | None = None
+    company_name: str | None = None
+    company_url: str | None = None
+    company_vacancies_url: str | None = None
+    company_accredited_it_employer: bool = False
+    published_at: str | None = None
+    created_at: str | None = None
+    employment_form: str | None = None
+    work_format: str | None = None
+    work_schedule_by_days: str | None = None
+    vacancy_close_date: str | None = None
+    salary_from: int | None = None
+    salary_to: int | None = None
+    currency: str | None = None
+    mode_name: str | None = None
+    frequency_name: str | None = None
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any], country: str | None) -> 'VacancyData':
+        """Создает вакансию из ответа API hh.ru (/vacancies/{id}).
+
+        Args:
+            data (dict): Ответ API по вакансии
+            country (str | None): Название страны
+
+        Returns:
+            VacancyData: Вакансия с нормализованным описанием
+        """
+        salary = data.get('salary_range') or {}
+        address = data.get('address')
+        roles = data.get('professional_roles') or []
+        schedule = data.get('schedule') or {}
+        employment = data.get('employment') or {}
+        experience = data.get('experience') or {}
+        area = data.get('area') or {}
+        employer = data.get('employer') or {}
+
+        return cls(
+            id=data.get('id'),
+            country=country or None,
+            title=data.get('name'),
+            city=area.get('name'),
+            address=address.get('raw') if isinstance(address, dict) else address,
+            experience=experience.get('name'),
+            schedule=schedule.get('name'),
+            employment=employment.get('name'),
+            description=normalize_description(data.get('description')),
+            skills=[skill['name'] for skill in data.get('key_skills', [])],
+            professional_roles_name=roles[0].get('name') if roles else None,
+            company_id=employer.get('id'),
+            company_name=employer.get('name'),
+            company_url=employer.get('url'),
+            company_vacancies_url=employer.get('vacancies_url'),
+            company_accredited_it_employer=employer.get('accredited_it_employer') if employer else False,
+            published_at=data.get('published_at'),
+            created_at=data.get('created_at'),
+            employment_form=employment.get('name'),
+            work_format=schedule.get('name'),
+            work_schedule_by_days=employment.get('name'),
+            salary_from=salary.get('from'),
+            salary_to=salary.get('to'),
+            currency=salary.get('currency'),
+            mode_name=(salary.get('mode') or {}).get('name'),
+            frequency_name=(salary.get('frequency') or {}).get('name'),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'VacancyData':
+        """Создает вакансию из словаря с ключами-колонками (лишние ключи игнорируются)"""
+        return cls(**{name: data[name] for name in FIELD_NAMES if data.get(name) is not None})
+
+    def to_row(self) -> tuple:
+        """Возвращает значения в порядке колонок таблицы vacancies (навыки — строкой через ', ')"""
+        return (
+            self.id,
+            self.country,
+            self.site,
+            self.title,
+            self.city,
+            self.address,
+            self.experience,
+            self.schedule,
+            self.employment,
+            self.description,
+            ', '.join(self.skills),
+            self.professional_roles_name,
+            self.company_id,
+            self.company_name,
+            self.company_url,
+            self.company_vacancies_url,
+            self.company_accredited_it_employer,
+            self.published_at,
+            self.created_at,
+            self.employment_form,
+            self.work_format,
+            self.work_schedule_by_days,
+            self.vacancy_close_date,
+            self.salary_from,
+            self.salary_to,
+            self.currency,
+            self.mode_name,
+            self.frequency_name,
+        )
+
+
+# Имена полей (и колонок таблицы vacancies) в порядке to_row()
+FIELD_NAMES = tuple(f.name for f in fields(VacancyData))
@@ -1,8 +1,14 @@
 """Модуль с параметрами поиска вакансий."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
+
+def _today() -> str:
+    """Текущая дата в формате 'YYYY-MM-DD' (вычисляется при создании объекта, а не при импорте)."""
+    return datetime.now().strftime('%Y-%m-%d')
+
+
 @dataclass
 class VacancySearchParams:
     """Параметры поиска вакансий.
@@ -12,12 +18,14 @@ class VacancySearchParams:
         area (int): ID региона поиска (по умолчанию: 113 — Россия).
         per_page (int): Количество вакансий на странице (по умолчанию: 100).
         page (int): Номер страницы (по умолчанию: 0).
-        date_from (str): Дата начала поиска в формате 'YYYY-MM-DD' (по умолчанию: текущая дата).
-        date_to (str): Дата окончания поиска в формате 'YYYY-MM-DD' (по умолчанию: текущая дата).
+        date_from (str): Дата начала поиска в формате 'YYYY-MM-DD' или ISO 8601 с временем
+            (по умолчанию: текущая дата).
+        date_to (str): Дата окончания поиска в формате 'YYYY-MM-DD' или ISO 8601 с временем
+            (по умолчанию: текущая дата).
     """
     professional_role: int = 96
     area: int = 113
     per_page: int = 100
     page: int = 0
-    date_from: str = datetime.now().strftime('%Y-%m-%d')
-    date_to: str = datetime.now().strftime('%Y-%m-%d')
+    date_from: str = field(default_factory=_today)
+    date_to: str = field(default_factory=_today)
@@ -1,10 +1,26 @@
+import asyncio
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Awaitable, Callable
 from src.utils.random_delay import random_delay
 from src.models.vacancy_search_params import VacancySearchParams
 from src.parser.get_vacancies_metadata import get_vacancies_metadata
+from src.parser.page_scheduler import PageScheduler
+from src.parser.search_partitioner import collect_partitioned
+from src.utils.http_client import create_async_client
+from src.utils.rate_limiter import AsyncRateLimiter
+from src.database.checkpoint import CrawlCheckpoint
+from src.database.db_manager import get_collection_mark, initialize_database, set_collection_mark
 from src.utils.main_logger import setup_logger
 
 logger = setup_logger(__name__)
 found = 0  # Глобальная переменная для подсчёта общего количества найденных вакансий
+SEARCH_CALLS_PER_MINUTE = 60  # Лимит запросов к поиску вакансий в минуту
+SEARCH_MAX_IN_FLIGHT = 8  # Максимум одновременных запросов к поиску
+
+# Идентификаторы категорий профессий
+CATEGORIES: tuple[int, ...] = (156, 160, 10, 12, 150, 25, 165, 34, 36, 73, 155, 96, 164, 104, 157, 107, 112, 113, 148, 114, 116, 121,
+                               124, 125, 126,)
 
 def clear_file(filename: str) -> None:
     """
@@ -26,27 +42,140 @@ def clear_file(filename: str) -> None:
         logger.error(f"Неожиданная ошибка при очистке файла {filename}: {err}")
 
 
-def categories_manager(country: int):
+def categories_manager(country: int, incremental: bool = False, seen_ids: set[str] | None = None):
     """
     Управляет категориями вакансий для заданной страны.
 
+    Все категории собираются конкурентно через общий PageScheduler.
+
     Args:
         country (int): Идентификатор страны для поиска вакансий.
+        incremental (bool): Собирать только вакансии, опубликованные с прошлого сбора.
+        seen_ids (set[str] | None): ID уже собранных вакансий, которые не нужно дописывать в файл.
+    """
+    asyncio.run(collect_countries({country: seen_ids}, incremental))
+
+# Асинхронный обработчик страницы выдачи: (страна, список вакансий)
+ItemsHandler = Callable[[int, list[dict[str, Any]]], Awaitable[None]]
+
+async def collect_countries(
+    seen_ids_by_country: dict[int, set[str] | None],
+    incremental: bool = False,
+    on_items: ItemsHandler | None = None,
+    checkpoint: CrawlCheckpoint | None = None,
+    deferred_marks: list[tuple[int, int, str]] | None = None,
+    date_from: str | None = None,
+) -> None:
+    """
+    Конкурентно собирает ссылки по всем категориям для нескольких стран.
+
+    Запросы всех пар (страна, категория) идут через один PageScheduler: общий
+    лимит частоты, не больше SEARCH_MAX_IN_FLIGHT запросов одновременно и
+    справедливая очередь по парам вместо фиксированных пауз между страницами.
+    Ошибка в одной категории не останавливает остальные.
+
+    Args:
+        seen_ids_by_country (dict[int, set[str] | None]): Страны и ID уже собранных в них вакансий.
+        incremental (bool): Собирать только вакансии, опубликованные с прошлого сбора.
+        on_items (ItemsHandler | None): Обработчик страниц выдачи. По умолчанию ссылки
+            дописываются в файлы {country}_vacancies_links.txt.
+        checkpoint (CrawlCheckpoint | None): Журнал обработанных категорий и страниц.
+        deferred_marks (list | None): Если задан, отметки инкрементального сбора не
+            сохраняются сразу, а добавляются в список (страна, категория, время).
+        date_from (str | None): Начало окна публикации для неинкрементального сбора
+            (ISO 8601). По умолчанию собираются вакансии за текущий день.
+    """
+    limiter = AsyncRateLimiter(calls_per_minute=SEARCH_CALLS_PER_MINUTE)
+    async with create_async_client(max_connections=SEARCH_MAX_IN_FLIGHT, max_keepalive=SEARCH_MAX_IN_FLIGHT) as client:
+        async with PageScheduler(client, limiter, max_in_flight=SEARCH_MAX_IN_FLIGHT) as scheduler:
+            jobs = [
+                (country, category, collect_category(scheduler, country, category, incremental, seen_ids, on_items,
+                                                     checkpoint, deferred_marks, date_from))
+                for country, seen_ids in seen_ids_by_country.items()
+                for category in CATEGORIES
+            ]
+            results = await asyncio.gather(*(job for _, _, job in jobs), return_exceptions=True)
+
+    for (country, category, _), result in zip(jobs, results):
+        if isinstance(result, Exception):
+            logger.error(f"Не удалось собрать категорию {category} (страна {country}): {result}")
+
+async def collect_category(
+    scheduler: PageScheduler,
+    country: int,
+    category: int,
+    incremental: bool = False,
+    seen_ids: set[str] | None = None,
+    on_items: ItemsHandler | None = None,
+    checkpoint: CrawlCheckpoint | None = None,
+    deferred_marks: list[tuple[int, int, str]] | None = None,
+    date_from: str | None = None,
+) -> None:
+    """
+    Собирает ссылки одной категории, обходя лимит выдачи API в 2000 результатов.
+
+    В инкрементальном режиме запрашиваются только вакансии, опубликованные после
+    последнего успешного сбора (date_from = отметка, date_to = время начала
+    текущего запуска). После обхода категории отметка сдвигается на время начала запуска.
+
+    Args:
+        scheduler (PageScheduler): Общий планировщик запросов.
+        country (int): Идентификатор страны.
+        category (int): Идентификатор категории профессий.
+        incremental (bool): Собирать только вакансии, опубликованные с прошлого сбора.
+        seen_ids (set[str] | None): ID уже собранных вакансий.
+        on_items (ItemsHandler | None): Обработчик страниц выдачи (по умолчанию — запись в файл).
+        checkpoint (CrawlCheckpoint | None): Журнал обработанных категорий и страниц.
+        deferred_marks (list | None): Список для отложенного сохранения отметки сбора.
+        date_from (str | None): Начало окна публикации для неинкрементального сбора.
     """
     global found
-    # Идентификаторы категорий профессий
-    categories: tuple[int, ...] = (156, 160, 10, 12, 150, 25, 165, 34, 36, 73, 155, 96, 164, 104, 157, 107, 112, 113, 148, 114, 116, 121,
-                  124, 125, 126,)
-    for category in categories:
-        # Создаём параметры поиска для текущей категории
-        pages_params = VacancySearchParams(area=country, professional_role=category)
-        metadata = get_vacancies_metadata(pages_params)
-        pages = metadata["pages"]
-        found += metadata["found"]
-        fetch_page_data(country, category, pages)
-        random_delay(min_seconds=1.0, max_seconds=2.0)  # Задержка для избежания блокировки
-
-def fetch_page_data(country: int, category: int, pages: int):
+    category_key = f'{country}:{category}'
+    if checkpoint is not None and checkpoint.is_done('category', category_key):
+        logger.info(f"Категория {category_key} уже собрана в прерванном запуске, пропускаем")
+        return
+
+    # Создаём параметры поиска для текущей категории
+    pages_params = VacancySearchParams(area=country, professional_role=category)
+    run_started = datetime.now().astimezone().isoformat(timespec='seconds')
+    if checkpoint is not None:
+        # Конец окна входит в ключи страниц журнала: при возобновлении берем окно прерванного запуска
+        run_started = checkpoint.remember(f'window:{category_key}', run_started)
+    if date_from is not None and not incremental:
+        pages_params = replace(pages_params, date_from=date_from, date_to=run_started)
+    if incremental:
+        mark = get_collection_mark(country, category)
+        if mark:
+            pages_params = replace(pages_params, date_from=mark, date_to=run_started)
+            logger.info(f"Категория {category}: инкрементальный сбор с {mark}")
+
+    # Запрос делится на подзапросы меньше лимита выдачи API, их страницы собираются конкурентно
+    async def handle_items(items: list[dict[str, Any]]) -> None:
+        if on_items is not None:
+            await on_items(country, items)
+        else:
+            get_urls_from_pages(items, country, seen_ids)
+
+    # Результат сохраняется до обновления счетчика: `found += await ...` читает found
+    # до await, и параллельные категории перезаписали бы прибавки друг друга
+    category_found = await collect_partitioned(scheduler, pages_params, handle_items, checkpoint)
+    found += category_found
+
+    if incremental:
+        if deferred_marks is not None:
+            deferred_marks.append((country, category, run_started))
+        else:
+            set_collection_mark(country, category, run_started)
+    if checkpoint is not None:
+        checkpoint.mark_done('category', category_key)
+
+def fetch_page_data(
+    country: int,
+    category: int,
+    pages: int,
+    base_params: VacancySearchParams | None = None,
+    seen_ids: set[str] | None = None,
+):
     """
     Получает данные по страницам для заданной категории и страны.
 
@@ -54,28 +183,59 @@ def fetch_page_data(country: int, category: int, pages: int):
         country (int): Идентификатор страны.
         category (int): Идентификатор категории профессий.
         pages (int): Количество страниц для обработки.
+        base_params (VacancySearchParams | None): Базовые параметры поиска (например, с окном дат).
+        seen_ids (set[str] | None): ID уже собранных вакансий.
     """
+    if base_params is None:
+        base_params = VacancySearchParams(area=country, professional_role=category)
     page = 0
     for _ in range(pages):
-        params = VacancySearchParams(area=country, professional_role=category, page=page)
+        params = replace(base_params, page=page)
         metadata = get_vacancies_metadata(params)
-        get_urls_from_pages(metadata['vacancies'], country)
+        get_urls_from_pages(metadata['vacancies'], country, seen_ids)
         page += 1
         print(f"fetch_page_data page+: {page}")
         random_delay(min_seconds=1.0, max_seconds=3.0)  # Задержка для избежания блокировки
 
-def get_urls_from_pages(items: dict, country: int):
+def get_urls_from_pages(items: dict, country: int, seen_ids: set[str] | None = None):
     """Извлекает URL из списка вакансий и записывает их в файл.
 
     Args:
         items (dict): Словарь, содержащий список вакансий.
+        country (int): Идентификатор страны (определяет имя файла).
+        seen_ids (set[str] | None): ID уже записанных вакансий; повторы пропускаются,
+            новые ID добавляются в множество.
     """
     try:
+        urls = []
         for item in items:
-            write_to_file(f'{country}_vacancies_links.txt', item['url'])
+            if seen_ids is not None:
+                if item['id'] in seen_ids:
+                    continue
+                seen_ids.add(item['id'])
+            urls.append(item['url'])
+        if urls:
+            # Одно открытие файла на страницу выдачи, а не на каждую ссылку
+            write_to_file(f'{country}_vacancies_links.txt', '\n'.join(urls))
     except Exception as err:
         logger.error(f'Error get vacancy url {err}')
 
+def load_link_ids(filename: str) -> set[str]:
+    """
+    Возвращает множество ID вакансий из существующего файла ссылок.
+
+    Args:
+        filename (str): Путь к файлу со ссылками.
+
+    Returns:
+        set[str]: ID вакансий (пустое множество, если файла нет).
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            return {line.strip().split('?')[0].rstrip('/').split('/')[-1] for line in file if line.strip()}
+    except FileNotFoundError:
+        return set()
+
 def write_to_file(filename: str, data: str) -> None:
     """
     Записывает строку в файл, сохраняя существующие данные.
@@ -88,14 +248,33 @@ def write_to_file(filename: str, data: str) -> None:
         # print(f"\nWRITE LINK: {data}\n")
         file.write(data + '\n')  # Добавляем `\n` для перехода на новую строку
 
-def parser_links():
+def parser_links(incremental: bool = False):
     """
     Запускает процесс парсинга для двух стран.
+
+    Обработанные категории и страницы записываются в журнал контрольных точек:
+    после падения повторный запуск не очищает файлы ссылок и продолжает с места остановки.
+
+    Args:
+        incremental (bool): Не очищать файлы ссылок, а дописывать в них только новые ID,
+            опубликованные после последнего успешного сбора.
     """
-    clear_file('113_vacancies_links.txt')
-    clear_file('16_vacancies_links.txt')
-    categories_manager(113)  # Россия
-    categories_manager(16)   # Беларусь
+    initialize_database()
+    checkpoint = CrawlCheckpoint('collect:links')
+    try:
+        if not incremental and not checkpoint.resumed:
+            clear_file('113_vacancies_links.txt')
+            clear_file('16_vacancies_links.txt')
+
+        # При возобновлении уже записанные ссылки не дублируются
+        dedupe = incremental or checkpoint.resumed
+        asyncio.run(collect_countries({
+            113: load_link_ids('113_vacancies_links.txt') if dedupe else set(),  # Россия
+            16: load_link_ids('16_vacancies_links.txt') if dedupe else set(),    # Беларусь
+        }, incremental=incremental, checkpoint=checkpoint))
+        checkpoint.complete()
+    finally:
+        checkpoint.close()
 
 if __name__ == "__main__":
     parser_links()
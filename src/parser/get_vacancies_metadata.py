@@ -1,9 +1,10 @@
 """Модуль для работы с API вакансий: получение метаданных и параметров поиска."""
 
 from typing import List, Dict, Any
-import requests
+import httpx
 from dataclasses import dataclass
-from src.utils.fetch_vacancies import fetch_vacancies_data
+from src.utils.fetch_vacancies import fetch_vacancies_data, fetch_vacancies_data_async
+from src.utils.rate_limiter import AsyncRateLimiter
 from src.models.vacancy_search_params import VacancySearchParams
 from src.utils.main_logger import setup_logger
 
@@ -62,7 +63,7 @@ def get_vacancies_metadata(params: VacancySearchParams) -> Dict[str, Any] | None
                 per_page (int): Количество вакансий на странице.
 
     Raises:
-        requests.exceptions.RequestException: Ошибка при выполнении HTTP-запроса.
+        httpx.HTTPError: Ошибка при выполнении HTTP-запроса.
         ValueError: Ошибка декодирования JSON-ответа.
         Exception: Неожиданная ошибка.
 
@@ -97,20 +98,14 @@ def get_vacancies_metadata(params: VacancySearchParams) -> Dict[str, Any] | None
         fetch_data = fetch_vacancies_data(params=params)
         request_url = fetch_data['url']
 
-        data = VacanciesMetadata(
-            vacancies=fetch_data['data']['items'],
-            found=fetch_data['data']['found'],
-            pages=fetch_data['data']['pages'],
-            page=fetch_data['data']['page'],
-            per_page=fetch_data['data']['per_page']
-        ).__dict__
+        data = _to_metadata(fetch_data)
 
         # logger.info(f"get_vacancies_metadata: {data}")
         logger.info(f"get_vacancies_metadata URL: {request_url}")
 
         return data
 
-    except requests.exceptions.RequestException as err:
+    except httpx.HTTPError as err:
         logger.error(f"Не удалось получить данные: {err}")
         raise
 
@@ -122,6 +117,39 @@ def get_vacancies_metadata(params: VacancySearchParams) -> Dict[str, Any] | None
         logger.error(f"Неожиданная ошибка: {err}")
         raise
 
+def _to_metadata(fetch_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Преобразует ответ fetch_vacancies_data в словарь метаданных VacanciesMetadata."""
+    return VacanciesMetadata(
+        vacancies=fetch_data['data']['items'],
+        found=fetch_data['data']['found'],
+        pages=fetch_data['data']['pages'],
+        page=fetch_data['data']['page'],
+        per_page=fetch_data['data']['per_page']
+    ).__dict__
+
+async def get_vacancies_metadata_async(
+    client: httpx.AsyncClient,
+    limiter: AsyncRateLimiter,
+    params: VacancySearchParams,
+) -> Dict[str, Any]:
+    """Асинхронный аналог get_vacancies_metadata.
+
+    Args:
+        client (httpx.AsyncClient): Общий асинхронный HTTP-клиент.
+        limiter (AsyncRateLimiter): Общий ограничитель частоты запросов.
+        params (VacancySearchParams): Параметры поиска вакансий.
+
+    Returns:
+        Dict[str, Any]: Словарь с метаданными и списком вакансий (те же ключи, что у get_vacancies_metadata).
+
+    Raises:
+        httpx.HTTPError: Ошибка при выполнении HTTP-запроса.
+        ValueError: Ошибка декодирования JSON-ответа.
+    """
+    fetch_data = await fetch_vacancies_data_async(client, limiter, params=params)
+    logger.info(f"get_vacancies_metadata_async URL: {fetch_data['url']}")
+    return _to_metadata(fetch_data)
+
 if __name__ == "__main__":
     try:
         # Пример 1: Получение вакансий с параметрами по умолчанию
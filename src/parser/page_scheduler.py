@@ -0,0 +1,127 @@
+"""Планировщик запросов страниц поиска: общий лимит частоты, ограничение параллелизма и справедливая очередь."""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Tuple
+
+import httpx
+from src.models.vacancy_search_params import VacancySearchParams
+from src.parser.get_vacancies_metadata import get_vacancies_metadata_async
+from src.utils.main_logger import setup_logger
+from src.utils.rate_limiter import AsyncRateLimiter
+
+logger = setup_logger(__name__)
+
+Job = Tuple[Callable[[], Awaitable[Any]], asyncio.Future]
+
+
+class PageScheduler:
+    """
+    Выполняет запросы к API пулом из max_in_flight воркеров.
+
+    Задания группируются по ключу (например, (area, professional_role)), и воркеры
+    выбирают очереди по кругу. Поэтому большая категория с сотнями страниц не
+    вытесняет маленькие: каждая очередь получает свою долю слотов, а общий темп
+    запросов ограничивает только AsyncRateLimiter, без фиксированных пауз.
+
+    Attributes:
+        client (httpx.AsyncClient): Общий асинхронный HTTP-клиент.
+        limiter (AsyncRateLimiter): Общий ограничитель частоты запросов.
+        max_in_flight (int): Максимум одновременно выполняемых запросов.
+        completed (int): Количество выполненных заданий.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, limiter: AsyncRateLimiter, max_in_flight: int = 8):
+        self.client = client
+        self.limiter = limiter
+        self.max_in_flight = max(1, max_in_flight)
+        self.completed = 0
+        self._queues: Dict[Hashable, Deque[Job]] = {}
+        self._order: Deque[Hashable] = deque()
+        self._ready = asyncio.Condition()
+        self._workers: List[asyncio.Task] = []
+        self._closed = False
+
+    async def __aenter__(self):
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_in_flight)]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        # Задания, которые не успел взять ни один воркер, отменяются
+        async with self._ready:
+            while (job := self._next_job()) is not None:
+                job[1].cancel()
+
+    async def submit(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ставит задание в очередь ключа и ждёт его результата.
+
+        Args:
+            key (Hashable): Ключ справедливой очереди.
+            factory (Callable): Функция, создающая корутину запроса.
+
+        Returns:
+            Any: Результат корутины (исключение пробрасывается вызывающему).
+        """
+        future = asyncio.get_running_loop().create_future()
+        async with self._ready:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = deque()
+                self._order.append(key)
+            queue.append((factory, future))
+            self._ready.notify()
+        return await future
+
+    async def fetch_metadata(self, params: VacancySearchParams) -> Dict[str, Any]:
+        """Запрашивает страницу поиска через очередь (area, professional_role)"""
+        return await self.submit(
+            (params.area, params.professional_role),
+            lambda: get_vacancies_metadata_async(self.client, self.limiter, params),
+        )
+
+    def _next_job(self) -> Job | None:
+        """Берёт задание из следующей по кругу непустой очереди"""
+        while self._order:
+            key = self._order.popleft()
+            queue = self._queues[key]
+            job = queue.popleft()
+            if queue:
+                self._order.append(key)
+            else:
+                del self._queues[key]
+            return job
+        return None
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._ready:
+                job = self._next_job()
+                while job is None:
+                    if self._closed:
+                        return
+                    await self._ready.wait()
+                    job = self._next_job()
+
+            factory, future = job
+            try:
+                result = await factory()
+            except Exception as err:
+                if not future.done():
+                    future.set_exception(err)
+            except BaseException as err:
+                # Отмена или аварийное завершение воркера: ожидающий submit() не должен зависнуть
+                if not future.done():
+                    if isinstance(err, asyncio.CancelledError):
+                        future.cancel()
+                    else:
+                        future.set_exception(err)
+                raise
+            else:
+                if not future.done():
+                    future.set_result(result)
+            self.completed += 1
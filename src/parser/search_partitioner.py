@@ -0,0 +1,177 @@
+"""Разбиение поискового запроса на подзапросы, чтобы обойти лимит выдачи API hh.ru в 2000 вакансий."""
+
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+from src.database.checkpoint import CrawlCheckpoint
+from src.models.vacancy_search_params import VacancySearchParams
+from src.parser.page_scheduler import PageScheduler
+from src.utils.main_logger import setup_logger
+from src.utils.rate_limiter import AsyncRateLimiter
+
+logger = setup_logger(__name__)
+
+# API hh.ru не отдаёт больше 2000 результатов на один запрос (per_page * page < 2000)
+SEARCH_RESULTS_CAP = 2000
+# Окно дат, меньше которого запрос по времени не делится
+MIN_WINDOW = timedelta(minutes=1)
+AREAS_URL = 'https://api.hh.ru/areas'
+
+# Лист разбиения: параметры запроса и уже полученная первая страница
+Leaf = Tuple[VacancySearchParams, Dict[str, Any]]
+
+
+def _parse_bound(value: str, end_of_day: bool) -> datetime:
+    """
+    Преобразует date_from/date_to в datetime.
+
+    Дата без времени ('YYYY-MM-DD') трактуется как начало дня для date_from
+    и как конец дня для date_to.
+    """
+    if len(value) == 10:
+        day = datetime.strptime(value, '%Y-%m-%d')
+        return day + timedelta(days=1, seconds=-1) if end_of_day else day
+    return datetime.fromisoformat(value)
+
+
+def page_key(params: VacancySearchParams, page: int) -> str:
+    """Ключ страницы листа для журнала контрольных точек"""
+    return f"{params.area}:{params.professional_role}:{params.date_from}:{params.date_to}:{page}"
+
+
+def split_by_date(params: VacancySearchParams) -> List[VacancySearchParams] | None:
+    """
+    Делит окно дат запроса пополам.
+
+    Args:
+        params (VacancySearchParams): Параметры запроса.
+
+    Returns:
+        List[VacancySearchParams] | None: Два подзапроса или None, если окно уже минимальное.
+    """
+    start = _parse_bound(params.date_from, end_of_day=False)
+    end = _parse_bound(params.date_to, end_of_day=True)
+    if end - start <= MIN_WINDOW:
+        return None
+
+    middle = start + (end - start) / 2
+    middle = middle.replace(microsecond=0)
+    return [
+        replace(params, page=0, date_from=start.isoformat(timespec='seconds'),
+                date_to=middle.isoformat(timespec='seconds')),
+        replace(params, page=0, date_from=(middle + timedelta(seconds=1)).isoformat(timespec='seconds'),
+                date_to=end.isoformat(timespec='seconds')),
+    ]
+
+
+async def get_sub_areas(client: httpx.AsyncClient, limiter: AsyncRateLimiter, area: int) -> List[int]:
+    """
+    Возвращает ID дочерних регионов (например, областей страны).
+
+    Args:
+        client (httpx.AsyncClient): Асинхронный HTTP-клиент.
+        limiter (AsyncRateLimiter): Общий ограничитель частоты запросов.
+        area (int): ID региона.
+
+    Returns:
+        List[int]: ID дочерних регионов (пустой список, если их нет или запрос не удался).
+    """
+    await limiter.acquire()
+    try:
+        response = await client.get(f'{AREAS_URL}/{area}')
+        response.raise_for_status()
+        return [int(child['id']) for child in response.json().get('areas', [])]
+    except (httpx.HTTPError, ValueError) as err:
+        logger.error(f"Не удалось получить дочерние регионы {area}: {err}")
+        return []
+
+
+async def partition_search(scheduler: PageScheduler, params: VacancySearchParams) -> List[Leaf]:
+    """
+    Рекурсивно делит запрос, пока каждый подзапрос не станет меньше лимита выдачи.
+
+    Сначала делится окно дат (пополам, до MIN_WINDOW), затем — регион на дочерние
+    регионы. Первая страница каждого листа возвращается вместе с параметрами,
+    чтобы не запрашивать её повторно. Подзапросы одного уровня выполняются конкурентно.
+
+    Args:
+        scheduler (PageScheduler): Планировщик запросов с общим лимитом.
+        params (VacancySearchParams): Исходные параметры поиска.
+
+    Returns:
+        List[Leaf]: Список листьев (параметры, метаданные первой страницы).
+    """
+    params = replace(params, page=0)
+    metadata = await scheduler.fetch_metadata(params)
+    if metadata['found'] <= SEARCH_RESULTS_CAP:
+        return [(params, metadata)]
+
+    children = split_by_date(params)
+    if children is None:
+        children = [replace(params, area=area)
+                    for area in await get_sub_areas(scheduler.client, scheduler.limiter, params.area)]
+    if not children:
+        logger.warning(
+            f"Запрос не удалось разбить: найдено {metadata['found']}, будет получено не более "
+            f"{SEARCH_RESULTS_CAP} (area={params.area}, role={params.professional_role}, "
+            f"{params.date_from}..{params.date_to})"
+        )
+        return [(params, metadata)]
+
+    logger.info(f"Найдено {metadata['found']} > {SEARCH_RESULTS_CAP}, делим запрос на {len(children)} части")
+    results = await asyncio.gather(*(partition_search(scheduler, child) for child in children))
+    return [leaf for leaves in results for leaf in leaves]
+
+
+async def collect_partitioned(
+    scheduler: PageScheduler,
+    params: VacancySearchParams,
+    on_items: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+    checkpoint: CrawlCheckpoint | None = None,
+) -> int:
+    """
+    Собирает все вакансии по запросу: разбивает его на листья и обходит их страницы конкурентно.
+
+    Параллелизм и темп запросов задаёт планировщик, поэтому страницы разных
+    запросов (категорий, стран) перемежаются в общей очереди.
+
+    Args:
+        scheduler (PageScheduler): Планировщик запросов с общим лимитом.
+        params (VacancySearchParams): Исходные параметры поиска.
+        on_items (Callable): Асинхронный обработчик списка вакансий одной страницы;
+            пока он не завершится, следующая страница этого листа не обрабатывается.
+        checkpoint (CrawlCheckpoint | None): Журнал обработанных страниц; уже обработанные
+            в прерванном запуске страницы пропускаются.
+
+    Returns:
+        int: Суммарное количество найденных вакансий по всем листьям.
+
+    Raises:
+        httpx.HTTPError: Если страницу не удалось получить после всех повторов.
+    """
+    leaves = await partition_search(scheduler, params)
+
+    async def handle_page(leaf_params: VacancySearchParams, page: int, metadata: Dict[str, Any]) -> None:
+        await on_items(metadata['vacancies'])
+        if checkpoint is not None:
+            checkpoint.mark_done('page', page_key(leaf_params, page))
+
+    async def fetch_page(leaf_params: VacancySearchParams, page: int) -> None:
+        metadata = await scheduler.fetch_metadata(replace(leaf_params, page=page))
+        await handle_page(leaf_params, page, metadata)
+
+    def is_done(leaf_params: VacancySearchParams, page: int) -> bool:
+        return checkpoint is not None and checkpoint.is_done('page', page_key(leaf_params, page))
+
+    tasks = []
+    for leaf_params, first_page in leaves:
+        if not is_done(leaf_params, 0):
+            await handle_page(leaf_params, 0, first_page)
+        tasks.extend(fetch_page(leaf_params, page) for page in range(1, first_page['pages'])
+                     if not is_done(leaf_params, page))
+    await asyncio.gather(*tasks)
+
+    return sum(first_page['found'] for _, first_page in leaves)
@@ -3,8 +3,8 @@ from src.parser.category_manager import parser_links
 from src.utils.main_logger import setup_logger
 logger = setup_logger(__name__)
 
-def parser():
-    parser_links()
+def parser(incremental: bool = False):
+    parser_links(incremental=incremental)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,14 @@
 """Модуль для работы с API hh.ru: получение данных о вакансиях с обработкой ошибок и повторными попытками."""
 
-import requests
+import asyncio
+import httpx
 import time
 import random
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from urllib3.util.ssl_ import create_urllib3_context
 from typing import Dict, Any, Optional
 from src.models.vacancy_search_params import VacancySearchParams
+from src.utils.http_client import get_client
+from src.utils.json_decoder import decode_search_page
+from src.utils.rate_limiter import AsyncRateLimiter
 from dotenv import load_dotenv
 import os
 
@@ -26,40 +27,8 @@ USER_AGENTS = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
 ]
 
-def create_session() -> requests.Session:
-    """Создаёт HTTP-сессию с настройками повторных попыток и современным TLS 1.2.
-
-    Features:
-        - Автоматическое повторение запросов при временных ошибках (5xx, 429).
-        - Современный TLS 1.2 для совместимости с серверами.
-        - Повторное использование соединений для повышения производительности.
-
-    Returns:
-        requests.Session: Настроенная HTTP-сессия.
-    """
-    session = requests.Session()
-
-    # Настройка стратегии повторных попыток:
-    # - 3 попытки по умолчанию
-    # - Экспоненциальная задержка (1s, 2s, 4s, ...)
-    # - Повтор при статусах 429, 500, 502, 503, 504
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-    )
-
-    # Кастомный адаптер для настройки TLS 1.2
-    class TLSAdapter(HTTPAdapter):
-        def init_poolmanager(self, *args, **kwargs):
-            context = create_urllib3_context(ssl_version="TLSv1_2")
-            kwargs["ssl_context"] = context
-            return super().init_poolmanager(*args, **kwargs)
-
-    adapter = TLSAdapter()
-    session.mount("https://", adapter)
-    session.mount("https://", HTTPAdapter(max_retries=retry_strategy))
-    return session
+# Статусы, при которых запрос повторяется с экспоненциальной задержкой
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 def fetch_vacancies_data(
     url: str = URL,
@@ -67,6 +36,7 @@ def fetch_vacancies_data(
     timeout: int = 10,
     retry_on_403: bool = True,
     max_retries_on_403: int = 2,
+    max_retries: int = 3,
 ) -> Dict[str, Any] | None:
     """Выполняет GET-запрос к API hh.ru с обработкой ошибок и повторными попытками.
 
@@ -76,15 +46,16 @@ def fetch_vacancies_data(
         timeout (int): Таймаут запроса в секундах. По умолчанию: 10.
         retry_on_403 (bool): Повторять запрос при ошибке 403 Forbidden. По умолчанию: True.
         max_retries_on_403 (int): Макс. количество повторов при 403. По умолчанию: 2.
+        max_retries (int): Макс. количество повторов при 429 и 5xx. По умолчанию: 3.
 
     Returns:
         Dict[str, Any]: Словарь с данными вакансий, включая:
             - items (List[Dict]): Список вакансий.
-            - data (Dict): Полный ответ API.
+            - data (Dict): Ответ API (с msgspec — только используемые поля, см. json_decoder).
             - url (str): Финальный URL запроса.
 
     Raises:
-        requests.exceptions.RequestException: Если все попытки завершились ошибкой.
+        httpx.HTTPError: Если все попытки завершились ошибкой.
         ValueError: Если ответ не является корректным JSON.
 
     Examples:
@@ -96,30 +67,39 @@ def fetch_vacancies_data(
         >>> # Получение одной вакансии по ID
         >>> vacancy = fetch_vacancies_data(url="https://api.hh.ru/vacancies/123456")
     """
-    session = create_session()
+    client = get_client()  # Общий пул соединений процесса
     headers = {
         "User-Agent": random.choice(USER_AGENTS),  # Ротация User-Agent
         "Referer": "https://hh.ru",  # Имитация перехода с сайта hh.ru
     }
     request_params = params.__dict__ if params else {}
 
-    for attempt in range(max_retries_on_403 + 1):  # +1 для первой попытки
+    retries_on_403 = 0
+    retries = 0
+    while True:
         try:
-            logger.info(f"Попытка {attempt + 1}/{max_retries_on_403 + 1}: {request_params}")
-            response = session.get(url, params=request_params, headers=headers, timeout=timeout)
+            logger.info(f"Попытка {retries_on_403 + retries + 1}: {request_params}")
+            response = client.get(url, params=request_params, headers=headers, timeout=timeout)
             logger.info(f"Сформированный URL: {response.url}")
 
             # Обработка 403 Forbidden
-            if response.status_code == 403 and retry_on_403:
-                logger.warning(f"403 Forbidden. Попытка {attempt + 1}/{max_retries_on_403 + 1}")
-                if attempt < max_retries_on_403:
-                    time.sleep(2 ** attempt)  # Экспоненциальная задержка: 1s, 2s, 4s, ...
-                    continue
-                else:
-                    response.raise_for_status()  # Выбросить ошибку, если превышено количество попыток
+            if response.status_code == 403 and retry_on_403 and retries_on_403 < max_retries_on_403:
+                logger.warning(f"403 Forbidden. Попытка {retries_on_403 + 1}/{max_retries_on_403 + 1}")
+                time.sleep(2 ** retries_on_403)  # Экспоненциальная задержка: 1s, 2s, 4s, ...
+                retries_on_403 += 1
+                continue
+
+            # Временные ошибки сервера и превышение лимита запросов
+            if response.status_code in RETRY_STATUSES and retries < max_retries:
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else float(2 ** retries)
+                logger.warning(f"HTTP {response.status_code}. Повтор через {delay:.0f} сек")
+                time.sleep(delay)
+                retries += 1
+                continue
 
             response.raise_for_status()  # Выбросить ошибку для других статусов (4xx, 5xx)
-            response_data = response.json()
+            response_data = decode_search_page(response.content)
 
             vacancies_count = len(response_data.get('items', []))
             logger.debug(f"Получено {vacancies_count} вакансий")
@@ -127,14 +107,106 @@ def fetch_vacancies_data(
             return {
                 'items': response_data.get('items', []),
                 'data': response_data,
-                'url': response.url
+                'url': str(response.url)
             }
 
-        except requests.exceptions.SSLError as err:
-            logger.error(f"SSL Error: {err}. Проверьте настройки TLS и системное время.")
+        except httpx.TransportError as err:
+            if retries < max_retries:
+                logger.warning(f"Сетевая ошибка ({type(err).__name__}). Повтор через {2 ** retries} сек")
+                time.sleep(2 ** retries)
+                retries += 1
+                continue
+            logger.error(f"Ошибка при выполнении запроса: {err}")
+            raise
+
+        except httpx.HTTPError as err:
+            logger.error(f"Ошибка при выполнении запроса: {err}")
+            raise
+
+        except ValueError as err:
+            logger.error(f"Ошибка декодирования JSON: {err}")
+            raise
+
+async def fetch_vacancies_data_async(
+    client: httpx.AsyncClient,
+    limiter: AsyncRateLimiter,
+    params: Optional[VacancySearchParams] = None,
+    url: str = URL,
+    retry_on_403: bool = True,
+    max_retries_on_403: int = 2,
+    max_retries: int = 3,
+) -> Dict[str, Any]:
+    """Асинхронный аналог fetch_vacancies_data для конкурентного обхода страниц поиска.
+
+    Перед каждой попыткой забирает токен из общего AsyncRateLimiter; при 429
+    приостанавливает весь лимитер на Retry-After.
+
+    Args:
+        client (httpx.AsyncClient): Общий асинхронный HTTP-клиент.
+        limiter (AsyncRateLimiter): Общий ограничитель частоты запросов.
+        params (Optional[VacancySearchParams]): Параметры запроса.
+        url (str): URL API. По умолчанию берётся из переменной окружения `URL`.
+        retry_on_403 (bool): Повторять запрос при ошибке 403 Forbidden. По умолчанию: True.
+        max_retries_on_403 (int): Макс. количество повторов при 403. По умолчанию: 2.
+        max_retries (int): Макс. количество повторов при 429, 5xx и сетевых ошибках. По умолчанию: 3.
+
+    Returns:
+        Dict[str, Any]: Словарь с ключами items, data и url, как у fetch_vacancies_data.
+
+    Raises:
+        httpx.HTTPError: Если все попытки завершились ошибкой.
+        ValueError: Если ответ не является корректным JSON.
+    """
+    headers = {
+        "User-Agent": random.choice(USER_AGENTS),  # Ротация User-Agent
+        "Referer": "https://hh.ru",  # Имитация перехода с сайта hh.ru
+    }
+    request_params = params.__dict__ if params else {}
+
+    retries_on_403 = 0
+    retries = 0
+    while True:
+        await limiter.acquire()
+        try:
+            response = await client.get(url, params=request_params, headers=headers)
+            logger.info(f"Сформированный URL: {response.url}")
+
+            if response.status_code == 403 and retry_on_403 and retries_on_403 < max_retries_on_403:
+                logger.warning(f"403 Forbidden. Попытка {retries_on_403 + 1}/{max_retries_on_403 + 1}")
+                await asyncio.sleep(2 ** retries_on_403)
+                retries_on_403 += 1
+                continue
+
+            if response.status_code in RETRY_STATUSES and retries < max_retries:
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else float(2 ** retries)
+                logger.warning(f"HTTP {response.status_code}. Повтор через {delay:.0f} сек")
+                if response.status_code == 429:
+                    limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                retries += 1
+                continue
+
+            response.raise_for_status()
+            response_data = decode_search_page(response.content)
+
+            return {
+                'items': response_data.get('items', []),
+                'data': response_data,
+                'url': str(response.url)
+            }
+
+        except httpx.TransportError as err:
+            if retries < max_retries:
+                logger.warning(f"Сетевая ошибка ({type(err).__name__}). Повтор через {2 ** retries} сек")
+                await asyncio.sleep(2 ** retries)
+                retries += 1
+                continue
+            logger.error(f"Ошибка при выполнении запроса: {err}")
             raise
 
-        except requests.exceptions.RequestException as err:
+        except httpx.HTTPError as err:
             logger.error(f"Ошибка при выполнении запроса: {err}")
             raise
 
@@ -167,7 +239,7 @@ def fetch_page_data(
     params = VacancySearchParams(area=country, professional_role=category, page=page)
     try:
         return fetch_vacancies_data(params=params)
-    except requests.exceptions.RequestException as err:
+    except httpx.HTTPError as err:
         logger.error(f"Ошибка на странице {page}: {err}")
         return None
 
@@ -0,0 +1,215 @@
+"""Общий транспортный слой HTTP: долгоживущий пул соединений и статистика их переиспользования."""
+
+import atexit
+import importlib.util
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+load_dotenv()
+
+# Настройки пула соединений (переопределяются через .env)
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', 10))
+HTTP_MAX_KEEPALIVE = int(os.getenv('HTTP_MAX_KEEPALIVE', 10))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', 60.0))
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 15.0))
+# HTTP/2 включается, только если установлен пакет h2 (pip install httpx[http2])
+HTTP2_ENABLED = os.getenv('HTTP2', '1') == '1' and importlib.util.find_spec('h2') is not None
+
+
+class TransportStats:
+    """
+    Счётчики переиспользования соединений, собираемые через trace-хуки httpcore.
+
+    Новое TCP-соединение фиксируется событием connection.connect_tcp, TLS-рукопожатие —
+    событием connection.start_tls. Запрос, для которого этих событий не было,
+    ушёл по уже открытому keep-alive соединению.
+
+    Атрибуты:
+        requests (int): Количество отправленных запросов.
+        new_connections (int): Количество открытых TCP-соединений.
+        tls_handshakes (int): Количество TLS-рукопожатий.
+        connect_time (float): Суммарное время установки TCP-соединений, сек.
+        tls_time (float): Суммарное время TLS-рукопожатий, сек.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.new_connections = 0
+        self.tls_handshakes = 0
+        self.connect_time = 0.0
+        self.tls_time = 0.0
+        self._lock = threading.Lock()
+
+    def _on_event(self, event_name: str, started: Dict[str, float]) -> None:
+        """Обрабатывает одно trace-событие httpcore.
+
+        Args:
+            event_name (str): Имя события.
+            started (Dict[str, float]): Отметки начала этапов текущего запроса.
+        """
+        now = time.perf_counter()
+        if event_name == 'connection.connect_tcp.started':
+            started['tcp'] = now
+        elif event_name == 'connection.connect_tcp.complete':
+            with self._lock:
+                self.new_connections += 1
+                self.connect_time += now - started.pop('tcp', now)
+        elif event_name == 'connection.start_tls.started':
+            started['tls'] = now
+        elif event_name == 'connection.start_tls.complete':
+            with self._lock:
+                self.tls_handshakes += 1
+                self.tls_time += now - started.pop('tls', now)
+        elif event_name.endswith('send_request_headers.started'):
+            with self._lock:
+                self.requests += 1
+
+    # Отметки начала этапов хранятся в замыкании колбэка отдельного запроса: в AsyncClient
+    # все соединения обслуживает один поток, и общие отметки перезаписывали бы друг друга
+    def request_trace(self) -> Callable[[str, Dict[str, Any]], None]:
+        """Возвращает trace-колбэк для одного запроса синхронного клиента."""
+        started: Dict[str, float] = {}
+
+        def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._on_event(event_name, started)
+
+        return trace
+
+    def request_atrace(self) -> Callable[[str, Dict[str, Any]], Awaitable[None]]:
+        """Возвращает trace-колбэк для одного запроса асинхронного клиента."""
+        started: Dict[str, float] = {}
+
+        async def atrace(event_name: str, info: Dict[str, Any]) -> None:
+            self._on_event(event_name, started)
+
+        return atrace
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Возвращает снимок статистики в виде словаря."""
+        with self._lock:
+            reused = max(self.requests - self.new_connections, 0)
+            return {
+                'requests': self.requests,
+                'new_connections': self.new_connections,
+                'reused_connections': reused,
+                'reuse_ratio': reused / self.requests if self.requests else 0.0,
+                'tls_handshakes': self.tls_handshakes,
+                'connect_time': self.connect_time,
+                'tls_time': self.tls_time,
+            }
+
+
+transport_stats = TransportStats()
+
+
+class _TracingTransport(httpx.HTTPTransport):
+    """Синхронный транспорт, добавляющий trace-колбэк статистики к каждому запросу."""
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions['trace'] = transport_stats.request_trace()
+        return super().handle_request(request)
+
+
+class _AsyncTracingTransport(httpx.AsyncHTTPTransport):
+    """Асинхронный транспорт, добавляющий trace-колбэк статистики к каждому запросу."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions['trace'] = transport_stats.request_atrace()
+        return await super().handle_async_request(request)
+
+
+def _pool_limits(max_connections: Optional[int] = None, max_keepalive: Optional[int] = None) -> httpx.Limits:
+    """Формирует лимиты пула соединений из аргументов или настроек по умолчанию."""
+    return httpx.Limits(
+        max_connections=max_connections or HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=max_keepalive or HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """
+    Возвращает общий для процесса синхронный httpx.Client.
+
+    Клиент создаётся при первом обращении и живёт до завершения процесса,
+    поэтому TCP/TLS-соединения переиспользуются между запросами и модулями.
+
+    Returns:
+        httpx.Client: Общий HTTP-клиент с пулом соединений.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                limits = _pool_limits()
+                _client = httpx.Client(
+                    timeout=HTTP_TIMEOUT,
+                    follow_redirects=True,
+                    transport=_TracingTransport(http2=HTTP2_ENABLED, limits=limits, retries=1),
+                )
+                logger.info(f"Создан общий HTTP-клиент (http2={HTTP2_ENABLED}, limits={limits})")
+    return _client
+
+
+def create_async_client(
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+) -> httpx.AsyncClient:
+    """
+    Создаёт асинхронный клиент с теми же настройками пула и сбором статистики.
+
+    Асинхронный клиент привязан к event loop, поэтому он создаётся на время
+    одного запуска цикла и должен закрываться вызывающим кодом (async with).
+
+    Args:
+        max_connections (Optional[int]): Максимум соединений в пуле.
+        max_keepalive (Optional[int]): Максимум keep-alive соединений.
+
+    Returns:
+        httpx.AsyncClient: Асинхронный HTTP-клиент.
+    """
+    limits = _pool_limits(max_connections, max_keepalive)
+    return httpx.AsyncClient(
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+        transport=_AsyncTracingTransport(http2=HTTP2_ENABLED, limits=limits, retries=1),
+    )
+
+
+def get_transport_stats() -> Dict[str, Any]:
+    """Возвращает статистику переиспользования соединений за время работы процесса."""
+    return transport_stats.as_dict()
+
+
+def format_transport_stats() -> str:
+    """Формирует краткий текстовый отчёт о переиспользовании соединений."""
+    stats = get_transport_stats()
+    return (
+        f"HTTP запросов: {stats['requests']}, "
+        f"новых соединений: {stats['new_connections']}, "
+        f"переиспользовано: {stats['reuse_ratio'] * 100:.1f}%\n"
+        f"Время на TCP: {stats['connect_time']:.1f} сек, "
+        f"на TLS ({stats['tls_handshakes']}): {stats['tls_time']:.1f} сек"
+    )
+
+
+@atexit.register
+def close_client() -> None:
+    """Закрывает общий клиент и логирует итоговую статистику соединений."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+        logger.info(format_transport_stats())
@@ -0,0 +1,157 @@
+"""Декодирование JSON-ответов API hh.ru: только нужные поля, с ускорением через msgspec или orjson.
+
+Если установлен msgspec (pip install msgspec), ответы по вакансии и страницы
+поиска декодируются по схемам Struct: поля, которые проект не использует
+(брендинг, контакты, тесты, фото и т. п.), пропускаются парсером без создания
+объектов. Без msgspec используется orjson, а без него — стандартный json.
+Результат во всех случаях — обычные словари с теми же ключами, что в ответе API.
+"""
+
+import json
+from typing import Any
+
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Библиотека, которой декодируются ответы (для логов и бенчмарков)
+JSON_BACKEND = 'msgspec' if msgspec is not None else 'orjson' if orjson is not None else 'json'
+
+
+def decode_json(content: bytes | str) -> Any:
+    """
+    Декодирует JSON целиком быстрейшей из доступных библиотек.
+
+    Raises:
+        ValueError: Если тело ответа не является корректным JSON (ошибки
+            msgspec и orjson приводятся к ValueError).
+    """
+    try:
+        if msgspec is not None:
+            return msgspec.json.decode(content)
+        if orjson is not None:
+            return orjson.loads(content)
+    except ValueError as err:
+        raise ValueError(f"Некорректный JSON: {err}") from err
+    return json.loads(content)
+
+
+if msgspec is not None:
+    class _Named(msgspec.Struct):
+        """Справочное значение API: {"id": ..., "name": ...}"""
+        name: str | None = None
+
+    class _Address(msgspec.Struct):
+        raw: str | None = None
+
+    class _SalaryRange(msgspec.Struct):
+        from_: int | float | None = msgspec.field(name='from', default=None)
+        to: int | float | None = None
+        currency: str | None = None
+        mode: _Named | None = None
+        frequency: _Named | None = None
+
+    class _Employer(msgspec.Struct):
+        id: str | None = None
+        name: str | None = None
+        url: str | None = None
+        vacancies_url: str | None = None
+        accredited_it_employer: bool = False
+
+    class _VacancyDetail(msgspec.Struct):
+        """Поля ответа /vacancies/{id}, которые читает VacancyData.from_api"""
+        id: str
+        name: str | None = None
+        description: str | None = None
+        key_skills: list[_Named] = []
+        area: _Named | None = None
+        address: _Address | None = None
+        salary_range: _SalaryRange | None = None
+        experience: _Named | None = None
+        schedule: _Named | None = None
+        employment: _Named | None = None
+        professional_roles: list[_Named] = []
+        employer: _Employer | None = None
+        published_at: str | None = None
+        created_at: str | None = None
+        archived: bool = False
+
+    class _SearchItem(msgspec.Struct):
+        id: str
+        name: str | None = None
+        url: str | None = None
+        alternate_url: str | None = None
+        published_at: str | None = None
+        created_at: str | None = None
+        archived: bool = False
+
+    class _SearchPage(msgspec.Struct):
+        """Страница выдачи /vacancies; items обязателен, чтобы не принять за нее другой ответ"""
+        items: list[_SearchItem]
+        found: int = 0
+        pages: int = 0
+        page: int = 0
+        per_page: int = 0
+
+    _vacancy_decoder = msgspec.json.Decoder(_VacancyDetail)
+    _search_page_decoder = msgspec.json.Decoder(_SearchPage)
+
+
+def _decode_typed(decoder, content: bytes | str, kind: str) -> Any:
+    """Декодирует по схеме; ответ, не подходящий под схему, декодируется целиком"""
+    try:
+        return msgspec.to_builtins(decoder.decode(content))
+    except msgspec.ValidationError as err:
+        logger.debug(f"Ответ не соответствует схеме {kind} ({err}), декодируем целиком")
+        return decode_json(content)
+    except msgspec.DecodeError as err:
+        raise ValueError(f"Некорректный JSON в ответе {kind}: {err}") from err
+
+
+def decode_vacancy(content: bytes | str) -> dict[str, Any]:
+    """
+    Декодирует ответ API по вакансии (/vacancies/{id}).
+
+    Args:
+        content (bytes | str): Тело ответа.
+
+    Returns:
+        dict[str, Any]: Данные вакансии (с msgspec — только поля, нужные для VacancyData.from_api).
+
+    Raises:
+        ValueError: Если тело ответа не является корректным JSON
+            (msgspec.DecodeError перевыбрасывается как ValueError).
+    """
+    if msgspec is None:
+        return decode_json(content)
+    return _decode_typed(_vacancy_decoder, content, 'вакансии')
+
+
+def decode_search_page(content: bytes | str) -> dict[str, Any]:
+    """
+    Декодирует страницу выдачи поиска (/vacancies?...).
+
+    Args:
+        content (bytes | str): Тело ответа.
+
+    Returns:
+        dict[str, Any]: Страница с ключами items, found, pages, page, per_page
+            (с msgspec в items — только идентификаторы, ссылки и даты вакансий).
+
+    Raises:
+        ValueError: Если тело ответа не является корректным JSON
+            (msgspec.DecodeError перевыбрасывается как ValueError).
+    """
+    if msgspec is None:
+        return decode_json(content)
+    return _decode_typed(_search_page_decoder, content, 'страницы поиска')
@@ -0,0 +1,83 @@
+"""Асинхронный ограничитель частоты запросов на основе алгоритма token bucket."""
+
+import asyncio
+import time
+from src.utils.main_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class AsyncRateLimiter:
+    """
+    Общий для всех корутин ограничитель частоты запросов (token bucket).
+
+    Токены пополняются равномерно со скоростью calls_per_minute / 60 в секунду,
+    в "ведре" может накопиться не больше burst токенов. Каждый запрос забирает
+    один токен; если токенов нет — корутина ждёт ровно столько, сколько нужно
+    до появления следующего, вместо фиксированной паузы после каждого запроса.
+
+    Атрибуты:
+        rate (float): Скорость пополнения токенов в секунду.
+        burst (int): Максимальное количество токенов (запросы без ожидания в начале).
+        tokens (float): Текущее количество токенов.
+        request_counter (int): Счетчик выданных токенов.
+    """
+
+    def __init__(self, calls_per_minute: int = 80, burst: int = 3) -> None:
+        """
+        Args:
+            calls_per_minute (int): Количество запросов в минуту. По умолчанию 80.
+            burst (int): Размер "ведра" — сколько запросов можно выполнить подряд. По умолчанию 3.
+        """
+        self.rate = calls_per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.request_counter = 0
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Пополняет ведро токенами за время, прошедшее с прошлого пополнения."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        """
+        Забирает один токен, при необходимости ожидая его появления.
+
+        Ожидание происходит под блокировкой, поэтому корутины получают токены
+        строго в порядке очереди (asyncio.Lock — FIFO).
+        """
+        async with self._lock:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.request_counter += 1
+                    return
+
+                sleep_time = (1 - self.tokens) / self.rate
+                logger.debug(f"Задержка {sleep_time:.2f} сек перед запросом {self.request_counter + 1}")
+                await asyncio.sleep(sleep_time)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Приостанавливает выдачу токенов для всех корутин (например, после 429).
+
+        Args:
+            seconds (float): Длительность паузы в секундах.
+        """
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            # После паузы не даём сразу выстрелить всем накопленным токенам
+            self.tokens = 0.0
+            self._last_refill = until
+            logger.warning(f"Выдача запросов приостановлена на {seconds:.1f} сек")
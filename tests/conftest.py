@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+
+from src.database import db_manager
+from src.database.db_manager import prepare_vacancy, write_vacancies
+from src.models.vacancy_data import VacancyData
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Пустая база вакансий со всеми миграциями во временном каталоге"""
+    path = str(tmp_path / 'vacancies.db')
+    monkeypatch.setattr(db_manager, 'DB_PATH', path)
+    db_manager.initialize_database()
+    return path
+
+
+@pytest.fixture
+def db(db_path):
+    """Подключение к базе из фикстуры db_path"""
+    conn = sqlite3.connect(db_path)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def store():
+    """Записывает вакансии через write_vacancies так же, как VacancyWriter; возвращает число изменений.
+
+    С updated_at проставляет записанным вакансиям это время обновления.
+    """
+    def write(conn: sqlite3.Connection, *vacancies: VacancyData, updated_at: str | None = None) -> int:
+        prepared = [prepare_vacancy(item) for item in vacancies]
+        with conn:
+            changed = write_vacancies(
+                conn,
+                [item.row for item in prepared],
+                [item.company for item in prepared if item.company],
+                {item.row[0]: list(item.skills) for item in prepared},
+                {item.row[-2]: item.description_body for item in prepared if item.description_body},
+            )
+            if updated_at is not None:
+                conn.executemany('UPDATE vacancies SET updated_at = ? WHERE id = ?;',
+                                 [(updated_at, item.id) for item in vacancies])
+        return changed
+
+    return write
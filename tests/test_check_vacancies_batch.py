@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+import check_vacancy_status_script as script
+from check_vacancy_status_script import CheckSummary, ProxyConfig, check_vacancies_batch
+
+PROXIES = [ProxyConfig(host='10.0.0.1', port=3000), ProxyConfig(host='10.0.0.2', port=3000)]
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.closed: list[str] = []
+        self.active: list[str] = []
+
+    def record_closed(self, vacancy_ids):
+        self.closed.extend(vacancy_ids)
+
+    def record_active(self, vacancy_ids):
+        self.active.extend(vacancy_ids)
+
+
+def result_for(vacancy_id: str):
+    """Последняя цифра ID задает исход: 0 — закрыта, 1 — открыта, 2 — ошибка, 3 — исключение"""
+    kind = int(vacancy_id) % 4
+    if kind == 3:
+        raise RuntimeError('обрыв соединения')
+    return {0: vacancy_id, 1: False, 2: None}[kind]
+
+
+@pytest.fixture
+def checks(monkeypatch):
+    """Подменяет проверку вакансии и запись в базу; возвращает журнал вызовов"""
+    state = {'running': 0, 'peak': 0, 'batches': []}
+
+    async def process_single_vacancy(vacancy_id, proxy_manager):
+        state['running'] += 1
+        state['peak'] = max(state['peak'], state['running'])
+        try:
+            await asyncio.sleep(0.001)
+            return result_for(vacancy_id)
+        finally:
+            state['running'] -= 1
+
+    async def started(vacancy_count):
+        state['started'] = vacancy_count
+
+    monkeypatch.setattr(script, 'process_single_vacancy', process_single_vacancy)
+    monkeypatch.setattr(script, 'send_data_collection_started', started)
+    monkeypatch.setattr(script, 'close_vacancies', lambda ids: state['batches'].append(list(ids)))
+    return state
+
+
+def run(vacancy_ids, **kwargs) -> CheckSummary:
+    return asyncio.run(check_vacancies_batch(vacancy_ids, PROXIES, test_proxies=False, **kwargs))
+
+
+def test_summary_counts_results(checks):
+    seen = {}
+    scheduler = FakeScheduler()
+
+    summary = run([str(i) for i in range(12)], on_result=seen.__setitem__, scheduler=scheduler)
+
+    assert summary == CheckSummary(total=12, closed=3, active=3, errors=6, flushed=6)
+    assert seen['0'] == '0' and seen['1'] is False and seen['2'] is None and seen['3'] is None
+    assert sorted(vacancy_id for batch in checks['batches'] for vacancy_id in batch) == ['0', '4', '8']
+    assert sorted(scheduler.closed) == ['0', '4', '8']
+    assert sorted(scheduler.active) == ['1', '5', '9']
+    assert checks['started'] == 12
+
+
+def test_one_worker_per_proxy(checks):
+    run([str(i) for i in range(20)])
+
+    assert checks['peak'] == len(PROXIES)
+
+
+def test_ids_are_pulled_lazily(checks):
+    pulled = []
+
+    def ids():
+        for i in range(50):
+            pulled.append(i)
+            yield str(i * 4 + 1)  # Все вакансии открыты
+
+    seen = []
+    lag = []
+
+    def on_result(vacancy_id, result):
+        seen.append(vacancy_id)
+        lag.append(len(pulled) - len(seen))
+
+    summary = run(ids(), on_result=on_result, vacancy_count=50)
+
+    assert summary.total == summary.active == 50
+    # Вперед забирается не больше очереди (2 на прокси) и ID в работе у воркеров
+    assert max(lag) <= len(PROXIES) * 2 + len(PROXIES)
+
+
+def test_closed_ids_are_written_in_batches(checks):
+    summary = run([str(i * 4) for i in range(7)], close_batch_size=3)
+
+    assert [len(batch) for batch in checks['batches']] == [3, 3, 1]
+    assert summary.flushed == 7
+
+
+def test_persist_closed_disabled(checks):
+    summary = run(['0', '4'], persist_closed=False)
+
+    assert summary.closed == 2
+    assert checks['batches'] == []
+
+
+def test_failed_write_is_not_counted_as_flushed(checks, monkeypatch):
+    def fail(ids):
+        raise RuntimeError('база заблокирована')
+
+    monkeypatch.setattr(script, 'close_vacancies', fail)
+
+    summary = run(['0', '4', '8'], close_batch_size=2)
+
+    assert (summary.total, summary.closed, summary.flushed) == (3, 3, 0)
+
+
+def test_empty_batch_and_report(checks, monkeypatch):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    monkeypatch.setattr(script, 'send_simple_message', send)
+
+    summary = run([])
+    asyncio.run(script.send_final_report(summary.total, summary.closed, summary.active, summary.errors))
+
+    assert summary == CheckSummary()
+    assert len(messages) == 1
+    assert 'Всего проверено: 0' in messages[0]
+    assert '%' not in messages[0]
+
+
+def test_main_skips_run_without_due_ids(monkeypatch):
+    calls = []
+
+    class EmptyScheduler(FakeScheduler):
+        def due_ids(self):
+            return []
+
+        def close(self):
+            calls.append('close')
+
+    async def unexpected(*args, **kwargs):
+        calls.append('unexpected')
+
+    monkeypatch.setattr(script, 'initialize_database', lambda: None)
+    monkeypatch.setattr(script, 'RecheckScheduler', EmptyScheduler)
+    monkeypatch.setattr(script, 'test_all_proxies', unexpected)
+    monkeypatch.setattr(script, 'send_simple_message', unexpected)
+
+    assert asyncio.run(script.main()) == CheckSummary()
+    assert calls == ['close']
@@ -0,0 +1,79 @@
+from src.database.checkpoint import CrawlCheckpoint
+from src.models.vacancy_search_params import VacancySearchParams
+from src.parser.search_partitioner import page_key
+
+
+def test_marks_survive_restart(db_path):
+    checkpoint = CrawlCheckpoint('crawl:test', db_path=db_path, commit_every=100)
+    checkpoint.mark_done('vacancy', '1')
+    checkpoint.mark_done('vacancy', 2)
+    checkpoint.close()
+
+    resumed = CrawlCheckpoint('crawl:test', db_path=db_path)
+    try:
+        assert resumed.resumed
+        assert resumed.is_done('vacancy', '1')
+        assert resumed.is_done('vacancy', '2')
+        assert not resumed.is_done('vacancy', '3')
+        assert not resumed.is_done('page', '1')
+    finally:
+        resumed.close()
+
+
+def test_uncommitted_marks_are_lost(db_path):
+    checkpoint = CrawlCheckpoint('crawl:test', db_path=db_path, commit_every=100, commit_interval=3600)
+    checkpoint.mark_done('vacancy', '1')
+    checkpoint._conn.close()  # Падение процесса до фиксации
+
+    resumed = CrawlCheckpoint('crawl:test', db_path=db_path)
+    try:
+        assert not resumed.resumed
+    finally:
+        resumed.close()
+
+
+def test_runs_are_isolated(db_path):
+    first = CrawlCheckpoint('crawl:first', db_path=db_path)
+    first.mark_done('vacancy', '1')
+    first.close()
+
+    second = CrawlCheckpoint('crawl:second', db_path=db_path)
+    try:
+        assert not second.resumed
+    finally:
+        second.close()
+
+
+def test_complete_clears_journal(db_path):
+    checkpoint = CrawlCheckpoint('crawl:test', db_path=db_path)
+    checkpoint.mark_done('vacancy', '1')
+    checkpoint.remember('window:113:96', '2026-10-01T10:00:00')
+    checkpoint.complete()
+    checkpoint.close()
+
+    restarted = CrawlCheckpoint('crawl:test', db_path=db_path)
+    try:
+        assert not restarted.resumed
+        assert restarted.remember('window:113:96', '2026-10-02T10:00:00') == '2026-10-02T10:00:00'
+    finally:
+        restarted.close()
+
+
+def test_resume_reuses_search_window(db_path):
+    checkpoint = CrawlCheckpoint('parse:113', db_path=db_path)
+    run_started = checkpoint.remember('window:113:96', '2026-10-01T10:00:00')
+    params = VacancySearchParams(date_from='2026-09-30T10:00:00', date_to=run_started)
+    checkpoint.mark_done('page', page_key(params, 0))
+    checkpoint.commit()
+    checkpoint._conn.close()  # Падение после фиксации первой страницы
+
+    resumed = CrawlCheckpoint('parse:113', db_path=db_path)
+    try:
+        # Перезапуск позже: новое время начала не меняет окно и ключи страниц
+        run_started = resumed.remember('window:113:96', '2026-10-01T12:30:00')
+        params = VacancySearchParams(date_from='2026-09-30T10:00:00', date_to=run_started)
+        assert run_started == '2026-10-01T10:00:00'
+        assert resumed.is_done('page', page_key(params, 0))
+        assert not resumed.is_done('page', page_key(params, 1))
+    finally:
+        resumed.close()
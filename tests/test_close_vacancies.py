@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from src.database import db_manager
+from src.database.db_manager import VacancyWriter, close_vacancies
+from src.models.vacancy_data import VacancyData
+
+
+@pytest.fixture
+def stored(db_path):
+    with VacancyWriter(db_path) as writer:
+        for vacancy_id in ('1', '2', '3'):
+            writer.add(VacancyData(id=vacancy_id, title='Разработчик', description='Описание'))
+
+
+def close_dates(db) -> dict:
+    return dict(db.execute('SELECT id, vacancy_close_date FROM vacancies ORDER BY id;').fetchall())
+
+
+def test_batch_is_closed(db, stored):
+    db.execute("UPDATE vacancies SET updated_at = '2026-01-01T00:00:00';")
+    db.commit()
+
+    assert close_vacancies(['1', '3', '404'], closed_at='2026-10-01T10:00:00') == 2
+
+    assert close_dates(db) == {'1': '2026-10-01T10:00:00', '2': None, '3': '2026-10-01T10:00:00'}
+    updated = dict(db.execute('SELECT id, updated_at FROM vacancies;').fetchall())
+    assert updated['1'] > updated['2'] == '2026-01-01T00:00:00'  # Закрытие попадает в инкрементальную выгрузку
+
+
+def test_empty_batch_does_not_open_connection(monkeypatch):
+    def fail():
+        raise AssertionError('соединение не нужно')
+
+    monkeypatch.setattr(db_manager, 'get_db_connection', fail)
+
+    assert close_vacancies(iter([])) == 0
+
+
+def test_batch_is_one_transaction(db, stored, monkeypatch):
+    statements = []
+    connect = db_manager.get_db_connection
+
+    def traced():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(db_manager, 'get_db_connection', traced)
+
+    close_vacancies(['1', '2', '3'])
+
+    assert sum(statement.startswith('BEGIN') for statement in statements) == 1
+    assert statements.count('COMMIT') == 1
+    assert None not in close_dates(db).values()
+
+
+def test_failed_row_rolls_back_batch(db, stored):
+    db.execute('''
+        CREATE TRIGGER fail_close BEFORE UPDATE OF vacancy_close_date ON vacancies
+        WHEN NEW.id = '3' BEGIN SELECT RAISE(ABORT, 'сбой записи'); END;
+    ''')
+    db.commit()
+
+    with pytest.raises(sqlite3.IntegrityError):
+        close_vacancies(['1', '2', '3'])
+
+    assert close_dates(db) == {'1': None, '2': None, '3': None}
@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from src.check_vacancy_status import closure_detector
+from src.check_vacancy_status.closure_detector import detect_closed_async
+from src.database.db_manager import VacancyWriter, close_vacancies
+from src.models.vacancy_data import VacancyData
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.closed: list[str] = []
+        self.active: list[str] = []
+
+    def record_closed(self, vacancy_ids):
+        self.closed.extend(vacancy_ids)
+
+    def record_active(self, vacancy_ids):
+        self.active.extend(vacancy_ids)
+
+
+def store(db_path, *vacancy_ids, published_at=None):
+    with VacancyWriter(db_path) as writer:
+        for vacancy_id in vacancy_ids:
+            writer.add(VacancyData(id=vacancy_id, title='Разработчик', description='Описание',
+                                   published_at=published_at))
+
+
+def test_only_missing_ids_are_probed(db, db_path, monkeypatch):
+    store(db_path, '1', '2', '3', '4', '5', '6')
+    close_vacancies(['6'])
+    listings, probed = [], []
+
+    async def collect_active_ids(countries, date_from):
+        listings.append((countries, date_from))
+        return {'1', '2', '99'}  # '99' — новая вакансия, которой еще нет в базе
+
+    async def probe_closed(ids, workers, calls_per_minute):
+        probed.extend(ids)
+        return ['3'], ['4']  # '5' проверить не удалось
+
+    monkeypatch.setattr(closure_detector, 'collect_active_ids', collect_active_ids)
+    monkeypatch.setattr(closure_detector, 'probe_closed', probe_closed)
+    scheduler = FakeScheduler()
+
+    stats = asyncio.run(detect_closed_async(countries=(113,), scheduler=scheduler))
+
+    assert stats == {'open': 5, 'listed': 2, 'probed': 3, 'closed': 1}
+    assert probed == ['3', '4', '5']
+    assert listings[0][0] == (113,)
+    closed = [row[0] for row in db.execute('SELECT id FROM vacancies WHERE vacancy_close_date IS NOT NULL ORDER BY id;')]
+    assert closed == ['3', '6']
+    assert scheduler.closed == ['3']
+    assert sorted(scheduler.active) == ['1', '2', '4']
+
+
+def test_listing_window_is_clamped(db_path, monkeypatch):
+    store(db_path, '1')  # Без даты публикации
+    windows = []
+
+    async def collect_active_ids(countries, date_from):
+        windows.append(datetime.fromisoformat(date_from))
+        return {'1'}
+
+    async def probe_closed(ids, workers, calls_per_minute):
+        assert ids == []  # Все открытые вакансии есть в выдаче
+        return [], []
+
+    monkeypatch.setattr(closure_detector, 'collect_active_ids', collect_active_ids)
+    monkeypatch.setattr(closure_detector, 'probe_closed', probe_closed)
+
+    asyncio.run(detect_closed_async(countries=(113,)))
+
+    age = datetime.now().astimezone() - windows[0]
+    assert timedelta(days=closure_detector.MAX_LISTING_DAYS - 1) < age <= timedelta(
+        days=closure_detector.MAX_LISTING_DAYS, minutes=1)
+
+
+def test_no_open_vacancies_skips_listing(db_path, monkeypatch):
+    async def unexpected(*args):
+        raise AssertionError('выдача не нужна')
+
+    monkeypatch.setattr(closure_detector, 'collect_active_ids', unexpected)
+
+    assert asyncio.run(detect_closed_async()) == {'open': 0, 'listed': 0, 'probed': 0, 'closed': 0}
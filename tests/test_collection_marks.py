@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from src.database.db_manager import get_collection_mark, set_collection_mark
+from src.models.vacancy_search_params import VacancySearchParams
+from src.parser.category_manager import collect_category
+
+
+class FakeScheduler:
+    """Выдача из одной страницы; запоминает параметры запросов"""
+
+    def __init__(self, items: list[dict]):
+        self.items = items
+        self.requests: list[VacancySearchParams] = []
+
+    async def fetch_metadata(self, params: VacancySearchParams) -> dict:
+        self.requests.append(params)
+        return {'found': len(self.items), 'pages': 1, 'vacancies': self.items}
+
+
+def collect(scheduler, **kwargs) -> list[dict]:
+    collected = []
+
+    async def on_items(country, items):
+        collected.extend(items)
+
+    asyncio.run(collect_category(scheduler, 113, 96, on_items=on_items, **kwargs))
+    return collected
+
+
+def test_mark_round_trip(db_path):
+    assert get_collection_mark(113, 96) is None
+    set_collection_mark(113, 96, '2026-10-01T10:00:00+03:00')
+    set_collection_mark(113, 96, '2026-10-02T10:00:00+03:00')
+
+    assert get_collection_mark(113, 96) == '2026-10-02T10:00:00+03:00'
+    assert get_collection_mark(16, 96) is None
+
+
+def test_first_incremental_run_sets_mark(db_path):
+    scheduler = FakeScheduler([{'id': '1'}])
+
+    assert collect(scheduler, incremental=True) == [{'id': '1'}]
+
+    mark = get_collection_mark(113, 96)
+    assert mark is not None
+    assert scheduler.requests[0].date_to == VacancySearchParams().date_to  # Без отметки — текущий день
+
+
+def test_incremental_run_starts_from_mark(db_path):
+    set_collection_mark(113, 96, '2026-10-01T10:00:00+03:00')
+    scheduler = FakeScheduler([])
+
+    collect(scheduler, incremental=True)
+
+    assert scheduler.requests[0].date_from == '2026-10-01T10:00:00+03:00'
+    new_mark = get_collection_mark(113, 96)
+    assert new_mark == scheduler.requests[0].date_to
+    assert new_mark > '2026-10-01T10:00:00+03:00'
+
+
+def test_deferred_mark_is_not_saved(db_path):
+    set_collection_mark(113, 96, '2026-10-01T10:00:00+03:00')
+    deferred = []
+
+    collect(FakeScheduler([]), incremental=True, deferred_marks=deferred)
+
+    assert get_collection_mark(113, 96) == '2026-10-01T10:00:00+03:00'
+    assert [(country, category) for country, category, _ in deferred] == [(113, 96)]
+
+
+def test_full_run_ignores_mark(db_path):
+    set_collection_mark(113, 96, '2026-10-01T10:00:00+03:00')
+    scheduler = FakeScheduler([])
+
+    collect(scheduler)
+
+    assert scheduler.requests[0].date_from != '2026-10-01T10:00:00+03:00'
+    assert get_collection_mark(113, 96) == '2026-10-01T10:00:00+03:00'
+
+
+def test_failed_category_keeps_mark(db_path):
+    set_collection_mark(113, 96, '2026-10-01T10:00:00+03:00')
+
+    class FailingScheduler(FakeScheduler):
+        async def fetch_metadata(self, params):
+            raise RuntimeError('503')
+
+    with pytest.raises(RuntimeError):
+        collect(FailingScheduler([]), incremental=True)
+
+    assert get_collection_mark(113, 96) == '2026-10-01T10:00:00+03:00'
@@ -0,0 +1,31 @@
+import pytest
+
+from src.crawl_links.description_normalizer import normalize_description
+
+
+@pytest.mark.parametrize('html, expected', [
+    (None, ''),
+    ('', ''),
+    ('Просто текст', 'Просто текст'),
+    ('  Текст &amp; сущности\n\n  без   разметки ', 'Текст & сущности без разметки'),
+    ('<p>Задачи:</p><ul><li>Python</li><li>SQL</li></ul>', 'Задачи:\n\n- Python\n- SQL'),
+    ('<ol><li>Первый</li><li>Второй</li></ol>', '1. Первый\n2. Второй'),
+    ('<p>Строка<br>перенос<br/>еще</p>', 'Строка\nперенос\nеще'),
+    ('<p>Один</p><p>Два</p>', 'Один\n\nДва'),
+    ('<p><strong>Жирный</strong> и <em>курсив</em></p>', 'Жирный и курсив'),
+    ('<style>p {color: red}</style><p>Видно</p><script>alert(1)</script>', 'Видно'),
+    ('<p>&lt;b&gt; &quot;кавычки&quot; &nbsp;</p>', '<b> "кавычки"'),
+])
+def test_normalize_description(html, expected):
+    assert normalize_description(html) == expected
+
+
+def test_nested_lists_keep_own_numbering():
+    html = '<ol><li>Этап<ul><li>деталь</li></ul></li><li>Следующий</li></ol>'
+    assert normalize_description(html) == '1. Этап\n\n- деталь\n\n2. Следующий'
+
+
+def test_no_triple_newlines():
+    html = '<div><p>Первый</p></div><div><div><p>Второй</p></div></div>'
+    assert '\n\n\n' not in normalize_description(html)
+    assert normalize_description(html) == 'Первый\n\nВторой'
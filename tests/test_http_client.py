@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.utils import http_client
+from src.utils.http_client import TransportStats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive между запросами
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = TransportStats()
+    monkeypatch.setattr(http_client, 'transport_stats', stats)
+    return stats
+
+
+def test_sync_requests_reuse_one_connection(server_url, stats):
+    transport = http_client._TracingTransport(limits=http_client._pool_limits(max_connections=1))
+    with httpx.Client(transport=transport) as client:
+        for _ in range(5):
+            assert client.get(f'{server_url}/vacancies/1').json() == {'ok': True}
+
+    snapshot = stats.as_dict()
+    assert snapshot['requests'] == 5
+    assert snapshot['new_connections'] == 1
+    assert snapshot['reused_connections'] == 4
+    assert snapshot['reuse_ratio'] == pytest.approx(0.8)
+    assert snapshot['tls_handshakes'] == 0
+    assert snapshot['connect_time'] > 0
+
+
+def test_async_concurrent_requests_open_up_to_pool_limit(server_url, stats):
+    async def run():
+        async with http_client.create_async_client(max_connections=2, max_keepalive=2) as client:
+            await asyncio.gather(*(client.get(f'{server_url}/vacancies/{i}') for i in range(10)))
+
+    asyncio.run(run())
+
+    snapshot = stats.as_dict()
+    assert snapshot['requests'] == 10
+    assert 1 <= snapshot['new_connections'] <= 2
+    assert snapshot['reused_connections'] == 10 - snapshot['new_connections']
+
+
+def test_interleaved_async_traces_keep_own_start_times(stats, monkeypatch):
+    clock = iter([0.0, 1.0, 1.5, 4.0])
+    monkeypatch.setattr(http_client.time, 'perf_counter', lambda: next(clock))
+    first, second = stats.request_atrace(), stats.request_atrace()
+
+    async def run():
+        await first('connection.connect_tcp.started', {})  # 0.0
+        await second('connection.connect_tcp.started', {})  # 1.0
+        await second('connection.connect_tcp.complete', {})  # 1.5: 0.5 сек
+        await first('connection.connect_tcp.complete', {})  # 4.0: 4.0 сек
+
+    asyncio.run(run())
+
+    assert stats.new_connections == 2
+    assert stats.connect_time == pytest.approx(4.5)
@@ -0,0 +1,49 @@
+import pytest
+
+from src.utils import json_decoder
+from src.utils.json_decoder import decode_json, decode_search_page, decode_vacancy
+
+VACANCY = ('{"id": "1", "name": "Python-разработчик", "key_skills": [{"name": "Python"}], '
+           '"branding": {"type": "MAKEUP"}, "contacts": null}').encode()
+SEARCH_PAGE = b'{"items": [{"id": "1", "url": "https://api.hh.ru/vacancies/1"}], "found": 1, "pages": 1}'
+
+
+@pytest.fixture(params=['msgspec', 'orjson', 'json'])
+def backend(request, monkeypatch):
+    """Прогоняет тест на каждом звене цепочки msgspec → orjson → json"""
+    if request.param in ('orjson', 'json'):
+        monkeypatch.setattr(json_decoder, 'msgspec', None)
+    if request.param == 'json':
+        monkeypatch.setattr(json_decoder, 'orjson', None)
+    return request.param
+
+
+def test_vacancy_is_decoded_by_each_backend(backend):
+    data = decode_vacancy(VACANCY)
+
+    assert data['id'] == '1'
+    assert data['key_skills'] == [{'name': 'Python'}]
+    # По схеме msgspec лишние поля отбрасываются, без нее ответ декодируется целиком
+    assert ('branding' in data) == (backend != 'msgspec')
+
+
+def test_search_page_is_decoded_by_each_backend(backend):
+    data = decode_search_page(SEARCH_PAGE)
+
+    assert [item['id'] for item in data['items']] == ['1']
+    assert data['found'] == 1
+
+
+@pytest.mark.parametrize('decode', [decode_json, decode_vacancy, decode_search_page])
+def test_malformed_body_raises_value_error(backend, decode):
+    with pytest.raises(ValueError):
+        decode(b'<html>502 Bad Gateway</html>')
+
+
+def test_response_outside_schema_is_decoded_fully():
+    pytest.importorskip('msgspec')
+    # Ответ об ошибке API — корректный JSON, но не вакансия и не страница поиска
+    body = b'{"errors": [{"type": "not_found"}], "request_id": "abc"}'
+
+    assert decode_vacancy(body) == {'errors': [{'type': 'not_found'}], 'request_id': 'abc'}
+    assert decode_search_page(body)['request_id'] == 'abc'
@@ -0,0 +1,45 @@
+from array import array
+
+from src.crawl_links.known_vacancies import KnownVacancies, published_timestamp
+from src.database.db_manager import prepare_vacancy, write_vacancies
+from src.models.vacancy_data import VacancyData
+
+PUBLISHED = '2026-10-01T10:00:00+0300'
+
+
+def test_published_timestamp():
+    assert published_timestamp(PUBLISHED) == 1790838000
+    assert published_timestamp(None) == 0
+    assert published_timestamp('вчера') == 0
+
+
+def test_is_current():
+    known = KnownVacancies(array('q', [5, 17, 100]), array('q', [published_timestamp(PUBLISHED)] * 3))
+
+    assert known.is_current('17', PUBLISHED)
+    assert known.is_current(100, PUBLISHED)
+    # Переопубликованная или измененная вакансия
+    assert not known.is_current('17', '2026-10-02T10:00:00+0300')
+    # Неизвестная вакансия: меньше, больше и между известными ID
+    assert not known.is_current('1', PUBLISHED)
+    assert not known.is_current('200', PUBLISHED)
+    assert not known.is_current('50', PUBLISHED)
+    assert not known.is_current('abc', PUBLISHED)
+
+
+def test_is_current_without_stored_date():
+    known = KnownVacancies(array('q', [17]), array('q', [0]))
+    assert not known.is_current('17', None)
+    assert not known.is_current('17', PUBLISHED)
+
+
+def test_load_sorts_ids_numerically(db):
+    vacancies = [VacancyData(id=vacancy_id, published_at=PUBLISHED) for vacancy_id in ('100', '9', '25')]
+    with db:
+        write_vacancies(db, [prepare_vacancy(item).row for item in vacancies], [], {})
+
+    known = KnownVacancies.load()
+
+    assert list(known.ids) == [9, 25, 100]
+    assert len(known) == 3
+    assert all(known.is_current(item.id, PUBLISHED) for item in vacancies)
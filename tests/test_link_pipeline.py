@@ -0,0 +1,40 @@
+import asyncio
+
+from src.crawl_links import link_crawler, link_pipeline
+from src.crawl_links.link_pipeline import run_pipeline_async
+
+
+def item(vacancy_id: int) -> dict:
+    return {'id': str(vacancy_id), 'url': f'https://api.hh.ru/vacancies/{vacancy_id}',
+            'published_at': '2026-10-01T10:00:00+0300'}
+
+
+def test_duplicates_are_fetched_once_and_queue_is_bounded(db_path, monkeypatch):
+    # Пересекающиеся страницы выдачи: ID 5-9 и 10-14 приходят дважды
+    pages = [[item(i) for i in range(start, start + 10)] for start in (0, 5, 10)]
+    offered: set[str] = set()
+    fetched: list[str] = []
+    backlog: list[int] = []
+
+    async def collect_countries(countries, incremental, on_items, deferred_marks=None):
+        for page in pages:
+            for vacancy in page:
+                await on_items(113, [vacancy])  # Возвращается только после постановки в очередь
+                offered.add(vacancy['id'])
+
+    async def fetch(client, link, limiter, cache=None):
+        # Всё, что сборщик отдал, но воркеры еще не скачали, лежит в очереди или в руках воркеров
+        backlog.append(len(offered) - len(fetched))
+        fetched.append(link.rsplit('/', 1)[1])
+        await asyncio.sleep(0.001)
+        return {'not_modified': True, 'id': fetched[-1], 'url': link}
+
+    monkeypatch.setattr(link_pipeline, 'collect_countries', collect_countries)
+    monkeypatch.setattr(link_crawler, 'fetch_vacancy_data_async', fetch)
+
+    stats = asyncio.run(run_pipeline_async(
+        countries=(113,), workers=2, queue_size=3, use_cache=False, skip_known=False))
+
+    assert sorted(fetched, key=int) == [str(i) for i in range(20)]
+    assert stats == {'queued': 20, 'duplicates': 10, 'known': 0}
+    assert max(backlog) <= 3 + 2
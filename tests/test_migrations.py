@@ -0,0 +1,134 @@
+import sqlite3
+
+import pytest
+
+from src.database import db_manager
+from src.database.db_manager import MIGRATIONS, decompress_description, prepare_vacancy, write_vacancies
+from src.models.vacancy_data import VacancyData
+
+# Таблица vacancies до миграций (user_version = 0)
+LEGACY_SCHEMA = '''
+    CREATE TABLE vacancies (
+        id TEXT PRIMARY KEY, country TEXT, site TEXT, title TEXT, city TEXT, address TEXT,
+        experience TEXT, schedule TEXT, employment TEXT, description TEXT, skills TEXT,
+        professional_roles_name TEXT, company_id TEXT, company_name TEXT, company_url TEXT,
+        company_vacancies_url TEXT, company_accredited_it_employer TEXT, published_at TEXT,
+        created_at TEXT, employment_form TEXT, work_format TEXT, work_schedule_by_days TEXT,
+        vacancy_close_date TEXT, salary_from INTEGER, salary_to INTEGER, currency TEXT,
+        mode_name TEXT, frequency_name TEXT
+    )
+'''
+LEGACY_VACANCIES = [
+    VacancyData(id='1', country='Россия', title='Python-разработчик', description='Общее описание',
+                skills=['Python', 'SQL'], professional_roles_name='Программист', company_id='42',
+                company_name='Компания', company_accredited_it_employer=True,
+                published_at='2026-09-01T10:00:00+0300', created_at='2026-09-01T10:00:00+0300'),
+    VacancyData(id='2', country='Россия', title='Аналитик', description='Общее описание',
+                skills=['SQL'], professional_roles_name='Аналитик', company_id='42', company_name='Компания',
+                published_at='2026-09-02T10:00:00+0300', created_at='2026-09-02T10:00:00+0300'),
+]
+
+
+def create_legacy_db(path: str) -> sqlite3.Connection:
+    """База прежней версии: описания в строках, 'False' вместо пустой даты закрытия"""
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_SCHEMA)
+    conn.executemany(
+        f"INSERT INTO vacancies VALUES ({', '.join('?' * 28)});",
+        [item.to_row() for item in LEGACY_VACANCIES],
+    )
+    conn.execute("UPDATE vacancies SET vacancy_close_date = 'False', company_accredited_it_employer = NULL "
+                 "WHERE id = '2';")
+    conn.commit()
+    return conn
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    path = str(tmp_path / 'vacancies.db')
+    conn = create_legacy_db(path)
+    monkeypatch.setattr(db_manager, 'DB_PATH', path)
+    db_manager.initialize_database()
+    yield conn
+    conn.close()
+
+
+def test_all_migrations_are_applied(legacy_db):
+    assert legacy_db.execute('PRAGMA user_version;').fetchone()[0] == MIGRATIONS[-1][0]
+
+
+def test_false_close_date_becomes_null(legacy_db):
+    open_ids = legacy_db.execute('SELECT id FROM vacancies WHERE vacancy_close_date IS NULL ORDER BY id;').fetchall()
+    assert open_ids == [('1',), ('2',)]
+
+
+def test_reference_tables_are_filled(legacy_db):
+    assert legacy_db.execute('SELECT id, name FROM companies;').fetchall() == [('42', 'Компания')]
+    assert legacy_db.execute('''
+        SELECT v.id, r.name FROM vacancies v JOIN roles r ON r.id = v.role_id ORDER BY v.id
+    ''').fetchall() == [('1', 'Программист'), ('2', 'Аналитик')]
+    assert legacy_db.execute('''
+        SELECT vs.vacancy_id, s.name FROM vacancy_skills vs JOIN skills s ON s.id = vs.skill_id
+        ORDER BY vs.vacancy_id, s.name
+    ''').fetchall() == [('1', 'Python'), ('1', 'SQL'), ('2', 'SQL')]
+
+
+def test_descriptions_are_moved_and_deduplicated(legacy_db):
+    assert legacy_db.execute('SELECT COUNT(*) FROM vacancies WHERE description IS NOT NULL;').fetchone()[0] == 0
+    bodies = legacy_db.execute('SELECT body FROM descriptions;').fetchall()
+    assert [decompress_description(body) for body, in bodies] == ['Общее описание']
+    hashes = legacy_db.execute('SELECT DISTINCT description_hash FROM vacancies;').fetchall()
+    assert len(hashes) == 1 and hashes[0][0] is not None
+
+
+def test_content_hash_is_backfilled(legacy_db):
+    rows = legacy_db.execute('SELECT content_hash, updated_at FROM vacancies;').fetchall()
+    assert all(content_hash and updated_at for content_hash, updated_at in rows)
+
+
+def test_denormalized_columns_are_cleared(legacy_db):
+    assert legacy_db.execute('''
+        SELECT COUNT(*) FROM vacancies
+        WHERE skills IS NOT NULL OR company_name IS NOT NULL OR company_url IS NOT NULL
+            OR company_vacancies_url IS NOT NULL OR company_accredited_it_employer IS NOT NULL
+    ''').fetchone()[0] == 0
+    # Данные остаются в справочниках
+    assert legacy_db.execute('SELECT name FROM companies;').fetchall() == [('Компания',)]
+    assert legacy_db.execute('SELECT COUNT(*) FROM vacancy_skills;').fetchone()[0] == 3
+
+
+def test_recrawl_of_migrated_rows_is_not_a_change(legacy_db):
+    prepared = [prepare_vacancy(item) for item in LEGACY_VACANCIES]
+    with legacy_db:
+        changed = write_vacancies(legacy_db, [item.row for item in prepared],
+                                  [item.company for item in prepared if item.company],
+                                  {item.row[0]: list(item.skills) for item in prepared})
+    assert changed == 0
+    assert legacy_db.execute('SELECT COUNT(*) FROM vacancy_versions;').fetchone()[0] == 0
+
+
+def test_initialize_is_idempotent(legacy_db):
+    db_manager.initialize_database()
+    assert legacy_db.execute('PRAGMA user_version;').fetchone()[0] == MIGRATIONS[-1][0]
+    assert legacy_db.execute('SELECT COUNT(*) FROM descriptions;').fetchone()[0] == 1
+
+
+def test_versions_migration_does_not_depend_on_current_columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_manager, 'MIGRATIONS', [item for item in MIGRATIONS if item[0] <= 4])
+
+    def migrate(name: str) -> list[tuple]:
+        conn = create_legacy_db(str(tmp_path / name))
+        try:
+            db_manager.migrate_database(conn)
+            return conn.execute(
+                'SELECT id, content_hash, company_accredited_it_employer FROM vacancies ORDER BY id;').fetchall()
+        finally:
+            conn.close()
+
+    expected = migrate('current.db')
+    # Набор отслеживаемых колонок в коде изменился — результат миграции 4 тот же
+    monkeypatch.setattr(db_manager, 'TRACKED_COLUMNS', ('title',))
+    monkeypatch.setattr(db_manager, 'TRACKED_DEFAULTS', {})
+
+    assert migrate('changed.db') == expected
+    assert expected[1][2] is not None  # NULL заменен значением по умолчанию
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from src.parser.page_scheduler import PageScheduler
+
+
+def scheduler(max_in_flight: int) -> PageScheduler:
+    # Клиент и ограничитель нужны только fetch_metadata, здесь задания передаются напрямую
+    return PageScheduler(client=None, limiter=None, max_in_flight=max_in_flight)
+
+
+def test_queues_are_served_round_robin():
+    order = []
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def job(name):
+            if name == 'blocker':
+                await gate.wait()
+            order.append(name)
+            return name
+
+        async with scheduler(max_in_flight=1) as pages:
+            blocker = asyncio.create_task(pages.submit('x', lambda: job('blocker')))
+            await asyncio.sleep(0)
+            # Пока единственный воркер занят, большая категория ставит три страницы, маленькая — две
+            tasks = [asyncio.create_task(pages.submit(key, lambda name=name: job(name)))
+                     for key, name in [('big', 'big-1'), ('big', 'big-2'), ('big', 'big-3'),
+                                       ('small', 'small-1'), ('small', 'small-2')]]
+            await asyncio.sleep(0)
+            gate.set()
+            return await asyncio.gather(blocker, *tasks), pages.completed
+
+    results, completed = asyncio.run(run())
+
+    assert order == ['blocker', 'big-1', 'small-1', 'big-2', 'small-2', 'big-3']
+    assert results == ['blocker', 'big-1', 'big-2', 'big-3', 'small-1', 'small-2']
+    assert completed == 6
+
+
+def test_in_flight_is_capped():
+    running = peak = 0
+
+    async def job(i):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return i
+
+    async def run():
+        async with scheduler(max_in_flight=3) as pages:
+            return await asyncio.gather(*(pages.submit(i % 2, lambda i=i: job(i)) for i in range(10)))
+
+    assert asyncio.run(run()) == list(range(10))
+    assert peak == 3
+
+
+def test_job_error_is_returned_to_caller():
+    async def fail():
+        raise RuntimeError('503')
+
+    async def run():
+        async with scheduler(max_in_flight=1) as pages:
+            with pytest.raises(RuntimeError):
+                await pages.submit('x', fail)
+            # Воркер продолжает работу после обычной ошибки
+            return await pages.submit('x', lambda: asyncio.sleep(0, result='ok'))
+
+    assert asyncio.run(run()) == 'ok'
+
+
+def test_cancelled_job_does_not_hang_submit():
+    async def cancelled():
+        raise asyncio.CancelledError
+
+    async def run():
+        async with scheduler(max_in_flight=1) as pages:
+            with pytest.raises(asyncio.CancelledError):
+                await asyncio.wait_for(pages.submit('x', cancelled), timeout=1)
+
+    asyncio.run(run())
+
+
+def test_base_exception_is_returned_to_caller():
+    class Abort(BaseException):
+        pass
+
+    async def abort():
+        raise Abort
+
+    async def run():
+        async with scheduler(max_in_flight=1) as pages:
+            with pytest.raises(Abort):
+                await asyncio.wait_for(pages.submit('x', abort), timeout=1)
+
+    asyncio.run(run())
+
+
+def test_jobs_left_after_exit_are_cancelled():
+    async def run():
+        gate = asyncio.Event()
+        async with scheduler(max_in_flight=1) as pages:
+            first = asyncio.create_task(pages.submit('x', gate.wait))
+            await asyncio.sleep(0)
+            second = asyncio.create_task(pages.submit('x', gate.wait))
+            await asyncio.sleep(0)
+            pages._workers[0].cancel()  # Воркер остановлен, не взяв второе задание
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return first.cancelled(), second.cancelled()
+
+    assert asyncio.run(run()) == (True, True)
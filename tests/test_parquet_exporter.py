@@ -0,0 +1,86 @@
+import pytest
+
+from src.export.parquet_exporter import STATE_FILE, export_vacancies, load_export_state
+from src.models.vacancy_data import VacancyData
+
+pa = pytest.importorskip('pyarrow')
+ds = pytest.importorskip('pyarrow.dataset')
+
+
+def read(out_dir, fmt: str = 'parquet') -> list[dict]:
+    dataset = ds.dataset(out_dir, format='ipc' if fmt == 'arrow' else fmt, partitioning='hive')
+    return sorted(dataset.to_table().to_pylist(), key=lambda row: (row['id'], row['updated_at']))
+
+
+def test_full_export_is_partitioned_by_country_and_month(db, db_path, tmp_path, store):
+    store(db,
+          VacancyData(id='1', country='Россия', published_at='2026-09-01T10:00:00+0300', skills=['Python', 'SQL'],
+                      salary_from=100, currency='RUR', description='Описание', company_id='42',
+                      company_name='Компания', company_accredited_it_employer=True),
+          VacancyData(id='2', country='Россия', published_at='2026-10-01T10:00:00+0300'),
+          VacancyData(id='3', country='Беларусь', published_at='2026-10-02T10:00:00+0300'),
+          updated_at='2026-10-03T10:00:00')
+    out_dir = tmp_path / 'export'
+
+    assert export_vacancies(out_dir, db_path=db_path) == {'rows': 3, 'files': 3}
+
+    partitions = sorted(str(path.parent.relative_to(out_dir)) for path in out_dir.rglob('part-*.parquet'))
+    assert partitions == ['country=Беларусь/month=2026-10', 'country=Россия/month=2026-09',
+                          'country=Россия/month=2026-10']
+    first = read(out_dir)[0]
+    assert first['skills'] == ['Python', 'SQL']
+    assert (first['company_id'], first['company_name'], first['company_accredited_it_employer']) == (
+        '42', 'Компания', True)
+    assert first['salary'] == {'from': 100.0, 'to': None, 'currency': 'RUR', 'mode': None, 'frequency': None}
+    assert first['description'] == 'Описание'
+    assert first['month'] == '2026-09'
+
+
+def test_incremental_export_uses_exported_watermark(db, db_path, tmp_path, store):
+    out_dir = tmp_path / 'export'
+    store(db, VacancyData(id='1', country='Россия', published_at='2026-10-01T10:00:00+0300'),
+          updated_at='2026-10-03T10:00:00')
+    export_vacancies(out_dir, db_path=db_path)
+    assert load_export_state(out_dir)['exported_until'] == '2026-10-03T10:00:00'
+
+    # Следующая выгрузка берет только строки с updated_at больше отметки
+    store(db, VacancyData(id='1', country='Россия', title='Новое название', published_at='2026-10-01T10:00:00+0300'),
+          updated_at='2026-10-04T09:00:00')
+
+    assert export_vacancies(out_dir, db_path=db_path)['rows'] == 1
+    assert load_export_state(out_dir)['exported_until'] == '2026-10-04T09:00:00'
+    assert [(row['id'], row['title']) for row in read(out_dir)] == [('1', None), ('1', 'Новое название')]
+
+    assert export_vacancies(out_dir, db_path=db_path) == {'rows': 0, 'files': 0}
+    assert load_export_state(out_dir)['exported_until'] == '2026-10-04T09:00:00'
+
+
+def test_full_export_replaces_previous_files(db, db_path, tmp_path, store):
+    out_dir = tmp_path / 'export'
+    store(db, VacancyData(id='1', country='Россия', published_at='2026-10-01T10:00:00+0300'),
+          updated_at='2026-10-03T10:00:00')
+    export_vacancies(out_dir, db_path=db_path)
+    store(db, VacancyData(id='1', country='Россия', title='Новое', published_at='2026-10-01T10:00:00+0300'),
+          updated_at='2026-10-04T10:00:00')
+    export_vacancies(out_dir, db_path=db_path)
+
+    export_vacancies(out_dir, db_path=db_path, incremental=False)
+
+    assert [(row['id'], row['title']) for row in read(out_dir)] == [('1', 'Новое')]
+    assert (out_dir / STATE_FILE).exists()
+
+
+def test_arrow_format_without_descriptions(db, db_path, tmp_path, store):
+    out_dir = tmp_path / 'export'
+    store(db, VacancyData(id='1', country='Россия', description='Описание'), updated_at='2026-10-03T10:00:00')
+
+    assert export_vacancies(out_dir, fmt='arrow', include_descriptions=False, db_path=db_path)['rows'] == 1
+
+    rows = read(out_dir, 'arrow')
+    assert 'description' not in rows[0]
+    assert rows[0]['month'] == 'unknown'
+
+
+def test_unknown_format(db_path, tmp_path):
+    with pytest.raises(ValueError):
+        export_vacancies(tmp_path / 'export', fmt='csv', db_path=db_path)
@@ -0,0 +1,38 @@
+import asyncio
+
+from src.crawl_links.parse_stage import ParseStage
+
+RESPONSE = {'id': '1', 'name': 'Python-разработчик', 'description': '<p>Описание</p>',
+            'key_skills': [{'name': 'Python'}]}
+
+
+def parse(**kwargs) -> tuple[list, ParseStage, str | None]:
+    """Разбирает три вакансии и возвращает пачки, этап и способ запуска процессов пула"""
+    batches = []
+
+    async def run():
+        async with ParseStage(batches.append, batch_size=2, **kwargs) as stage:
+            methods.append(stage._executor and stage._executor._mp_context.get_start_method())
+            for vacancy_id in ('1', '2', '3'):
+                await stage.submit({**RESPONSE, 'id': vacancy_id}, 'Россия')
+        return stage
+
+    methods = []
+    stage = asyncio.run(run())
+    return batches, stage, methods[0]
+
+
+def test_pool_uses_spawn_and_parses_all_batches():
+    batches, stage, method = parse(workers=1, in_process=False)
+
+    assert method == 'spawn'
+    assert sorted(item.row[0] for batch in batches for item in batch) == ['1', '2', '3']
+    assert batches[0][0].skills == ('Python',)
+    assert stage.parsed == 3
+
+
+def test_in_process_mode_has_no_pool():
+    batches, stage, method = parse(in_process=True)
+
+    assert method is None
+    assert [len(batch) for batch in batches] == [2, 1]
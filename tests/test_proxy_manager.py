@@ -0,0 +1,176 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import check_vacancy_status_script as script
+from check_vacancy_status_script import (
+    QUARANTINE_SECONDS, ProxyConfig, ProxyHealth, ProxyManager, process_single_vacancy)
+
+FAST, SLOW = ProxyConfig(host='10.0.0.1', port=3000), ProxyConfig(host='10.0.0.2', port=3000)
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    """HTTP-прокси для тестов: отвечает сам, запоминая клиентские соединения"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive между запросами
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        self.server.paths.append(self.path)
+        status = 404 if self.path.endswith('/404') else 200
+        body = b'{"id": "1"}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def proxy_server(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ProxyHandler)
+    server.connections, server.paths = set(), []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # Обычный HTTP вместо https: прокси получает запрос целиком, без CONNECT-туннеля
+    monkeypatch.setattr(script, 'build_api_url', lambda vacancy_id: f'http://api.hh.ru/vacancies/{vacancy_id}')
+    monkeypatch.setattr(script.random, 'uniform', lambda a, b: 0)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_checks_through_one_proxy_reuse_its_connection(proxy_server):
+    proxy = ProxyConfig(host='127.0.0.1', port=proxy_server.server_address[1])
+
+    async def run():
+        async with ProxyManager([proxy]) as manager:
+            results = [await process_single_vacancy(vacancy_id, manager) for vacancy_id in ('1', '404', '2')]
+            return results, len(manager.sessions)
+
+    results, sessions = asyncio.run(run())
+
+    assert results == [False, '404', False]
+    assert sessions == 1
+    assert proxy_server.paths == [f'http://api.hh.ru/vacancies/{i}' for i in ('1', '404', '2')]
+    assert len(proxy_server.connections) == 1
+
+
+def test_session_per_proxy_is_created_once():
+    first, second = FAST, SLOW
+
+    async def run():
+        manager = ProxyManager([first, second])
+        session = await manager.get_session(first)
+        assert await manager.get_session(first) is session
+        assert await manager.get_session(second) is not session
+        assert session.connector.limit == 1
+
+        await session.close()
+        renewed = await manager.get_session(first)  # Закрытая сессия пересоздается
+        assert renewed is not session
+
+        await manager.close()
+        assert manager.sessions == {}
+        assert renewed.closed
+
+    asyncio.run(run())
+
+
+def test_health_ewma():
+    health = ProxyHealth()
+
+    health.observe(2.0, ok=True)
+    assert health.latency_ewma == pytest.approx(1.2)
+    assert health.error_ewma == 0
+
+    health.observe(None, ok=False)  # Ошибка не меняет задержку
+    assert health.latency_ewma == pytest.approx(1.2)
+    assert health.error_ewma == pytest.approx(0.2)
+    assert health.samples == 2
+
+
+def test_weight_prefers_fast_and_reliable_proxy():
+    fast, slow, failing = ProxyHealth(latency_ewma=0.2), ProxyHealth(latency_ewma=2.0), ProxyHealth(latency_ewma=0.2)
+    failing.error_ewma = 0.9
+
+    assert fast.weight() > slow.weight() > 0
+    assert fast.weight() > failing.weight() > 0  # Даже плохой прокси сохраняет ненулевой шанс
+
+
+def test_selection_is_weighted_by_health(monkeypatch):
+    calls = []
+
+    def choices(candidates, weights):
+        calls.append(dict(zip(candidates, weights)))
+        return [candidates[0]]
+
+    monkeypatch.setattr(script.random, 'choices', choices)
+
+    async def run():
+        manager = ProxyManager([FAST, SLOW])
+        manager.record_success(FAST, 0.1)
+        manager.record_success(SLOW, 5.0)
+        return await manager.acquire()
+
+    assert asyncio.run(run()) == FAST
+    assert calls[0][FAST] > calls[0][SLOW]
+
+
+def test_repeated_failures_quarantine_proxy():
+    async def run():
+        manager = ProxyManager([FAST, SLOW])
+        for _ in range(4):
+            manager.record_failure(FAST)
+        assert manager.health[FAST].quarantined_until == 0  # Мало наблюдений для решения
+        manager.record_failure(FAST)
+        assert manager.health[FAST].quarantined_until > script.time.monotonic() + QUARANTINE_SECONDS - 1
+        # В карантине прокси не выдается, пока есть здоровый
+        return {await manager.get_proxy(), await manager.get_proxy()}
+
+    assert asyncio.run(run()) == {SLOW, None}
+
+
+@pytest.mark.parametrize('recovered', [True, False])
+def test_quarantine_ends_with_probe(monkeypatch, recovered):
+    async def probe(proxy_url):
+        return recovered
+
+    monkeypatch.setattr(script, 'test_proxy_connection', probe)
+
+    async def run():
+        manager = ProxyManager([FAST])
+        health = manager.health[FAST]
+        health.error_ewma, health.quarantined_until = 0.9, 1.0  # Карантин уже истек
+        assert await manager.get_proxy() is None  # Вместо выдачи — тестовый запрос
+        await asyncio.gather(*manager._probes)
+        return manager, health
+
+    manager, health = asyncio.run(run())
+
+    assert manager.get_available_count() == 1
+    if recovered:
+        assert health.quarantined_until == 0
+        assert health.error_ewma < script.QUARANTINE_ERROR_RATE
+    else:
+        assert health.quarantine_seconds == QUARANTINE_SECONDS * 2
+        assert health.quarantined_until > script.time.monotonic()
+
+
+def test_acquire_waits_for_cooldown_without_polling():
+    async def run():
+        manager = ProxyManager([FAST])
+        manager.record_throttled(FAST, retry_after=0.05)
+        started = script.time.monotonic()
+        proxy = await manager.acquire()
+        return proxy, script.time.monotonic() - started
+
+    proxy, waited = asyncio.run(run())
+
+    assert proxy == FAST
+    assert 0.04 <= waited < 1
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import rate_limiter
+from src.utils.rate_limiter import AsyncRateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Виртуальное время: asyncio.sleep в ограничителе сдвигает часы без ожидания"""
+    state = SimpleNamespace(now=1000.0, sleeps=[])
+
+    async def sleep(seconds):
+        state.sleeps.append(seconds)
+        state.now += seconds
+
+    monkeypatch.setattr(rate_limiter, 'time', SimpleNamespace(monotonic=lambda: state.now))
+    monkeypatch.setattr(rate_limiter, 'asyncio', SimpleNamespace(Lock=asyncio.Lock, sleep=sleep))
+    return state
+
+
+def acquire(limiter: AsyncRateLimiter, count: int) -> None:
+    async def run():
+        for _ in range(count):
+            await limiter.acquire()
+
+    asyncio.run(run())
+
+
+def test_burst_is_free_then_rate_limited(clock):
+    limiter = AsyncRateLimiter(calls_per_minute=60, burst=3)
+
+    acquire(limiter, 3)
+    assert clock.sleeps == []
+
+    acquire(limiter, 2)
+    assert clock.sleeps == pytest.approx([1.0, 1.0])
+    assert limiter.request_counter == 5
+
+
+def test_tokens_refill_up_to_burst(clock):
+    limiter = AsyncRateLimiter(calls_per_minute=60, burst=3)
+    acquire(limiter, 3)
+
+    clock.now += 100  # Простой дольше, чем нужно на заполнение ведра
+    acquire(limiter, 3)
+    assert clock.sleeps == []
+    acquire(limiter, 1)
+    assert clock.sleeps == pytest.approx([1.0])
+
+
+def test_pause_blocks_and_drops_accumulated_tokens(clock):
+    limiter = AsyncRateLimiter(calls_per_minute=60, burst=3)
+    started = clock.now
+
+    limiter.pause(30)
+    acquire(limiter, 2)
+
+    # Ждем паузу, затем токен пополняется с нуля: второй запрос через секунду после первого
+    assert clock.now - started == pytest.approx(32)
+
+
+def test_shorter_pause_does_not_shorten_longer_one(clock):
+    limiter = AsyncRateLimiter(calls_per_minute=60, burst=3)
+    started = clock.now
+
+    limiter.pause(30)
+    limiter.pause(5)
+    acquire(limiter, 1)
+
+    assert clock.now - started == pytest.approx(31)
@@ -0,0 +1,31 @@
+import pytest
+
+from src.check_vacancy_status.recheck_scheduler import MAX_INTERVAL_DAYS, MIN_INTERVAL_DAYS, next_interval
+
+
+def test_next_interval_is_half_of_remaining_lifetime():
+    assert next_interval(age_days=20, lifetime_days=30, confirmations=0) == pytest.approx(5)
+    assert next_interval(age_days=28, lifetime_days=30, confirmations=3) == pytest.approx(1)
+
+
+def test_next_interval_shrinks_towards_lifetime():
+    intervals = [next_interval(age, 30, 0) for age in (0, 10, 20, 29)]
+    assert intervals == sorted(intervals, reverse=True)
+
+
+def test_next_interval_is_clamped():
+    assert next_interval(age_days=0, lifetime_days=60, confirmations=0) == MAX_INTERVAL_DAYS
+    assert next_interval(age_days=29.9, lifetime_days=30, confirmations=0) == MIN_INTERVAL_DAYS
+
+
+def test_next_interval_is_short_after_lifetime():
+    # Раньше интервал рос с возрастом: |30 - 60| / 2 = 15 дней
+    assert next_interval(age_days=60, lifetime_days=30, confirmations=0) == MIN_INTERVAL_DAYS
+    assert next_interval(age_days=30, lifetime_days=30, confirmations=0) == MIN_INTERVAL_DAYS
+
+
+def test_next_interval_backs_off_with_confirmations():
+    first = next_interval(age_days=40, lifetime_days=30, confirmations=0)
+    confirmed = next_interval(age_days=40, lifetime_days=30, confirmations=8)
+    assert first < confirmed == MIN_INTERVAL_DAYS * 3
+    assert next_interval(age_days=40, lifetime_days=30, confirmations=100) == confirmed
@@ -0,0 +1,117 @@
+import asyncio
+import itertools
+
+import httpx
+import pytest
+
+from src.crawl_links.main_requests import fetch_vacancy_data_async
+from src.crawl_links.response_cache import ResponseCache
+from src.utils.rate_limiter import AsyncRateLimiter
+
+BODY = '{"id": "1", "name": "Python-разработчик"}'.encode('utf-8')
+HEADERS = {'ETag': '"v1"', 'Last-Modified': 'Thu, 01 Oct 2026 10:00:00 GMT'}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), commit_every=1)
+    yield cache
+    cache.close()
+
+
+def test_new_response_is_cached_only_after_confirm(cache):
+    assert not cache.is_unchanged('1', 200, BODY, HEADERS)
+    assert cache.conditional_headers('1') == {}
+
+    cache.confirm(['1', '2'])
+
+    assert cache.conditional_headers('1') == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Thu, 01 Oct 2026 10:00:00 GMT'}
+    assert cache.conditional_headers('2') == {}
+
+
+def test_same_body_is_unchanged(cache):
+    cache.is_unchanged('1', 200, BODY, HEADERS)
+    cache.confirm(['1'])
+
+    assert cache.is_unchanged('1', 200, BODY, {})
+    assert not cache.is_unchanged('1', 200, BODY + b' ', {})
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'hit_ratio': pytest.approx(1 / 3)}
+
+
+def test_unconfirmed_response_is_fetched_again(cache):
+    # Запись вакансии не удалась: confirm не вызван, следующий обход снова ее обработает
+    cache.is_unchanged('1', 200, BODY, HEADERS)
+    assert not cache.is_unchanged('1', 200, BODY, HEADERS)
+
+
+def test_not_modified_is_a_hit(cache):
+    assert cache.is_unchanged('1', 304, b'', {})
+    assert cache.hits == 1
+
+
+def test_forget_drops_entry(cache):
+    cache.is_unchanged('1', 200, BODY, HEADERS)
+    cache.confirm(['1'])
+    cache.is_unchanged('2', 200, BODY, HEADERS)
+
+    cache.forget('1')
+    cache.forget('2')
+    cache.confirm(['2'])
+
+    assert cache.conditional_headers('1') == {}
+    assert cache.conditional_headers('2') == {}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / 'cache.db'), max_entries=2, commit_every=1)
+    clock = itertools.count(100)
+    monkeypatch.setattr('src.crawl_links.response_cache.time.time', lambda: next(clock))
+    try:
+        for vacancy_id in ('1', '2'):
+            cache.is_unchanged(vacancy_id, 200, BODY, HEADERS)
+            cache.confirm([vacancy_id])
+        cache.is_unchanged('1', 304, b'', {})  # '1' использована позже '2'
+        cache.is_unchanged('3', 200, BODY, HEADERS)
+        cache.confirm(['3'])
+
+        assert cache.conditional_headers('1')
+        assert cache.conditional_headers('2') == {}
+        assert cache.conditional_headers('3')
+    finally:
+        cache.close()
+
+
+def test_fetch_sends_conditional_headers_and_handles_304(cache):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=BODY, headers=HEADERS)
+
+    async def fetch():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await fetch_vacancy_data_async(
+                client, 'https://api.hh.ru/vacancies/1', AsyncRateLimiter(calls_per_minute=6000), cache=cache)
+
+    assert asyncio.run(fetch())['name'] == 'Python-разработчик'
+    cache.confirm(['1'])
+    assert asyncio.run(fetch()) == {'not_modified': True, 'id': '1', 'url': 'https://api.hh.ru/vacancies/1'}
+    assert 'If-None-Match' not in requests[0].headers
+    assert requests[1].headers['If-Modified-Since'] == HEADERS['Last-Modified']
+
+
+def test_fetch_forgets_closed_vacancy(cache):
+    cache.is_unchanged('1', 200, BODY, HEADERS)
+    cache.confirm(['1'])
+
+    async def fetch():
+        transport = httpx.MockTransport(lambda request: httpx.Response(404))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await fetch_vacancy_data_async(
+                client, 'https://api.hh.ru/vacancies/1', AsyncRateLimiter(calls_per_minute=6000), cache=cache)
+
+    assert asyncio.run(fetch())['closed'] is True
+    assert cache.conditional_headers('1') == {}
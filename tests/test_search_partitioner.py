@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+
+from src.models.vacancy_search_params import VacancySearchParams
+from src.parser.search_partitioner import SEARCH_RESULTS_CAP, get_sub_areas, partition_search, split_by_date
+from src.utils.rate_limiter import AsyncRateLimiter
+
+
+def test_split_by_date_halves_whole_days():
+    first, second = split_by_date(VacancySearchParams(date_from='2026-10-01', date_to='2026-10-02', page=3))
+
+    assert (first.date_from, first.date_to) == ('2026-10-01T00:00:00', '2026-10-01T23:59:59')
+    assert (second.date_from, second.date_to) == ('2026-10-02T00:00:00', '2026-10-02T23:59:59')
+    assert first.page == second.page == 0
+
+
+def test_split_by_date_keeps_other_params():
+    params = VacancySearchParams(professional_role=10, area=1, date_from='2026-10-01T10:00:00',
+                                 date_to='2026-10-01T12:00:00')
+    first, second = split_by_date(params)
+
+    assert (first.area, first.professional_role) == (second.area, second.professional_role) == (1, 10)
+    assert first.date_to == '2026-10-01T11:00:00'
+    assert second.date_from == '2026-10-01T11:00:01'
+
+
+def test_split_by_date_stops_at_min_window():
+    params = VacancySearchParams(date_from='2026-10-01T10:00:00', date_to='2026-10-01T10:01:00')
+    assert split_by_date(params) is None
+
+
+def test_get_sub_areas():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == '/areas/113'
+        return httpx.Response(200, json={'id': '113', 'areas': [{'id': '1'}, {'id': '2019'}]})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await get_sub_areas(client, AsyncRateLimiter(calls_per_minute=6000), 113)
+
+    assert asyncio.run(run()) == [1, 2019]
+
+
+def test_get_sub_areas_returns_empty_list_on_error():
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await get_sub_areas(client, AsyncRateLimiter(calls_per_minute=6000), 113)
+
+    assert asyncio.run(run()) == []
+
+
+class FakeScheduler:
+    """Выдача, в которой вакансии равномерно распределены по времени и регионам"""
+
+    def __init__(self, found_per_day: int, sub_areas: dict[int, list[int]] | None = None):
+        self.found_per_day = found_per_day
+        self.sub_areas = sub_areas or {}
+        self.limiter = AsyncRateLimiter(calls_per_minute=6000)
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self._areas))
+
+    def _areas(self, request: httpx.Request) -> httpx.Response:
+        area = int(request.url.path.rsplit('/', 1)[1])
+        return httpx.Response(200, json={'areas': [{'id': str(child)} for child in self.sub_areas.get(area, [])]})
+
+    async def fetch_metadata(self, params: VacancySearchParams) -> dict:
+        start = datetime.fromisoformat(params.date_from)
+        end = datetime.fromisoformat(params.date_to)
+        found = int(self.found_per_day * ((end - start).total_seconds() + 1) / 86400)
+        if any(params.area in children for children in self.sub_areas.values()):
+            found //= 10  # Дочерний регион: десятая часть выдачи
+        return {'found': found, 'pages': 0, 'items': []}
+
+
+def test_partition_search_splits_until_under_cap():
+    scheduler = FakeScheduler(found_per_day=SEARCH_RESULTS_CAP)
+    params = VacancySearchParams(date_from='2026-10-01T00:00:00', date_to='2026-10-04T23:59:59')
+
+    leaves = asyncio.run(partition_search(scheduler, params))
+
+    assert len(leaves) == 4
+    assert all(metadata['found'] <= SEARCH_RESULTS_CAP for _, metadata in leaves)
+    assert [leaf.date_from for leaf, _ in leaves] == [
+        '2026-10-01T00:00:00', '2026-10-02T00:00:00', '2026-10-03T00:00:00', '2026-10-04T00:00:00']
+
+
+def test_partition_search_falls_back_to_sub_areas():
+    # Даже минутное окно больше лимита: делим по дочерним регионам
+    scheduler = FakeScheduler(found_per_day=SEARCH_RESULTS_CAP * 24 * 60 * 2, sub_areas={113: [1, 2]})
+    params = VacancySearchParams(date_from='2026-10-01T10:00:00', date_to='2026-10-01T10:01:00')
+
+    leaves = asyncio.run(partition_search(scheduler, params))
+
+    assert sorted(leaf.area for leaf, _ in leaves) == [1, 2]
+    assert all(metadata['found'] <= SEARCH_RESULTS_CAP for _, metadata in leaves)
@@ -0,0 +1,94 @@
+from src.crawl_links.parse_stage import CSV_FIELDS, csv_record
+from src.database.db_manager import VACANCY_COLUMNS, prepare_vacancy, vacancy_to_row
+from src.models.vacancy_data import FIELD_NAMES, VacancyData
+
+API_RESPONSE = {
+    'id': '123',
+    'name': 'Python-разработчик',
+    'area': {'id': '1', 'name': 'Москва'},
+    'address': {'raw': 'Москва, Тверская улица, 1'},
+    'experience': {'id': 'between1And3', 'name': 'От 1 года до 3 лет'},
+    'schedule': {'id': 'remote', 'name': 'Удаленная работа'},
+    'employment': {'id': 'full', 'name': 'Полная занятость'},
+    'description': '<p>Задачи:</p><ul><li>Python</li></ul>',
+    'key_skills': [{'name': 'Python'}, {'name': 'SQL'}],
+    'professional_roles': [{'id': '96', 'name': 'Программист, разработчик'}],
+    'employer': {'id': '42', 'name': 'Компания', 'url': 'https://api.hh.ru/employers/42',
+                 'vacancies_url': 'https://api.hh.ru/vacancies?employer_id=42', 'accredited_it_employer': True},
+    'salary_range': {'from': 200000, 'to': None, 'currency': 'RUR',
+                     'mode': {'name': 'За месяц'}, 'frequency': {'name': 'Два раза в месяц'}},
+    'published_at': '2026-10-01T10:00:00+0300',
+    'created_at': '2026-10-01T09:00:00+0300',
+}
+
+
+def test_from_api():
+    vacancy = VacancyData.from_api(API_RESPONSE, 'Россия')
+
+    assert vacancy.id == '123'
+    assert (vacancy.country, vacancy.site, vacancy.city) == ('Россия', 'hh_ru', 'Москва')
+    assert vacancy.address == 'Москва, Тверская улица, 1'
+    assert vacancy.description == 'Задачи:\n\n- Python'
+    assert vacancy.skills == ['Python', 'SQL']
+    assert vacancy.professional_roles_name == 'Программист, разработчик'
+    assert (vacancy.company_id, vacancy.company_accredited_it_employer) == ('42', True)
+    assert (vacancy.salary_from, vacancy.salary_to, vacancy.currency) == (200000, None, 'RUR')
+    assert (vacancy.mode_name, vacancy.frequency_name) == ('За месяц', 'Два раза в месяц')
+    assert vacancy.vacancy_close_date is None
+
+
+def test_from_api_with_missing_fields():
+    vacancy = VacancyData.from_api({'id': '5', 'address': None, 'employer': None, 'salary_range': None}, '')
+
+    assert vacancy.country is None
+    assert vacancy.address is None
+    assert vacancy.description == ''
+    assert vacancy.skills == []
+    assert vacancy.professional_roles_name is None
+    assert vacancy.company_accredited_it_employer is False
+    assert vacancy.salary_from is None
+
+
+def test_to_row_follows_field_order():
+    vacancy = VacancyData.from_api(API_RESPONSE, 'Россия')
+    row = vacancy.to_row()
+
+    assert len(row) == len(FIELD_NAMES) == 28
+    assert dict(zip(FIELD_NAMES, row)) == {name: getattr(vacancy, name) for name in FIELD_NAMES} | {
+        'skills': 'Python, SQL'}
+
+
+def test_from_dict_round_trip():
+    vacancy = VacancyData.from_api(API_RESPONSE, 'Россия')
+    data = {name: getattr(vacancy, name) for name in FIELD_NAMES} | {'unknown': 'ignored', 'salary_to': None}
+
+    assert VacancyData.from_dict(data) == vacancy
+
+
+def test_vacancy_to_row_stores_description_hash_only():
+    vacancy = VacancyData.from_api(API_RESPONSE, 'Россия')
+    row = vacancy_to_row(vacancy)
+    values = dict(zip(VACANCY_COLUMNS, row))
+
+    assert len(row) == len(VACANCY_COLUMNS) + 1
+    assert values['description'] is None
+    assert values['description_hash'] is not None
+    assert row[-1] == 'Программист, разработчик'
+    # Словарь прежнего формата дает тот же хэш описания
+    legacy_row = vacancy_to_row({'id': '123', 'description': vacancy.description})
+    assert dict(zip(VACANCY_COLUMNS, legacy_row))['description_hash'] == values['description_hash']
+
+
+def test_csv_record_restores_reference_fields():
+    vacancy = VacancyData.from_api(API_RESPONSE, 'Россия')
+    record = csv_record(prepare_vacancy(vacancy))
+
+    assert set(record) == set(CSV_FIELDS)
+    assert record == {name: getattr(vacancy, name) for name in CSV_FIELDS}
+
+
+def test_csv_record_without_employer():
+    record = csv_record(prepare_vacancy(VacancyData(id='5')))
+
+    assert (record['company_id'], record['company_name'], record['company_accredited_it_employer']) == (
+        None, None, False)
@@ -0,0 +1,123 @@
+import pytest
+
+from src.database import db_manager
+from src.database.db_manager import VacancyWriter, close_vacancy_writer, flush_vacancy_writer
+from src.models.vacancy_data import VacancyData
+
+
+def count(db) -> int:
+    return db.execute('SELECT COUNT(*) FROM vacancies;').fetchone()[0]
+
+
+def vacancy(vacancy_id: str, **fields) -> VacancyData:
+    return VacancyData(id=vacancy_id, title='Разработчик', skills=['Python'], company_id='42',
+                       company_name='Компания', description='Описание', **fields)
+
+
+def test_rows_are_buffered_until_batch_size(db, db_path):
+    with VacancyWriter(db_path, batch_size=3, flush_interval=3600) as writer:
+        writer.add(vacancy('1'))
+        writer.add(vacancy('2'))
+        assert count(db) == 0
+
+        writer.add(vacancy('3'))
+        assert count(db) == 3
+        assert writer.written == 3
+
+        writer.add(vacancy('4'))
+        assert count(db) == 3
+    # close() сбрасывает остаток буфера
+    assert count(db) == 4
+
+
+def test_flush_interval_triggers_write(db, db_path, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(db_manager.time, 'monotonic', lambda: now[0])
+    with VacancyWriter(db_path, batch_size=100, flush_interval=5) as writer:
+        writer.add(vacancy('1'))
+        assert count(db) == 0
+        now[0] += 5
+        writer.add(vacancy('2'))
+        assert count(db) == 2
+
+
+def test_unchanged_rows_are_counted(db_path):
+    with VacancyWriter(db_path, batch_size=100) as writer:
+        writer.add(vacancy('1'))
+        writer.flush()
+        writer.add(vacancy('1'))
+        writer.add(vacancy('2'))
+        writer.flush()
+        assert (writer.written, writer.unchanged) == (2, 1)
+
+
+def test_batch_writes_reference_tables(db, db_path):
+    with VacancyWriter(db_path) as writer:
+        writer.add(vacancy('1'))
+        writer.add(vacancy('2'))
+
+    assert db.execute('SELECT id, name FROM companies;').fetchall() == [('42', 'Компания')]
+    assert db.execute('SELECT COUNT(*) FROM vacancy_skills;').fetchone()[0] == 2
+    assert db.execute('SELECT COUNT(*) FROM descriptions;').fetchone()[0] == 1
+
+
+def test_commit_listeners_get_ids_after_commit(db, db_path):
+    calls = []
+
+    def listener(vacancy_ids):
+        calls.append((vacancy_ids, count(db)))
+
+    with VacancyWriter(db_path, batch_size=2, flush_interval=3600) as writer:
+        writer.add_commit_listener(listener)
+        writer.add_commit_listener(listener)  # Повторная подписка игнорируется
+        writer.add(vacancy('1'))
+        assert calls == []
+        writer.add(vacancy('2'))
+
+    # Обработчик видит уже зафиксированные строки
+    assert calls == [(['1', '2'], 2)]
+
+
+def test_listener_errors_do_not_break_writer(db, db_path):
+    def broken(vacancy_ids):
+        raise RuntimeError('сбой обработчика')
+
+    seen = []
+    with VacancyWriter(db_path) as writer:
+        writer.add_commit_listener(broken)
+        writer.add_commit_listener(seen.extend)
+        writer.add(vacancy('1'))
+        writer.flush()
+
+    assert seen == ['1']
+    assert count(db) == 1
+
+
+def test_failed_write_does_not_notify_listeners(db_path, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('диск заполнен')
+
+    seen = []
+    writer = VacancyWriter(db_path)
+    writer.add_commit_listener(seen.extend)
+    writer.add(vacancy('1'))
+    monkeypatch.setattr(db_manager, 'write_vacancies', fail)
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    writer._conn.close()
+
+    assert seen == []
+
+
+def test_process_writer_is_flushed_and_closed_at_exit(db, db_path, monkeypatch):
+    writer = VacancyWriter(db_path, batch_size=100, flush_interval=3600)
+    monkeypatch.setattr(db_manager, '_writer', writer)
+    writer.add(vacancy('1'))
+
+    flush_vacancy_writer()
+    assert count(db) == 1
+
+    writer.add(vacancy('2'))
+    close_vacancy_writer()  # Зарегистрирована в atexit
+    assert count(db) == 2
+    assert db_manager._writer is None
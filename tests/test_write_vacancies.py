@@ -0,0 +1,134 @@
+import json
+
+from src.database.db_manager import get_last_vacancy, get_top_skills
+from src.models.vacancy_data import VacancyData
+
+
+def vacancy(**fields) -> VacancyData:
+    values = {
+        'id': '100', 'country': 'Россия', 'title': 'Python-разработчик', 'city': 'Москва',
+        'description': 'Пишем сервисы', 'skills': ['Python', 'SQL'], 'company_id': '42',
+        'company_name': 'Компания', 'published_at': '2026-10-01T10:00:00+0300', 'salary_from': 200000,
+    }
+    values.update(fields)
+    return VacancyData(**values)
+
+
+def versions(conn) -> list[tuple[str, dict]]:
+    rows = conn.execute('SELECT vacancy_id, diff FROM vacancy_versions ORDER BY rowid;').fetchall()
+    return [(vacancy_id, json.loads(diff)) for vacancy_id, diff in rows]
+
+
+def test_new_vacancy_is_written_without_version(db, store):
+    assert store(db, vacancy()) == 1
+    assert db.execute('SELECT title, salary_from FROM vacancies;').fetchall() == [('Python-разработчик', 200000)]
+    assert versions(db) == []
+
+
+def test_unchanged_vacancy_is_skipped(db, store):
+    store(db, vacancy())
+    db.execute("UPDATE vacancies SET updated_at = '2000-01-01T00:00:00';")
+    db.commit()
+
+    assert store(db, vacancy()) == 0
+    assert db.execute('SELECT updated_at FROM vacancies;').fetchone()[0] == '2000-01-01T00:00:00'
+    assert versions(db) == []
+
+
+def test_changed_vacancy_records_diff(db, store):
+    store(db, vacancy())
+
+    assert store(db, vacancy(salary_from=250000, skills=['Python'])) == 1
+    assert versions(db) == [('100', {'skills': ['Python, SQL', 'Python'], 'salary_from': [200000, 250000]})]
+    skills = db.execute('''
+        SELECT s.name FROM vacancy_skills vs JOIN skills s ON s.id = vs.skill_id WHERE vs.vacancy_id = '100'
+    ''').fetchall()
+    assert skills == [('Python',)]
+
+
+def test_changed_description_is_tracked_by_hash(db, store):
+    store(db, vacancy())
+    old_hash = db.execute('SELECT description_hash FROM vacancies;').fetchone()[0]
+
+    assert store(db, vacancy(description='Пишем и поддерживаем сервисы')) == 1
+    new_hash = db.execute('SELECT description_hash FROM vacancies;').fetchone()[0]
+    assert versions(db) == [('100', {'description_hash': [old_hash, new_hash]})]
+    assert db.execute('SELECT COUNT(*) FROM descriptions;').fetchone()[0] == 2
+
+
+def test_close_date_survives_update(db, store):
+    store(db, vacancy())
+    db.execute("UPDATE vacancies SET vacancy_close_date = '2026-10-05T12:00:00';")
+    db.commit()
+
+    store(db, vacancy(title='Senior Python-разработчик'))
+    assert db.execute('SELECT title, vacancy_close_date FROM vacancies;').fetchone() == (
+        'Senior Python-разработчик', '2026-10-05T12:00:00')
+
+
+def test_last_duplicate_in_batch_wins(db, store):
+    assert store(db, vacancy(title='Первая'), vacancy(title='Вторая')) == 1
+    assert db.execute('SELECT title FROM vacancies;').fetchall() == [('Вторая',)]
+
+
+def test_legacy_null_defaults_are_not_a_change(db, store):
+    store(db, vacancy())
+    # Строка прежней версии: site не заполнен, хэша нет
+    db.execute('UPDATE vacancies SET site = NULL, content_hash = NULL;')
+    db.commit()
+
+    store(db, vacancy())
+    assert versions(db) == []
+
+
+def test_reference_data_is_not_duplicated_in_vacancy_row(db, store):
+    store(db, vacancy(company_url='https://api.hh.ru/employers/42', company_accredited_it_employer=True))
+
+    assert db.execute('''
+        SELECT skills, company_name, company_url, company_vacancies_url, company_accredited_it_employer
+        FROM vacancies
+    ''').fetchone() == (None, None, None, None, None)
+    assert db.execute('''
+        SELECT c.name, c.url, c.accredited_it_employer FROM vacancies v JOIN companies c ON c.id = v.company_id
+    ''').fetchone() == ('Компания', 'https://api.hh.ru/employers/42', 1)
+
+
+def test_last_vacancy_reads_reference_tables(db, store):
+    store(db, vacancy(skills=['SQL', 'Python'], company_accredited_it_employer=True))
+
+    last = get_last_vacancy(include_description=True)
+    assert (last['skills'], last['company_name'], last['company_accredited_it_employer']) == (
+        'Python, SQL', 'Компания', 1)
+    assert last['description'] == 'Пишем сервисы'
+
+
+def test_skill_order_is_not_a_change(db, store):
+    store(db, vacancy())
+
+    assert store(db, vacancy(skills=['SQL', 'Python'])) == 0
+    assert versions(db) == []
+
+
+def test_company_change_updates_companies_only(db, store):
+    store(db, vacancy())
+
+    assert store(db, vacancy(company_name='Компания 2.0')) == 0
+    assert db.execute('SELECT name FROM companies;').fetchall() == [('Компания 2.0',)]
+    assert versions(db) == []
+
+
+def test_top_skills_by_role_and_date(db, store):
+    store(db,
+          vacancy(id='1', skills=['Python', 'SQL'], professional_roles_name='Программист'),
+          vacancy(id='2', skills=['Python', 'Docker'], professional_roles_name='Программист'),
+          vacancy(id='3', skills=['SQL'], professional_roles_name='Аналитик'),
+          vacancy(id='4', skills=['Python'], professional_roles_name='Программист',
+                  published_at='2026-09-01T10:00:00+0300'))
+
+    assert get_top_skills()[:2] == [('Python', 3), ('SQL', 2)]
+    assert get_top_skills(role='Программист', since='2026-10-01')[0] == ('Python', 2)
+    assert sorted(get_top_skills(role='Программист', since='2026-10-01')) == [
+        ('Docker', 1), ('Python', 2), ('SQL', 1)]
+    assert get_top_skills(role='Аналитик') == [('SQL', 1)]
+    assert get_top_skills(role='Программист', limit=1) == [('Python', 3)]
+    assert get_top_skills(role='Дизайнер') == []